@@ -0,0 +1,16 @@
+"""
+Benchmarks for the scrape → sync hot paths.
+
+Run with ``python -m benchmarks`` from the repo root; see
+:mod:`benchmarks.harness` for how results are stored and compared.
+Benchmarks import the application from ``src/`` and the offline
+stand-ins for the SSB site and the Calendar API from ``tests/fakes``.
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+for _path in (_ROOT / "src", _ROOT / "tests"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
@@ -0,0 +1,96 @@
+"""
+Run the benchmarks, store the results and compare them with a baseline.
+
+    python -m benchmarks                      # run all, save, compare with last run
+    python -m benchmarks -k sync --rounds 3   # a subset, fewer rounds
+    python -m benchmarks --compare .benchmarks/<run>.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from benchmarks import bench_parsing, bench_pipeline, bench_sync  # noqa: F401 (registers)
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD,
+    RESULTS_DIR,
+    compare,
+    latest,
+    load,
+    measure,
+    registered,
+    report,
+    save,
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--rounds", type=int, help="Override every benchmark's round count.")
+    parser.add_argument("--no-save", action="store_true", help=f"Don't store results in {RESULTS_DIR}.")
+    parser.add_argument(
+        "--compare",
+        default="latest",
+        help="Baseline results file, 'latest' (the previous stored run, the "
+        "default) or 'none'.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Median slowdown counted as a regression (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="Exit 1 if any benchmark regressed."
+    )
+    args = parser.parse_args(argv)
+    if args.rounds is not None and args.rounds < 1:
+        parser.error("--rounds must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    # Application logging would swamp the report; main() benchmarks set their own.
+    logger.remove()
+
+    benches = registered(args.pattern)
+    if not benches:
+        print(f"No benchmarks match {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    results = []
+    for bench in benches:
+        result = measure(bench, args.rounds)
+        logger.remove()  # drop sinks a main() benchmark left behind
+        print(report([result])[0], flush=True)
+        results.append(result)
+
+    saved = None if args.no_save else save(results)
+    if saved:
+        print(f"\nSaved results to {saved}")
+
+    baseline = None
+    if args.compare == "latest":
+        baseline = latest(exclude=saved)
+    elif args.compare != "none":
+        baseline = Path(args.compare)
+    if baseline is None:
+        return 0
+
+    lines, regressions = compare(results, load(baseline), args.threshold)
+    print(f"\nCompared with {baseline}:")
+    print("\n".join(lines))
+    if regressions and args.fail_on_regression:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
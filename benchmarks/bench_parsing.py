@@ -0,0 +1,59 @@
+"""
+Scraping benchmarks: HTML schedule parsing and WP REST match decoding.
+"""
+
+from __future__ import annotations
+
+from benchmarks.harness import benchmark
+from fakes import FakeSsbSite
+from helpers.html_parser import HTMLHelper
+from helpers.sources import _decode_matches, _games_from_matches
+
+# A long team page (300 games) and a full /match index (~5000 posts); the
+# real site has ~10-20 games per team page and a few thousand matches.
+_PAGE_ROUNDS = 300
+_INDEX_TEAMS = 100
+_INDEX_ROUNDS = 99
+
+
+@benchmark(rounds=20)
+def parse_html_content():
+    page = FakeSsbSite(teams=2, rounds=_PAGE_ROUNDS).team_page("team-0")
+    yield lambda: HTMLHelper.parse_html_content(page, "ssb")
+
+
+@benchmark(rounds=20)
+def iter_ssb_content():
+    page = FakeSsbSite(teams=2, rounds=_PAGE_ROUNDS).team_page("team-0")
+    chunks = [page[i:i + 8192] for i in range(0, len(page), 8192)]
+    yield lambda: list(HTMLHelper.iter_ssb_content(chunks))
+
+
+@benchmark(rounds=10)
+def decode_match_index():
+    site = FakeSsbSite(teams=_INDEX_TEAMS, rounds=_INDEX_ROUNDS)
+    posts = _all_match_posts(site)
+    yield lambda: _decode_matches(posts)
+
+
+@benchmark(rounds=10)
+def games_from_match_index():
+    site = FakeSsbSite(teams=_INDEX_TEAMS, rounds=_INDEX_ROUNDS)
+    team = site.teams[0][-1]
+    posts = _all_match_posts(site)
+    yield lambda: _games_from_matches(_decode_matches(posts), team.id, team.title)
+
+
+def _all_match_posts(site: FakeSsbSite) -> list[dict]:
+    """Every match post as the API serves it, page by page (no server needed)."""
+    posts: list[dict] = []
+    page = 1
+    while True:
+        status, items, headers = site.collection(
+            "match", {"per_page": "100", "page": str(page)}
+        )
+        assert status == 200, items
+        posts.extend(items)
+        if page >= int(headers["X-WP-TotalPages"]):
+            return posts
+        page += 1
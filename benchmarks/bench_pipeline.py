@@ -0,0 +1,90 @@
+"""
+Full ``main()`` runs against the localhost fake SSB site and the in-process
+fake Calendar API: real HTTP scraping, the pipelined runner, batched
+Calendar writes and site rendering, with no network or credentials.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from unittest import mock
+
+import main as main_module
+from benchmarks.harness import benchmark
+from fakes import FakeCalendarBackend, FakeSsbSite, fake_gclient
+
+_TEAMS = 20
+_ROUNDS = 8
+_ARGV = ["--workers", "4", "--scrape-workers", "2"]
+_ENV = {
+    "GCAL_CLIENT_ID": "bench",
+    "GCAL_CLIENT_SECRET": "bench",
+    "GCAL_REFRESH_TOKEN": "bench",
+    "LOG_LEVEL": "WARNING",
+    "HTTP_CACHE_DIR": "",
+    "SCRAPE_HOST_INTERVAL": "0",
+    "GCAL_QPS": "0",
+}
+
+
+@benchmark(rounds=5)
+def main_first_run():
+    """Every calendar and event created from scratch."""
+    with _stand_ins() as (workdir, backends):
+        runs = iter(range(1_000_000))
+
+        def _run():
+            run = next(runs)
+            backends[:] = [FakeCalendarBackend()]
+            with mock.patch.dict(os.environ, {"STATE_DB": str(workdir / f"state-{run}.db")}):
+                main_module.main(_ARGV)
+
+        yield _run
+
+
+@benchmark(rounds=10)
+def main_unchanged_rerun():
+    """Every schedule unchanged since the last run, so each sync is skipped."""
+    with _stand_ins() as (workdir, backends):
+        backends[:] = [FakeCalendarBackend()]
+        with mock.patch.dict(os.environ, {"STATE_DB": str(workdir / "state.db")}):
+            main_module.main(_ARGV)  # populate the calendars and sync records
+            yield lambda: main_module.main(_ARGV)
+
+
+@contextmanager
+def _stand_ins() -> Iterator[tuple[Path, list[FakeCalendarBackend]]]:
+    """
+    Serve the fake site, write one config per team into a scratch working
+    directory and point ``main`` at them. Yields ``(workdir, backends)``;
+    the Calendar client built by ``main()`` talks to ``backends[0]``.
+    """
+    backends: list[FakeCalendarBackend] = []
+
+    def _client(name, *credentials, pool_maxsize=None, **attributes):
+        return fake_gclient(backends[0], **attributes)
+
+    cwd = os.getcwd()
+    with FakeSsbSite(teams=_TEAMS, rounds=_ROUNDS) as site, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config_dir = workdir / "calendar-configs"
+        config_dir.mkdir()
+        for index in range(_TEAMS):
+            (config_dir / f"config-team-{index}.yaml").write_text(
+                f"name: Team {index}\nurl: {site.team_url(index)}\ncolor_id: 9\n",
+                encoding="utf-8",
+            )
+        os.chdir(workdir)  # main() writes logs/ and site/ relative to the cwd
+        try:
+            with (
+                mock.patch.dict(os.environ, _ENV),
+                mock.patch.object(main_module, "CONFIG_DIR", str(config_dir)),
+                mock.patch.object(main_module, "GoogleCalClient", _client),
+            ):
+                yield workdir, backends
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,91 @@
+"""
+Sync-engine benchmarks: event matching, drift detection and page rendering.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from benchmarks.harness import benchmark
+from helpers.event_sync import EventMatcher, build_field_patch, match_game_to_event
+from helpers.models import ExistingEvent, Game
+from helpers.site_builder import build_site
+
+SYDNEY = ZoneInfo("Australia/Sydney")
+UTC = ZoneInfo("UTC")
+
+
+def _games(count: int) -> list[Game]:
+    base = datetime(2026, 2, 2, 19, 0, tzinfo=SYDNEY)
+    games = []
+    for i in range(count):
+        start = base + timedelta(days=i)
+        games.append(Game(
+            key=f"round{i + 1}",
+            title=f"Round {i + 1}: Rivals",
+            start=start,
+            end=start + timedelta(minutes=40),
+            venue=f"Court {i % 4 + 1}",
+            details_url=f"https://example.com/match/{i + 1}/",
+        ))
+    return games
+
+
+def _events(games: list[Game]) -> list[ExistingEvent]:
+    """
+    One event per game: half keyed, half legacy (no ``gameKey``), every
+    tenth rescheduled by a day, all with offsets as GCal returns them (UTC).
+    """
+    events = []
+    for i, game in enumerate(games):
+        start = game.start + (timedelta(days=1) if i % 10 == 0 else timedelta(0))
+        events.append(ExistingEvent(
+            id=f"evt{i}",
+            key=game.key if i % 2 else None,
+            start=start.astimezone(UTC),
+            summary=game.title,
+            color_id="9",
+            description=game.details_url,
+            location=game.venue,
+        ))
+    return events
+
+
+@benchmark(rounds=10)
+def event_matcher_2000():
+    games = _games(2000)
+    events = _events(games)
+
+    def _match_all():
+        matcher = EventMatcher(events)
+        return [matcher.match(game, consume=True) for game in games]
+
+    yield _match_all
+
+
+@benchmark(rounds=10)
+def match_game_to_event_200():
+    games = _games(200)
+    events = _events(games)
+    yield lambda: [match_game_to_event(game, events) for game in games]
+
+
+@benchmark(rounds=20)
+def build_field_patch_10000():
+    games = _games(10_000)
+    events = _events(games)
+    # Every fifth event has drifted so both the empty and non-empty paths run.
+    events = [
+        ExistingEvent(**{**event.__dict__, "location": "Elsewhere"}) if i % 5 == 0 else event
+        for i, event in enumerate(events)
+    ]
+    pairs = list(zip(events, games))
+    yield lambda: [build_field_patch(event, game, 9) for event, game in pairs]
+
+
+@benchmark(rounds=20)
+def build_site_500():
+    entries = [(f"Team {i} & Co", f"c{i:04d}@group.calendar.google.com") for i in range(500)]
+    updated = datetime(2026, 2, 2, 19, 0, tzinfo=SYDNEY)
+    yield lambda: build_site(entries, updated=updated)
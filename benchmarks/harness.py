@@ -0,0 +1,192 @@
+"""
+Minimal benchmark harness: registration, timing, stored results, comparison.
+
+A benchmark is a generator function decorated with :func:`benchmark`. It
+does its setup, yields the zero-argument callable to time, and cleans up
+after the ``yield``::
+
+    @benchmark(rounds=20)
+    def parse_page():
+        page = make_page()
+        yield lambda: parse(page)
+
+Each run is saved as JSON under ``.benchmarks/`` together with the commit it
+was measured on, so any two runs can be compared with :func:`compare`.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / ".benchmarks"
+
+# A benchmark whose median grows by more than this fraction is a regression.
+DEFAULT_THRESHOLD = 0.10
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[], Iterator[Callable[[], object]]]
+    rounds: int
+
+
+@dataclass(frozen=True)
+class Result:
+    """Timings of one benchmark, in seconds per call."""
+
+    name: str
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+
+_REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(rounds: int = 10, name: str | None = None):
+    """Register a generator-function benchmark (see module docstring)."""
+
+    def _register(func):
+        bench_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        if bench_name in _REGISTRY:
+            raise ValueError(f"Duplicate benchmark name {bench_name!r}")
+        _REGISTRY[bench_name] = Benchmark(bench_name, contextmanager(func), rounds)
+        return func
+
+    return _register
+
+
+def registered(pattern: str | None = None) -> list[Benchmark]:
+    """Registered benchmarks whose name matches the glob *pattern*."""
+    return [
+        bench for name, bench in sorted(_REGISTRY.items())
+        if pattern is None or fnmatch.fnmatch(name, f"*{pattern}*")
+    ]
+
+
+def measure(bench: Benchmark, rounds: int | None = None) -> Result:
+    """Time *bench* (after one untimed warm-up call)."""
+    rounds = rounds or bench.rounds
+    with bench.setup() as target:
+        target()
+        times = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            target()
+            times.append(time.perf_counter() - started)
+    return Result(
+        name=bench.name,
+        rounds=rounds,
+        min=min(times),
+        median=statistics.median(times),
+        mean=statistics.fmean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+    )
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results: list[Result], directory: Path = RESULTS_DIR) -> Path:
+    """Store *results* with the commit and machine they were measured on."""
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    now = datetime.now(tz=timezone.utc)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{now:%Y%m%dT%H%M%SZ}_{commit}{'-dirty' if dirty else ''}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "dirty": dirty,
+                "created": now.isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "results": [asdict(result) for result in results],
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def load(path: Path) -> dict[str, Result]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {item["name"]: Result(**item) for item in data["results"]}
+
+
+def latest(directory: Path = RESULTS_DIR, exclude: Path | None = None) -> Path | None:
+    """Most recently stored run in *directory* (other than *exclude*)."""
+    runs = sorted(path for path in directory.glob("*.json") if path != exclude)
+    return runs[-1] if runs else None
+
+
+def compare(
+    current: list[Result],
+    baseline: dict[str, Result],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> tuple[list[str], list[str]]:
+    """
+    Compare median timings against *baseline*.
+
+    Returns:
+        ``(lines, regressions)`` — a report line per benchmark and the names
+        of those slower than the baseline by more than *threshold*.
+    """
+    lines: list[str] = []
+    regressions: list[str] = []
+    for result in current:
+        before = baseline.get(result.name)
+        if before is None:
+            lines.append(f"{result.name:<45} {_fmt(result.median):>10}  (new)")
+            continue
+        change = result.median / before.median - 1 if before.median else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(result.name)
+            flag = "  REGRESSION"
+        elif change < -threshold:
+            flag = "  improved"
+        lines.append(
+            f"{result.name:<45} {_fmt(before.median):>10} -> {_fmt(result.median):>10}"
+            f"  {change:+.1%}{flag}"
+        )
+    return lines, regressions
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def report(results: list[Result]) -> list[str]:
+    """One line per result: median, min and spread."""
+    return [
+        f"{result.name:<45} median {_fmt(result.median):>10}  min {_fmt(result.min):>10}"
+        f"  ±{_fmt(result.stdev):>9}  ({result.rounds} rounds)"
+        for result in results
+    ]
@@ -17,6 +17,8 @@ from pathlib import Path
 from loguru import logger
 
 from helpers.rollover import RolloverResult, build_summary, check_config_rollover
+from libs.host_scheduler import scheduler_from_env
+from libs.http_cache import cache_from_env
 from libs.scraper_client import ScraperClient
 
 CONFIG_DIR = Path("./calendar-configs")
@@ -24,7 +26,9 @@ SUMMARY_PATH = Path("rollover-summary.md")
 
 
 def main() -> None:
-    client = ScraperClient("Season Checker")
+    client = ScraperClient(
+        "Season Checker", cache=cache_from_env(), scheduler=scheduler_from_env()
+    )
     results: list[RolloverResult] = []
 
     for config_path in sorted(CONFIG_DIR.glob("config-*.yaml")):
@@ -8,7 +8,9 @@ These functions have no I/O or API calls, making them straightforward to unit te
 
 from __future__ import annotations
 
-from datetime import datetime
+import hashlib
+import json
+from datetime import date, datetime, tzinfo
 
 from loguru import logger
 
@@ -32,7 +34,8 @@ def filter_events_by_schedule(events: list[dict], schedule_url: str) -> list[dic
 def parse_existing_events(events: list[dict]) -> list[ExistingEvent]:
     """
     Convert raw GCal event dicts into :class:`ExistingEvent` records with
-    timezone-aware start datetimes and the ``gameKey`` extended property.
+    timezone-aware start datetimes, the ``gameKey`` extended property, and
+    the fields :func:`build_field_patch` compares.
 
     All-day events (``start.date`` instead of ``start.dateTime``) are skipped
     with a warning — they cannot have been created by this tool.
@@ -52,10 +55,86 @@ def parse_existing_events(events: list[dict]) -> list[ExistingEvent]:
             .get("private", {})
             .get("gameKey")
         )
-        parsed.append(ExistingEvent(id=event["id"], key=key, start=start))
+        parsed.append(
+            ExistingEvent(
+                id=event["id"],
+                key=key,
+                start=start,
+                summary=event.get("summary"),
+                color_id=event.get("colorId"),
+                description=event.get("description"),
+                location=event.get("location"),
+            )
+        )
     return parsed
 
 
+class EventMatcher:
+    """
+    Index over one calendar's existing events for matching many games.
+
+    Built once per calendar; each :meth:`match` is O(1) on average instead
+    of scanning every event, and ``consume=True`` removes the matched event
+    so it cannot be matched twice in one run. Matching rules are exactly
+    those of :func:`match_game_to_event`, including tie-breaks: the last
+    event wins among duplicate keys, and the first event (in input order)
+    wins among legacy candidates.
+    """
+
+    def __init__(self, existing: list[ExistingEvent]) -> None:
+        self._by_key: dict[str, list[ExistingEvent]] = {}
+        self._legacy: list[ExistingEvent] = []
+        self._legacy_by_start: dict[datetime, list[ExistingEvent]] = {}
+        # Legacy events bucketed by calendar date, per timezone the dates were
+        # computed in (built lazily — games normally share one zone).
+        self._legacy_by_date: dict[tzinfo | None, dict[date, list[ExistingEvent]]] = {}
+
+        for event in existing:
+            if event.key:
+                self._by_key.setdefault(event.key, []).append(event)
+            elif event.key is None:
+                self._legacy.append(event)
+                # Aware datetimes hash by instant, so offsets don't matter.
+                self._legacy_by_start.setdefault(event.start, []).append(event)
+
+    def _dates_in(self, tz: tzinfo | None) -> dict[date, list[ExistingEvent]]:
+        if tz not in self._legacy_by_date:
+            by_date: dict[date, list[ExistingEvent]] = {}
+            for event in self._legacy:
+                by_date.setdefault(event.start.astimezone(tz).date(), []).append(event)
+            self._legacy_by_date[tz] = by_date
+        return self._legacy_by_date[tz]
+
+    def match(self, game: Game, consume: bool = False) -> tuple[str, ExistingEvent | None]:
+        """Return ``(action, event)`` for *game*; see :func:`match_game_to_event`."""
+        keyed = self._by_key.get(game.key)
+        same_start = self._legacy_by_start.get(game.start)
+        if keyed:
+            event = keyed[-1]
+            action = "exact" if event.start == game.start else "reschedule"
+        elif same_start:
+            action, event = "exact", same_start[0]
+        else:
+            same_date = self._dates_in(game.start.tzinfo).get(game.start.date())
+            if not same_date:
+                return "create", None
+            action, event = "reschedule", same_date[0]
+
+        if consume:
+            self.consume(event)
+        return action, event
+
+    def consume(self, event: ExistingEvent) -> None:
+        """Remove *event* from every index so it cannot be matched again."""
+        if event.key:
+            self._by_key[event.key].remove(event)
+            return
+        self._legacy.remove(event)
+        self._legacy_by_start[event.start].remove(event)
+        for tz, by_date in self._legacy_by_date.items():
+            by_date[event.start.astimezone(tz).date()].remove(event)
+
+
 def match_game_to_event(
     game: Game, existing: list[ExistingEvent]
 ) -> tuple[str, ExistingEvent | None]:
@@ -73,23 +152,10 @@ def match_game_to_event(
     3. Otherwise ``("create", None)``.
 
     The caller should remove a returned event from *existing* so it cannot be
-    matched twice in one run.
+    matched twice in one run. When matching many games against the same
+    events, build one :class:`EventMatcher` and use ``consume=True`` instead.
     """
-    by_key = {e.key: e for e in existing if e.key}
-    if game.key in by_key:
-        event = by_key[game.key]
-        action = "exact" if event.start == game.start else "reschedule"
-        return action, event
-
-    legacy = [e for e in existing if e.key is None]
-    for event in legacy:
-        if event.start == game.start:
-            return "exact", event
-    for event in legacy:
-        if event.start.astimezone(game.start.tzinfo).date() == game.start.date():
-            return "reschedule", event
-
-    return "create", None
+    return EventMatcher(existing).match(game)
 
 
 def build_reschedule_patch(game: Game, color_id: int | str) -> dict:
@@ -105,27 +171,49 @@ def build_reschedule_patch(game: Game, color_id: int | str) -> dict:
     }
 
 
-def build_field_patch(event_details: dict, game: Game, color_id: int | str) -> dict:
+def build_field_patch(event: ExistingEvent, game: Game, color_id: int | str) -> dict:
     """
     Compare an existing event's fields against the scraped game and return a
     single patch dict containing only drifted fields (empty if none).
 
-    Also adds the ``gameKey`` extended property when missing, which migrates
-    legacy events to identity-based matching. GCal merges extended property
-    keys on patch, so other private properties (``schedule``) are preserved.
+    Works entirely from the fields captured by :func:`parse_existing_events`,
+    so no per-event GET is needed. Also adds the ``gameKey`` extended property
+    when missing, which migrates legacy events to identity-based matching.
+    GCal merges extended property keys on patch, so other private properties
+    (``schedule``) are preserved.
     """
     patch: dict = {}
-    if event_details.get("summary") != game.title:
+    if event.summary != game.title:
         patch["summary"] = game.title
-    if event_details.get("colorId") != str(color_id):
+    if event.color_id != str(color_id):
         patch["colorId"] = str(color_id)
-    if event_details.get("description") != game.details_url:
+    if event.description != game.details_url:
         patch["description"] = game.details_url
-    if event_details.get("location") != game.venue:
+    if event.location != game.venue:
         patch["location"] = game.venue
-    existing_key = (
-        event_details.get("extendedProperties", {}).get("private", {}).get("gameKey")
-    )
-    if existing_key != game.key:
+    if event.key != game.key:
         patch["extendedProperties"] = {"private": {"gameKey": game.key}}
     return patch
+
+
+def sync_fingerprint(games: list[Game], schedule_url: str, color_id: int | str) -> str:
+    """
+    Return a content hash of everything a sync writes for one schedule.
+
+    Covers every game field that ends up on an event plus the schedule URL
+    and colour, so an unchanged fingerprint means a previous successful
+    sync already produced exactly these events. Game order is irrelevant.
+    """
+    rows = sorted(
+        [
+            game.key,
+            game.title,
+            game.start.isoformat(),
+            game.end.isoformat(),
+            game.venue,
+            game.details_url,
+        ]
+        for game in games
+    )
+    payload = json.dumps([schedule_url, str(color_id), rows], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -1,13 +1,23 @@
 """
 Parses HTML schedule pages and extracts structured game data.
+
+BeautifulSoup builds the tree with ``lxml`` when it is installed (several
+times faster than the pure-Python ``html.parser``), falling back to the
+stdlib parser otherwise. ``HTML_PARSER`` or the *backend* argument of
+:meth:`HTMLHelper.parse_html_content` overrides the choice.
 """
 
 from __future__ import annotations
 
+import importlib.util
+import os
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Iterable, Iterator
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 from loguru import logger
 
 # Labels used to locate field values inside each game element.
@@ -20,9 +30,49 @@ _LABEL_TIME = "Time"
 _LABEL_COURT = "Court"
 _LABEL_SCORE = "Score"
 
+# Labels whose value is the text node following the label's parent element,
+# and labels whose value comes from the first <a> after the label.
+_SIBLING_LABELS = (_LABEL_ROUND, _LABEL_DATE, _LABEL_TIME, _LABEL_COURT)
+_LINK_LABEL = _LABEL_OPPONENT
+_HREF_LABEL = _LABEL_SCORE
+_ALL_LABELS = frozenset((*_SIBLING_LABELS, _LINK_LABEL, _HREF_LABEL))
+
 # The datetime format used by the SSB website, e.g. "10/08/2025 10:00AM"
 _SSB_DATETIME_FORMAT = "%d/%m/%Y %I:%M%p"
 
+# BeautifulSoup tree builders we allow; "lxml" needs the optional lxml package.
+BACKENDS = ("lxml", "html.parser")
+
+# Only game containers are turned into tree nodes; the rest of the page
+# (navigation, scripts, footers) is skipped by the tokenizer.
+_SSB_GRID_STRAINER = SoupStrainer("div", class_="grid")
+
+
+@lru_cache(maxsize=None)
+def _lxml_available() -> bool:
+    return importlib.util.find_spec("lxml") is not None
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    """
+    Pick the BeautifulSoup tree builder to use.
+
+    An explicit *backend* wins, then the ``HTML_PARSER`` environment
+    variable, then ``"lxml"`` if installed, else ``"html.parser"``.
+
+    Raises:
+        ValueError: If the requested backend is unknown, or is ``"lxml"``
+            and lxml is not installed.
+    """
+    backend = backend or os.environ.get("HTML_PARSER") or None
+    if backend is None:
+        return "lxml" if _lxml_available() else "html.parser"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend!r}")
+    if backend == "lxml" and not _lxml_available():
+        raise ValueError("HTML parser backend 'lxml' requested but lxml is not installed")
+    return backend
+
 
 class HTMLHelper:
 
@@ -31,6 +81,7 @@ class HTMLHelper:
         html_content: str,
         parse_type: str,
         custom_parse: dict | None = None,
+        backend: str | None = None,
     ) -> list[dict]:
         """
         Route HTML content to the appropriate parser.
@@ -40,6 +91,8 @@ class HTMLHelper:
             parse_type: Selects the parsing strategy. Currently only ``"ssb"``
                 (Sydney Social Basketball) is supported.
             custom_parse: Reserved for future custom parsing config.
+            backend: BeautifulSoup tree builder (``"lxml"`` or
+                ``"html.parser"``); see :func:`resolve_backend`.
 
         Returns:
             List of game dicts, each containing ``round``, ``start``, ``end``,
@@ -47,11 +100,11 @@ class HTMLHelper:
 
         Raises:
             NotImplementedError: If *parse_type* is ``"custom"``.
-            ValueError: If an unknown *parse_type* is passed.
+            ValueError: If an unknown *parse_type* or *backend* is passed.
         """
         match parse_type:
             case "ssb":
-                return HTMLHelper._parse_ssb_content(html_content)
+                return HTMLHelper._parse_ssb_content(html_content, backend=backend)
             case "custom":
                 raise NotImplementedError(
                     "Custom parse type has not been implemented yet."
@@ -60,7 +113,7 @@ class HTMLHelper:
                 raise ValueError(f"Unknown parse_type: {parse_type!r}")
 
     @staticmethod
-    def _parse_ssb_content(html_content: str) -> list[dict]:
+    def _parse_ssb_content(html_content: str, backend: str | None = None) -> list[dict]:
         """
         Parse a Sydney Social Basketball (SSB) schedule page.
 
@@ -74,6 +127,7 @@ class HTMLHelper:
 
         Args:
             html_content: Raw HTML of an SSB team schedule page.
+            backend: BeautifulSoup tree builder; see :func:`resolve_backend`.
 
         Returns:
             List of game dicts with keys ``round``, ``start``
@@ -81,15 +135,13 @@ class HTMLHelper:
             ``details_url``.  May be empty if the page contains no game
             elements or all elements fail to parse.
         """
-        logger.debug("Parsing SSB content")
-        soup = BeautifulSoup(html_content, "html.parser")
+        backend = resolve_backend(backend)
+        logger.debug(f"Parsing SSB content (backend={backend})")
+        soup = BeautifulSoup(html_content, backend, parse_only=_SSB_GRID_STRAINER)
         game_elements = soup.find_all("div", class_="grid")
 
         if not game_elements:
-            logger.warning(
-                "No game elements found on page. The page structure may have "
-                "changed, or no games are currently scheduled."
-            )
+            _log_ssb_summary(0, 0)
             return []
 
         game_schedules: list[dict] = []
@@ -99,71 +151,193 @@ class HTMLHelper:
             if game is not None:
                 game_schedules.append(game)
 
-        parsed = len(game_schedules)
-        total = len(game_elements)
-
-        if parsed == 0:
-            logger.warning(
-                f"Found {total} game element(s) but could not parse any of them. "
-                "The page structure may have changed."
-            )
-        elif parsed < total:
-            logger.warning(
-                f"Parsed {parsed}/{total} game elements — "
-                f"{total - parsed} were skipped due to missing or invalid fields."
-            )
-        else:
-            logger.debug(f"Successfully parsed {parsed}/{total} game elements")
-
+        _log_ssb_summary(len(game_schedules), len(game_elements))
         return game_schedules
 
+    @staticmethod
+    def iter_ssb_content(
+        chunks: Iterable[str], backend: str | None = None
+    ) -> Iterator[dict]:
+        """
+        Streaming counterpart of :meth:`_parse_ssb_content`.
 
-def _extract_label_sibling(element: Tag, label: str) -> str | None:
-    """
-    Find an exact-text label inside *element* and return the text of its next
-    sibling node.
+        *chunks* (e.g. from :meth:`ScraperClient.iter_html`) are fed to an
+        incremental tokenizer that keeps only the game element currently
+        being read. Each ``<div class="grid">`` is parsed and yielded as soon
+        as its closing tag arrives, so memory stays flat and the first games
+        are available before the download completes.
 
-    Exact matching (``string=label``) is used instead of a regex so that
-    opponent names containing the same words (e.g. "Round Hill FC") are not
-    mistakenly treated as labels.
+        Skipping and warnings match :meth:`_parse_ssb_content`; the summary
+        warnings are logged once the input is exhausted.
 
-    Returns ``None`` if the label or its sibling cannot be found.
-    """
-    label_node = element.find(string=label)
-    if label_node is None:
-        return None
-    sibling = label_node.find_parent().find_next_sibling(string=True)
-    if sibling is None:
-        return None
-    return sibling.strip() or None
+        Args:
+            chunks: Consecutive pieces of an SSB schedule page.
+            backend: BeautifulSoup tree builder used for each game element;
+                see :func:`resolve_backend`.
+
+        Yields:
+            Game dicts in document order.
+        """
+        backend = resolve_backend(backend)
+        logger.debug(f"Streaming SSB content (backend={backend})")
+        collector = _SsbGridCollector()
+        parsed = total = 0
+
+        def feed_all() -> Iterator[None]:
+            for chunk in chunks:
+                collector.feed(chunk)
+                yield
+            collector.close()
+            yield
+
+        for _ in feed_all():
+            ready, collector.completed = collector.completed, []
+            for fragment in ready:
+                total += 1
+                element = BeautifulSoup(fragment, backend).find("div", class_="grid")
+                game = _parse_ssb_game_element(element)
+                if game is not None:
+                    parsed += 1
+                    yield game
+
+        _log_ssb_summary(parsed, total)
+
+
+def _log_ssb_summary(parsed: int, total: int) -> None:
+    """Log how many of the *total* game elements on a page could be parsed."""
+    if total == 0:
+        logger.warning(
+            "No game elements found on page. The page structure may have "
+            "changed, or no games are currently scheduled."
+        )
+    elif parsed == 0:
+        logger.warning(
+            f"Found {total} game element(s) but could not parse any of them. "
+            "The page structure may have changed."
+        )
+    elif parsed < total:
+        logger.warning(
+            f"Parsed {parsed}/{total} game elements — "
+            f"{total - parsed} were skipped due to missing or invalid fields."
+        )
+    else:
+        logger.debug(f"Successfully parsed {parsed}/{total} game elements")
 
 
-def _extract_label_link(element: Tag, label: str) -> str | None:
+class _SsbGridCollector(HTMLParser):
     """
-    Find an exact-text label inside *element* and return the text of the first
-    ``<a>`` tag that follows it.
+    Incremental tokenizer that re-serializes each outermost
+    ``<div class="grid">`` into :attr:`completed` as soon as it closes.
 
-    Returns ``None`` if the label or a following anchor cannot be found.
+    Markup outside game elements is dropped as it is read. Entity and
+    character references are passed through untouched so the fragment
+    parses exactly as it would have in the full page.
     """
-    label_node = element.find(string=label)
-    if label_node is None:
-        return None
-    anchor = label_node.find_next("a")
-    return anchor.get_text(strip=True) if anchor else None
-
 
-def _extract_label_href(element: Tag, label: str) -> str | None:
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.completed: list[str] = []
+        self._buffer: list[str] = []
+        self._depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if self._depth:
+            self._buffer.append(self.get_starttag_text())
+            if tag == "div":
+                self._depth += 1
+        elif tag == "div" and "grid" in (dict(attrs).get("class") or "").split():
+            self._buffer = [self.get_starttag_text()]
+            self._depth = 1
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        if self._depth:
+            self._buffer.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._depth:
+            return
+        self._buffer.append(f"</{tag}>")
+        if tag == "div":
+            self._depth -= 1
+            if not self._depth:
+                self._finish()
+
+    def handle_data(self, data: str) -> None:
+        if self._depth:
+            self._buffer.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        if self._depth:
+            self._buffer.append(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        if self._depth:
+            self._buffer.append(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        if self._depth:
+            self._buffer.append(f"<!--{data}-->")
+
+    def close(self) -> None:
+        # A truncated page still yields its last (unclosed) game element,
+        # as the tree builders would auto-close it.
+        super().close()
+        if self._depth:
+            self._depth = 0
+            self._finish()
+
+    def _finish(self) -> None:
+        self.completed.append("".join(self._buffer))
+        self._buffer = []
+
+
+def _extract_ssb_fields(element: Tag) -> dict[str, str | None]:
     """
-    Find an exact-text label inside *element* and return the ``href`` of the
-    first ``<a>`` tag that follows it.
+    Extract every labelled field of a game element in one walk of its subtree.
 
-    Returns ``None`` if the label or a following anchor cannot be found.
+    Labels are matched on exact text, so opponent names containing the same
+    words (e.g. "Round Hill FC") are not mistaken for labels. Only the first
+    occurrence of each label counts. Plain fields take the text of the node
+    after the label; the opponent/score fields take the text/``href`` of the
+    first ``<a>`` after it (the search continues past the element only if
+    none is found inside it). Each node is visited once.
+
+    Returns:
+        Mapping of label to extracted value (``None`` when not found).
     """
-    label_node = element.find(string=label)
-    if label_node is None:
-        return None
-    anchor = label_node.find_next("a", href=True)
-    return anchor.get("href") if anchor else None
+    fields: dict[str, str | None] = dict.fromkeys(_ALL_LABELS)
+    seen: set[str] = set()
+    link_node: NavigableString | None = None
+    href_node: NavigableString | None = None
+    link_pending = href_pending = False
+
+    for node in element.descendants:
+        if isinstance(node, NavigableString):
+            if node in _ALL_LABELS and node not in seen:
+                label = str(node)
+                seen.add(label)
+                if label == _LINK_LABEL:
+                    link_node, link_pending = node, True
+                elif label == _HREF_LABEL:
+                    href_node, href_pending = node, True
+                else:
+                    sibling = node.parent.find_next_sibling(string=True)
+                    fields[label] = (sibling.strip() or None) if sibling else None
+        elif node.name == "a" and (link_pending or href_pending):
+            if link_pending:
+                fields[_LINK_LABEL] = node.get_text(strip=True)
+                link_pending = False
+            if href_pending and node.get("href") is not None:
+                fields[_HREF_LABEL] = node.get("href")
+                href_pending = False
+
+    if link_pending:
+        anchor = link_node.find_next("a")
+        fields[_LINK_LABEL] = anchor.get_text(strip=True) if anchor else None
+    if href_pending:
+        anchor = href_node.find_next("a", href=True)
+        fields[_HREF_LABEL] = anchor.get("href") if anchor else None
+    return fields
 
 
 def _parse_ssb_game_element(element: Tag) -> dict | None:
@@ -175,12 +349,13 @@ def _parse_ssb_game_element(element: Tag) -> dict | None:
     logged with enough context to diagnose the issue.
     """
     # --- Extract raw field values ---
-    game_round = _extract_label_sibling(element, _LABEL_ROUND)
-    opponent = _extract_label_link(element, _LABEL_OPPONENT)
-    date_str = _extract_label_sibling(element, _LABEL_DATE)
-    time_str = _extract_label_sibling(element, _LABEL_TIME)
-    location = _extract_label_sibling(element, _LABEL_COURT)
-    details_url = _extract_label_href(element, _LABEL_SCORE)
+    fields = _extract_ssb_fields(element)
+    game_round = fields[_LABEL_ROUND]
+    opponent = fields[_LABEL_OPPONENT]
+    date_str = fields[_LABEL_DATE]
+    time_str = fields[_LABEL_TIME]
+    location = fields[_LABEL_COURT]
+    details_url = fields[_LABEL_SCORE]
 
     # --- Validate required fields ---
     missing = [
@@ -4,6 +4,7 @@ Shared data models for the scrape → sync pipeline.
 
 from __future__ import annotations
 
+import html
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -35,7 +36,55 @@ class ExistingEvent:
     id: str
     key: str | None     # gameKey extended property; None for legacy events
     start: datetime     # timezone-aware (offset as returned by GCal; may differ from Game.start's zone — aware datetime equality still compares instants)
+    # Raw fields compared by build_field_patch(), kept from the list response
+    # so drift checks need no per-event GET. None when absent on the event.
+    summary: str | None = None
+    color_id: str | None = None
+    description: str | None = None
+    location: str | None = None
 
     def __post_init__(self) -> None:
         if self.start.tzinfo is None:
             raise ValueError("ExistingEvent.start must be a timezone-aware datetime")
+
+
+@dataclass(frozen=True, slots=True)
+class WpMatch:
+    """
+    The few fields of an SSB WordPress ``match`` post that the API source uses.
+
+    Decoded once at the fetch boundary so raw post dicts (and their nested
+    ACF post objects) can be dropped immediately; titles are HTML-unescaped.
+    """
+
+    id: int
+    slug: str
+    link: str
+    home_id: int
+    home_title: str
+    away_id: int
+    away_title: str
+    venue: str
+    time: int | None    # Sydney wall-clock encoded as a UTC epoch; falsy when TBD
+
+    @classmethod
+    def from_json(cls, post: dict) -> WpMatch:
+        """
+        Decode a (possibly ``_fields``-projected) match post.
+
+        Raises:
+            KeyError, TypeError: If a required field is missing or malformed.
+        """
+        acf = post["acf"]
+        home, away = acf["home_team"], acf["away_team"]
+        return cls(
+            id=post["id"],
+            slug=post["slug"],
+            link=post["link"],
+            home_id=home["ID"],
+            home_title=html.unescape(home["post_title"]),
+            away_id=away["ID"],
+            away_title=html.unescape(away["post_title"]),
+            venue=html.unescape(acf["venue"]["post_title"]),
+            time=acf["time"],
+        )
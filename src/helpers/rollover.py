@@ -23,6 +23,10 @@ import yaml
 from helpers.sources import _get_all_pages, _team_slug, _wp_api_base
 from libs.scraper_client import ScraperClient
 
+# Only the team-post fields rollover detection reads (see _fields in the WP
+# REST API); full posts carry rendered content and ACF objects.
+_TEAM_FIELDS = "slug,title,date"
+
 # Matches season suffixes: "Shake Shaq 2025 s4", "Shake Shaq 2026 s1 preseason",
 # "Shake Shaq 2023 s3 grading" — everything from " <year> s<N>" onward.
 _SEASON_SUFFIX = re.compile(r"\s+\d{4}\s+s\d+\b.*$", re.IGNORECASE)
@@ -121,7 +125,9 @@ def check_config_rollover(client: ScraperClient, config_path: Path) -> RolloverR
     if not slug:
         return RolloverResult(config_path.name, "skipped", f"no team slug in url {url!r}")
 
-    current_posts = client.get_json(f"{api_base}/team", params={"slug": slug})
+    current_posts = client.get_json(
+        f"{api_base}/team", params={"slug": slug, "_fields": _TEAM_FIELDS}
+    )
     if not current_posts:
         return RolloverResult(
             config_path.name, "skipped", f"slug {slug!r} not found on site"
@@ -139,7 +145,9 @@ def check_config_rollover(client: ScraperClient, config_path: Path) -> RolloverR
             f"no season suffix in title {current_title!r}",
         )
 
-    posts = _get_all_pages(client, f"{api_base}/team", params={"search": base_name})
+    posts = _get_all_pages(
+        client, f"{api_base}/team", params={"search": base_name, "_fields": _TEAM_FIELDS}
+    )
     newest = find_newest_team_post(posts, base_name)
     if newest is None:
         return RolloverResult(
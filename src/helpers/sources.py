@@ -14,8 +14,12 @@ regardless of which source produced an event.
 from __future__ import annotations
 
 import html
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Mapping
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
@@ -24,7 +28,7 @@ from loguru import logger
 
 from helpers.config_loader import CalendarConfig
 from helpers.html_parser import HTMLHelper
-from helpers.models import Game, ScrapeError
+from helpers.models import Game, ScrapeError, WpMatch
 from libs.scraper_client import ScraperClient
 
 SYDNEY = ZoneInfo("Australia/Sydney")
@@ -33,6 +37,22 @@ GAME_DURATION = timedelta(hours=1)
 # WordPress REST API caps per_page at 100.
 _WP_PAGE_SIZE = 100
 _WP_MAX_PAGES = 50
+# Concurrent page requests once X-WP-TotalPages is known.
+_WP_PAGE_WORKERS = 8
+
+# _fields projections: only what the API source decodes, instead of full
+# post bodies (rendered content, excerpts, links, full ACF post objects).
+_TEAM_FIELDS = "id,title,date"
+_MATCH_FIELDS = ",".join([
+    "id", "slug", "link", "acf.time",
+    "acf.home_team.ID", "acf.home_team.post_title",
+    "acf.away_team.ID", "acf.away_team.post_title",
+    "acf.venue.post_title",
+])
+
+# The shared match index only crawls posts published this recently; teams
+# whose post is older may have matches outside it and use per-team search.
+_MATCH_INDEX_LOOKBACK = timedelta(days=120)
 
 
 def normalize_round_key(label: str) -> str:
@@ -73,94 +93,245 @@ def _team_slug(config_url: str) -> str:
     return urlparse(config_url).path.rstrip("/").rsplit("/", 1)[-1]
 
 
+def _total_pages(headers: Mapping[str, str]) -> int | None:
+    """Read ``X-WP-TotalPages`` from a WP collection response, if present."""
+    try:
+        return int(headers["X-WP-TotalPages"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _is_past_end(exc: requests.HTTPError, page: int) -> bool:
+    """
+    WP returns 400 rest_post_invalid_page_number one page past the end when
+    the total is an exact multiple of per_page (or shrank mid-crawl).
+    """
+    return page > 1 and exc.response is not None and exc.response.status_code == 400
+
+
+def _check_page_cap(url: str, pages: int) -> None:
+    if pages > _WP_MAX_PAGES:
+        raise ScrapeError(
+            f"WP API pagination exceeded {_WP_MAX_PAGES} pages for {url}"
+            " — search term too broad?"
+        )
+
+
 def _get_all_pages(client: ScraperClient, url: str, params: dict) -> list[dict]:
-    """Fetch every page of a WP REST collection (100 items per page)."""
-    results: list[dict] = []
-    page = 1
-    while True:
-        if page > _WP_MAX_PAGES:
-            raise ScrapeError(
-                f"WP API pagination exceeded {_WP_MAX_PAGES} pages for {url}"
-                " — search term too broad?"
-            )
+    """
+    Fetch every page of a WP REST collection (100 items per page).
+
+    The first response's ``X-WP-TotalPages`` header tells us how many pages
+    exist, so the rest are fetched concurrently (results keep page order).
+    Without the header, pages are walked one by one until a short page.
+    """
+
+    def _page(page: int) -> tuple[list[dict], Mapping[str, str]]:
         try:
-            batch = client.get_json(
+            return client.get_json_page(
                 url, params={**params, "per_page": _WP_PAGE_SIZE, "page": page}
             )
         except requests.HTTPError as exc:
-            # WP returns 400 rest_post_invalid_page_number one page past the
-            # end when the total is an exact multiple of per_page.
-            if page > 1 and exc.response is not None and exc.response.status_code == 400:
-                return results
+            if _is_past_end(exc, page):
+                return [], {}
             raise
-        results.extend(batch)
-        if len(batch) < _WP_PAGE_SIZE:
-            return results
+
+    first, headers = _page(1)
+    total_pages = _total_pages(headers)
+    if total_pages is not None:
+        _check_page_cap(url, total_pages)
+        results = list(first)
+        if total_pages > 1:
+            workers = min(_WP_PAGE_WORKERS, total_pages - 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for batch, _ in pool.map(_page, range(2, total_pages + 1)):
+                    results.extend(batch)
+        return results
+
+    results = list(first)
+    batch = first
+    page = 1
+    while len(batch) == _WP_PAGE_SIZE:
         page += 1
+        _check_page_cap(url, page)
+        batch, _ = _page(page)
+        results.extend(batch)
+    return results
 
 
-def fetch_games_ssb_api(client: ScraperClient, config: CalendarConfig) -> list[Game]:
+class MatchIndex:
+    """
+    Per-run index of each site's recent match posts, keyed by team post ID.
+
+    The first config for a site crawls that site's ``/match`` collection once
+    (posts published within ``lookback``); every later config on the same
+    site is served from memory instead of running its own fuzzy title search.
+    Safe to share between sync worker threads — concurrent callers for the
+    same site wait for the single crawl.
+
+    The crawl only sees a team's full schedule if none of its matches were
+    published before the window, which is only known when the team post
+    itself is newer than the window (its matches cannot predate it). Older
+    teams are reported as "not indexed" even if some of their matches were
+    crawled, so a partial list is never mistaken for the whole season.
+
+    A failed crawl is remembered and reported as "not indexed", so callers
+    fall back to per-team search rather than retrying the crawl per config.
+    """
+
+    def __init__(self, client: ScraperClient, lookback: timedelta = _MATCH_INDEX_LOOKBACK) -> None:
+        self.client = client
+        self.lookback = lookback
+        self._sites: dict[str, tuple[str, dict[int, list[WpMatch]]] | None] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def matches_for(
+        self, api_base: str, team_id: int, published: str | None = None
+    ) -> list[WpMatch] | None:
+        """
+        Return the indexed matches involving *team_id* on the site at
+        *api_base*, or ``None`` if the team (or the whole site) is not indexed.
+
+        *published* is the team post's WP ``date``; unless it falls inside
+        the crawled window the index may be missing some of the team's
+        matches, so ``None`` is returned.
+        """
+        with self._guard:
+            lock = self._locks.setdefault(api_base, threading.Lock())
+        with lock:
+            if api_base not in self._sites:
+                self._sites[api_base] = self._crawl(api_base)
+        site = self._sites[api_base]
+        if site is None:
+            return None
+        after, by_team = site
+        # WP dates and ``after`` are both site-local ISO strings, so they
+        # compare the way WordPress itself filters the crawl.
+        if not published or published <= after:
+            logger.debug(
+                f"Team {team_id} was published before the match index window"
+                " — using per-team search"
+            )
+            return None
+        return by_team.get(team_id)
+
+    def _crawl(self, api_base: str) -> tuple[str, dict[int, list[WpMatch]]] | None:
+        # Whole days, so the crawl's URL (and its HTTP cache key) stays the
+        # same across every run on the same day.
+        after = (datetime.now(tz=timezone.utc) - self.lookback).strftime("%Y-%m-%dT00:00:00")
+        try:
+            matches = _decode_matches(
+                _get_all_pages(
+                    self.client,
+                    f"{api_base}/match",
+                    params={"after": after, "_fields": _MATCH_FIELDS},
+                )
+            )
+        except Exception:
+            logger.exception(
+                f"Match index crawl failed for {api_base} — using per-team search"
+            )
+            return None
+
+        by_team: dict[int, list[WpMatch]] = {}
+        for match in matches:
+            for team_id in {match.home_id, match.away_id}:
+                by_team.setdefault(team_id, []).append(match)
+        logger.info(
+            f"Indexed {len(matches)} matches for {len(by_team)} teams from {api_base}"
+        )
+        return after, by_team
+
+
+def fetch_games_ssb_api(
+    client: ScraperClient,
+    config: CalendarConfig,
+    match_index: MatchIndex | None = None,
+) -> list[Game]:
     """
     Fetch the schedule via the SSB WordPress REST API.
 
-    Resolves the team post from the config URL slug, searches match posts by
-    the team's full title, then keeps only matches where this team is the
-    home or away side (search alone is fuzzy).
+    Resolves the team post from the config URL slug, then takes the team's
+    matches from *match_index* when given; otherwise (or if the index cannot
+    vouch for the team's whole schedule) searches match posts by the team's
+    full title. Only matches where this team is the home or away side are
+    kept (search alone is fuzzy).
     """
     base = _wp_api_base(config.url)
     slug = _team_slug(config.url)
 
-    teams = client.get_json(f"{base}/team", params={"slug": slug})
+    teams = client.get_json(f"{base}/team", params={"slug": slug, "_fields": _TEAM_FIELDS})
+    team_id, team_title = _resolve_team(teams, slug)
+    matches = (
+        match_index.matches_for(base, team_id, published=teams[0].get("date"))
+        if match_index else None
+    )
+    if matches is None:
+        matches = _decode_matches(
+            _get_all_pages(
+                client,
+                f"{base}/match",
+                params={"search": team_title, "_fields": _MATCH_FIELDS},
+            )
+        )
+    return _games_from_matches(matches, team_id, team_title)
+
+
+def _resolve_team(teams: list[dict], slug: str) -> tuple[int, str]:
+    """Return ``(post id, unescaped title)`` from a ``/team?slug=`` response."""
     if not teams:
         raise ScrapeError(f"No WP team post found for slug {slug!r}")
     team = teams[0]
     team_id = team["id"]
     team_title = html.unescape(team["title"]["rendered"])
     logger.debug(f"Resolved team slug {slug!r} to post {team_id} ({team_title!r})")
+    return team_id, team_title
 
-    matches = _get_all_pages(client, f"{base}/match", params={"search": team_title})
 
-    games: list[Game] = []
-    for match in matches:
+def _decode_matches(posts: list[dict]) -> list[WpMatch]:
+    """Decode raw match posts into :class:`WpMatch` records, skipping malformed ones."""
+    matches: list[WpMatch] = []
+    for post in posts:
         try:
-            acf = match["acf"]
-            home, away = acf["home_team"], acf["away_team"]
-            if team_id not in (home["ID"], away["ID"]):
-                continue
-            # post_title values carry HTML entities ("&amp;"); the HTML source
-            # decodes them, so unescape here to keep titles identical.
-            opponent = html.unescape(
-                away["post_title"] if home["ID"] == team_id else home["post_title"]
-            )
-            round_label = round_label_from_slug(match["slug"]) or match["slug"]
-            # acf.time is Sydney wall-clock encoded as a UTC epoch: decode as UTC,
-            # keep the wall-clock digits, and re-label the zone as Sydney.
-            time_val = acf["time"]
-            if not time_val:
-                logger.warning(
-                    f"Match {match.get('id')} ({match.get('slug')!r}) has no scheduled"
-                    " time (TBD) — skipping"
-                )
-                continue
-            start = datetime.fromtimestamp(time_val, tz=timezone.utc).replace(
-                tzinfo=SYDNEY
-            )
-            games.append(
-                Game(
-                    key=normalize_round_key(round_label),
-                    title=f"{round_label}: {opponent}",
-                    start=start,
-                    end=start + GAME_DURATION,
-                    venue=html.unescape(acf["venue"]["post_title"]),
-                    details_url=match["link"],
-                )
-            )
+            matches.append(WpMatch.from_json(post))
         except (KeyError, TypeError):
             logger.warning(
-                f"Match {match.get('id')} ({match.get('slug')!r}) is malformed"
+                f"Match {post.get('id')} ({post.get('slug')!r}) is malformed"
                 " — skipping"
             )
+    return matches
+
+
+def _games_from_matches(matches: list[WpMatch], team_id: int, team_title: str) -> list[Game]:
+    """Build the sorted Game list for *team_id* from decoded match posts."""
+    games: list[Game] = []
+    for match in matches:
+        if team_id not in (match.home_id, match.away_id):
             continue
+        # Titles were unescaped at decode time ("&amp;" -> "&"), matching the
+        # HTML source so both produce identical event titles.
+        opponent = match.away_title if match.home_id == team_id else match.home_title
+        round_label = round_label_from_slug(match.slug) or match.slug
+        if not match.time:
+            logger.warning(
+                f"Match {match.id} ({match.slug!r}) has no scheduled time (TBD)"
+                " — skipping"
+            )
+            continue
+        # acf.time is Sydney wall-clock encoded as a UTC epoch: decode as UTC,
+        # keep the wall-clock digits, and re-label the zone as Sydney.
+        start = datetime.fromtimestamp(match.time, tz=timezone.utc).replace(tzinfo=SYDNEY)
+        games.append(
+            Game(
+                key=normalize_round_key(round_label),
+                title=f"{round_label}: {opponent}",
+                start=start,
+                end=start + GAME_DURATION,
+                venue=match.venue,
+                details_url=match.link,
+            )
+        )
 
     # Warn about duplicate round keys — one game per round is a load-bearing
     # assumption for identity-based calendar sync.
@@ -185,13 +356,31 @@ def fetch_games_ssb_api(client: ScraperClient, config: CalendarConfig) -> list[G
 
 
 def fetch_games_ssb_html(client: ScraperClient, config: CalendarConfig) -> list[Game]:
-    """Fetch the schedule by scraping the team's HTML page (fallback path)."""
-    html_content = client.get_html(config.url)
-    raw_games = HTMLHelper.parse_html_content(
-        html_content=html_content, parse_type="ssb"
-    )
+    """
+    Fetch the schedule by scraping the team's HTML page (fallback path).
+
+    The page is downloaded whole and parsed with :meth:`HTMLHelper.parse_html_content`,
+    which only builds the schedule grids (and uses lxml when the ``lxml``
+    extra is installed). With ``HTML_STREAM`` set, it is
+    streamed instead: game elements are parsed as they arrive, which keeps
+    memory flat on very large pages at the cost of slower parsing.
+    """
+    if _stream_html():
+        raw_games = list(HTMLHelper.iter_ssb_content(client.iter_html(config.url)))
+    else:
+        raw_games = HTMLHelper.parse_html_content(client.get_html(config.url), parse_type="ssb")
+    return _games_from_raw(raw_games, config.url)
+
+
+def _stream_html() -> bool:
+    """Whether ``HTML_STREAM`` asks for the streaming HTML parser."""
+    return os.environ.get("HTML_STREAM", "").strip().lower() in ("1", "true", "yes")
+
+
+def _games_from_raw(raw_games: list[dict], url: str) -> list[Game]:
+    """Wrap :class:`HTMLHelper` game dicts into Sydney-zoned Game objects."""
     if not raw_games:
-        raise ScrapeError(f"HTML source parsed no games from {config.url}")
+        raise ScrapeError(f"HTML source parsed no games from {url}")
 
     games = [
         Game(
@@ -204,7 +393,7 @@ def fetch_games_ssb_html(client: ScraperClient, config: CalendarConfig) -> list[
         )
         for raw in raw_games
     ]
-    logger.info(f"HTML source: {len(games)} games from {config.url}")
+    logger.info(f"HTML source: {len(games)} games from {url}")
     return games
 
 
@@ -214,13 +403,21 @@ SOURCES = {
 }
 
 
-def fetch_games(client: ScraperClient, config: CalendarConfig) -> list[Game]:
+def fetch_games(
+    client: ScraperClient,
+    config: CalendarConfig,
+    match_index: MatchIndex | None = None,
+) -> list[Game]:
     """
     Fetch games using the config's source; if the API source fails for any
     reason, automatically fall back to HTML scraping.
+
+    *match_index* (shared across a run) is only used by the API source.
     """
     fetch = SOURCES[config.source]
     try:
+        if config.source == "ssb-api" and match_index is not None:
+            return fetch(client, config, match_index=match_index)
         return fetch(client, config)
     except Exception:
         if config.source != "ssb-api":
@@ -230,3 +427,4 @@ def fetch_games(client: ScraperClient, config: CalendarConfig) -> list[Game]:
         )
         # Look up via the registry (not a direct call) so tests can stub it.
         return SOURCES["ssb-html"](client, config)
+
@@ -0,0 +1,148 @@
+"""
+Serializable sync plans: the event writes one config's sync would make.
+
+:func:`plan_operations` diffs scraped games against a calendar's existing
+events (via :class:`~helpers.event_sync.EventMatcher`, ``build_field_patch``
+and ``build_reschedule_patch``) without touching the API. The resulting
+:class:`SyncPlan` can be logged, saved as JSON for a dry run, or handed to
+``main.execute_plan`` to apply in bulk.
+
+Like ``event_sync``, this module has no I/O or API calls.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass, field
+
+from helpers.event_sync import EventMatcher, build_field_patch, build_reschedule_patch
+from helpers.models import ExistingEvent, Game
+from libs.google_cal_client import BATCH_SIZE, event_id_for
+
+ACTIONS = ("create", "patch", "reschedule")
+
+
+@dataclass(frozen=True)
+class PlannedOperation:
+    """
+    One event write.
+
+    Attributes:
+        action: ``"create"``, ``"patch"`` (stale fields) or ``"reschedule"``.
+        game_key: Stable key of the game the write is for.
+        title: Game title, for logs.
+        event_id: Existing event to patch; ``None`` for creates.
+        fields: For creates, the ``EventBatch.create_event`` keyword
+            arguments; otherwise the patch body.
+    """
+
+    action: str
+    game_key: str
+    title: str
+    event_id: str | None
+    fields: dict
+
+    def describe(self) -> str:
+        """Short log label, e.g. ``"patch ['location']"``."""
+        if self.action == "patch":
+            return f"patch {sorted(self.fields)}"
+        if self.action == "reschedule":
+            return f"reschedule to [{self.fields['start']['dateTime']}]"
+        return "create"
+
+
+@dataclass
+class SyncPlan:
+    """
+    Every write one config's sync would make.
+
+    Attributes:
+        config_name: Calendar display name.
+        schedule_url: The config's schedule URL.
+        calendar_id: Target calendar; ``None`` in a dry run for a calendar
+            that does not exist yet.
+        operations: Planned writes in game order.
+    """
+
+    config_name: str
+    schedule_url: str
+    calendar_id: str | None
+    operations: list[PlannedOperation] = field(default_factory=list)
+
+    def counts(self) -> dict[str, int]:
+        """Number of planned operations per action."""
+        counts = dict.fromkeys(ACTIONS, 0)
+        for operation in self.operations:
+            counts[operation.action] += 1
+        return counts
+
+    @property
+    def batch_requests(self) -> int:
+        """HTTP round-trips needed to apply the plan through the batch endpoint."""
+        return math.ceil(len(self.operations) / BATCH_SIZE)
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "counts": self.counts(),
+            "batch_requests": self.batch_requests,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SyncPlan:
+        return cls(
+            config_name=data["config_name"],
+            schedule_url=data["schedule_url"],
+            calendar_id=data["calendar_id"],
+            operations=[PlannedOperation(**op) for op in data["operations"]],
+        )
+
+
+def plan_operations(
+    games: list[Game],
+    existing: list[ExistingEvent],
+    schedule_url: str,
+    color_id: int | str,
+) -> list[PlannedOperation]:
+    """
+    Diff *games* against the *existing* events of their schedule.
+
+    Each existing event is matched at most once. Games whose event is
+    already up to date produce no operation.
+    """
+    matcher = EventMatcher(existing)
+    operations: list[PlannedOperation] = []
+    for game in games:
+        action, matched = matcher.match(game, consume=True)
+        if action == "exact":
+            patch = build_field_patch(matched, game, color_id)
+            if patch:
+                operations.append(
+                    PlannedOperation("patch", game.key, game.title, matched.id, patch)
+                )
+        elif action == "reschedule":
+            operations.append(
+                PlannedOperation(
+                    "reschedule", game.key, game.title, matched.id,
+                    build_reschedule_patch(game, color_id),
+                )
+            )
+        else:  # "create"
+            operations.append(
+                PlannedOperation(
+                    "create", game.key, game.title, None,
+                    {
+                        "event_name": game.title,
+                        "start_time": game.start.isoformat(),
+                        "end_time": game.end.isoformat(),
+                        "location": game.venue,
+                        "private_properties": {"schedule": schedule_url, "gameKey": game.key},
+                        "color_id": color_id,
+                        "description": game.details_url,
+                        # Stable across retries, so a re-sent insert cannot
+                        # create a second copy of the game.
+                        "event_id": event_id_for(schedule_url, game.key, game.start.isoformat()),
+                    },
+                )
+            )
+    return operations
@@ -4,16 +4,398 @@ Google Calendar API client using OAuth2 credentials.
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import random
 import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from loguru import logger
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from libs.google_transport import DEFAULT_POOL_MAXSIZE, SessionHttp
+from libs.metrics import Metrics
+from libs.rate_limiter import TokenBucket
+from libs.state_store import StateStore
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# The Calendar API accepts at most 50 sub-requests per batch HTTP request.
+BATCH_SIZE = 50
+_BATCH_MAX_ATTEMPTS = 3
+_BATCH_WAIT_SECONDS = 2
+
+# Sub-request failures worth retrying: server errors, 429s, and the 403s
+# Calendar uses for quota ("rateLimitExceeded" / "userRateLimitExceeded").
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+# Single API calls are retried on the same errors with "full jitter"
+# exponential backoff: a random wait in [0, min(max, multiplier * 2**n)].
+_API_MAX_ATTEMPTS = 5
+_API_WAIT_SECONDS = 1
+_API_WAIT_MAX_SECONDS = 32
+
+# events().list page size cap; the API default is 250.
+_MAX_LIST_RESULTS = 2500
+
+# Projection covering everything the sync engine reads from listed events
+# (``status`` marks deletions in incremental listings).
+SYNC_EVENT_FIELDS = (
+    "nextPageToken,nextSyncToken,"
+    "items(id,status,summary,colorId,description,location,start,extendedProperties)"
+)
+
+# State-store namespace holding {"sync_token": ..., "events": {id: event}}
+# per calendar for incremental listing.
+_EVENT_SNAPSHOTS = "event_snapshots"
+
+# State-store namespace/key holding {"sync_token": ..., "calendars": {id: summary}}
+# for the account's calendar list.
+_CALENDAR_SNAPSHOTS = "calendar_snapshots"
+_CALENDAR_LIST_KEY = "calendar_list"
+_CALENDAR_LIST_FIELDS = "nextPageToken,nextSyncToken,items(id,summary,deleted)"
+
+# State-store namespace recording when each calendar was last confirmed
+# public; the ACL is only re-listed once the record is older than the
+# client's ``acl_recheck_interval``.
+_PUBLIC_ACL = "public_acl"
+DEFAULT_ACL_RECHECK_INTERVAL = timedelta(days=7)
+
+
+def _is_retryable_google_error(exc: BaseException) -> bool:
+    """Return True for transient Google API errors worth retrying."""
+    if not isinstance(exc, HttpError):
+        return False
+    return exc.resp.status in _RETRYABLE_STATUS_CODES or _is_rate_limit_error(exc)
+
+
+def _method_name(request) -> str:
+    """Metrics label for *request*: ``"events.insert"`` etc., or ``"batch"``."""
+    method_id = getattr(request, "methodId", None)
+    if not isinstance(method_id, str):
+        return "batch"
+    return method_id.removeprefix("calendar.")
+
+
+def _status_label(exc: BaseException | None) -> str:
+    if exc is None:
+        return "ok"
+    if isinstance(exc, HttpError):
+        return str(exc.resp.status)
+    return type(exc).__name__
+
+
+def _is_duplicate_error(exc: BaseException | None) -> bool:
+    """Return True if *exc* says an insert's client-chosen ID already exists."""
+    return isinstance(exc, HttpError) and exc.resp.status == 409
+
+
+def event_id_for(*parts: str) -> str:
+    """
+    Deterministic Calendar event ID for the event identified by *parts*.
+
+    Inserting with a client-chosen ID makes the insert idempotent: if a
+    retried insert had in fact already succeeded, the retry fails with 409
+    instead of creating a duplicate event. Calendar requires IDs in
+    base32hex (``[0-9a-v]``), 5-1024 characters long.
+    """
+    digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).digest()
+    return base64.b32hexencode(digest).decode("ascii").lower()
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True if *exc* says we exceeded a Calendar quota (429 or 403)."""
+    if not isinstance(exc, HttpError):
+        return False
+    status = exc.resp.status
+    if status == 429:
+        return True
+    if status == 403 and isinstance(exc.error_details, list):
+        return any(
+            isinstance(detail, dict) and detail.get("reason") in _RATE_LIMIT_REASONS
+            for detail in exc.error_details
+        )
+    return False
+
+
+def _event_body(
+    event_name: str,
+    start_time: str,
+    end_time: str,
+    location: str,
+    private_properties: dict,
+    description: str,
+    visible_attendees: bool,
+    time_zone: str,
+    color_id: int,
+    attendees: list,
+) -> dict:
+    """Build the ``events().insert`` request body."""
+    body: dict = {
+        "summary": event_name,
+        "start": {"dateTime": start_time, "timeZone": time_zone},
+        "end": {"dateTime": end_time, "timeZone": time_zone},
+        "attendees": attendees,
+        "location": location,
+        "extendedProperties": {"private": private_properties},
+        "guestsCanSeeOtherGuests": visible_attendees,
+        "colorId": color_id,
+    }
+    if description:
+        body["description"] = description
+    return body
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one queued mutation after :meth:`EventBatch.flush`."""
+
+    request_id: str
+    response: dict | None
+    error: Exception | None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class EventBatch:
+    """
+    Queue of event mutations sent through the Calendar batch endpoint.
+
+    Mutations are queued with :meth:`create_event` / :meth:`patch_event` and
+    sent by :meth:`flush` in groups of up to :data:`BATCH_SIZE`, so a whole
+    calendar's worth of writes costs one HTTP round-trip per 50 events.
+    Sub-requests that fail with a transient error (see
+    :func:`_is_retryable_google_error`) are re-sent in a fresh batch, up to
+    ``_BATCH_MAX_ATTEMPTS`` times in total.
+
+    Inserts queued with an *event_id* are safe to re-send: a 409 on a
+    re-sent insert means an earlier attempt created the event, and counts
+    as success. A 409 on the first attempt means an event we did not plan
+    around holds the ID (usually one deleted from the calendar, whose ID
+    Calendar keeps), so it is restored and overwritten with a patch.
+
+    Obtain one via :meth:`GoogleCalClient.batch`.
+    """
+
+    def __init__(self, client: GoogleCalClient, batch_size: int = BATCH_SIZE) -> None:
+        self._client = client
+        self._batch_size = batch_size
+        # request_id -> factory building a fresh HttpRequest (requests are
+        # rebuilt on retry rather than re-sent).
+        self._pending: dict[str, Callable] = {}
+        # request_id -> (event ID, factory for the patch restoring that
+        # event) for inserts with a client-chosen ID.
+        self._upserts: dict[str, tuple[str, Callable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _queue(self, request_id: str, factory: Callable) -> None:
+        if request_id in self._pending:
+            raise ValueError(f"Duplicate batch request id {request_id!r}")
+        self._pending[request_id] = factory
+
+    def create_event(
+        self,
+        request_id: str,
+        event_name: str,
+        start_time: str,
+        end_time: str,
+        location: str,
+        private_properties: dict,
+        description: str = "",
+        calendar_id: str = "primary",
+        visible_attendees: bool = False,
+        time_zone: str = "Australia/Sydney",
+        color_id: int = 1,
+        attendees: list | None = None,
+        event_id: str | None = None,
+    ) -> None:
+        """
+        Queue an event insert; arguments match :meth:`GoogleCalClient.create_event`.
+
+        Pass *event_id* (see :func:`event_id_for`) to make the insert safe
+        to retry.
+        """
+        body = _event_body(
+            event_name, start_time, end_time, location, private_properties,
+            description, visible_attendees, time_zone, color_id, attendees or [],
+        )
+        service = self._client.service
+        self._queue(
+            request_id,
+            lambda: service.events().insert(
+                calendarId=calendar_id, body={**body, "id": event_id} if event_id else body
+            ),
+        )
+        if event_id:
+            self._upserts[request_id] = (
+                event_id,
+                lambda: service.events().patch(
+                    calendarId=calendar_id, eventId=event_id, body={**body, "status": "confirmed"}
+                ),
+            )
+
+    def patch_event(
+        self,
+        request_id: str,
+        event_id: str,
+        patched_fields: dict,
+        calendar_id: str = "primary",
+    ) -> None:
+        """Queue an event patch; arguments match :meth:`GoogleCalClient.patch_event`."""
+        service = self._client.service
+        self._queue(
+            request_id,
+            lambda: service.events().patch(
+                calendarId=calendar_id, eventId=event_id, body=patched_fields
+            ),
+        )
+
+    def flush(self) -> dict[str, BatchResult]:
+        """
+        Send every queued mutation and return ``{request_id: BatchResult}``.
+
+        Never raises for individual sub-request failures — inspect
+        :attr:`BatchResult.error`. The queue is empty afterwards.
+        """
+        pending, self._pending = self._pending, {}
+        upserts, self._upserts = self._upserts, {}
+        results: dict[str, BatchResult] = {}
+        sent: set[str] = set()
+
+        for attempt in range(1, _BATCH_MAX_ATTEMPTS + 1):
+            retry: dict[str, Callable] = {}
+            ids = list(pending)
+            for start in range(0, len(ids), self._batch_size):
+                chunk = ids[start:start + self._batch_size]
+                for request_id, result in self._send(chunk, pending).items():
+                    if request_id in upserts and _is_duplicate_error(result.error):
+                        event_id, restore = upserts.pop(request_id)
+                        if request_id in sent:
+                            # An earlier attempt created the event; only its
+                            # response was lost.
+                            result = BatchResult(request_id, {"id": event_id}, None)
+                        elif attempt < _BATCH_MAX_ATTEMPTS:
+                            logger.warning(f"Event [{event_id}] already exists — restoring it")
+                            results[request_id] = result
+                            retry[request_id] = restore
+                            continue
+                    results[request_id] = result
+                    if (
+                        result.error is not None
+                        and attempt < _BATCH_MAX_ATTEMPTS
+                        and _is_retryable_google_error(result.error)
+                    ):
+                        retry[request_id] = pending[request_id]
+                sent.update(chunk)
+            if not retry:
+                break
+            metrics = self._client.metrics
+            if metrics is not None:
+                metrics.inc("gcal_batch_retries_total", len(retry))
+            wait = _BATCH_WAIT_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            limiter = self._client.rate_limiter
+            if limiter is not None and any(
+                _is_rate_limit_error(results[request_id].error) for request_id in retry
+            ):
+                limiter.pause(wait)
+            logger.warning(
+                f"Retrying {len(retry)} failed batch sub-request(s) in {wait:.1f}s "
+                f"(attempt {attempt + 1}/{_BATCH_MAX_ATTEMPTS})"
+            )
+            time.sleep(wait)
+            pending = retry
+
+        return results
+
+    def _send(
+        self, request_ids: list[str], factories: dict[str, Callable]
+    ) -> dict[str, BatchResult]:
+        """Execute one batch HTTP request for *request_ids*."""
+        results: dict[str, BatchResult] = {}
+
+        def _callback(request_id: str, response: dict | None, exception: Exception | None) -> None:
+            results[request_id] = BatchResult(request_id, response, exception)
+
+        batch = self._client.service.new_batch_http_request(callback=_callback)
+        methods: dict[str, str] = {}
+        for request_id in request_ids:
+            request = factories[request_id]()
+            methods[request_id] = _method_name(request)
+            batch.add(request, request_id=request_id)
+        logger.debug(f"Sending batch of {len(request_ids)} Calendar request(s)")
+        # Quota is charged per sub-request, so the batch takes one token each.
+        self._client._execute(batch, tokens=len(request_ids))
+        metrics = self._client.metrics
+        if metrics is not None:
+            for request_id, result in results.items():
+                metrics.inc(
+                    "gcal_batch_subrequests_total",
+                    method=methods[request_id],
+                    status=_status_label(result.error),
+                )
+        return results
+
+
+class CalendarDirectory:
+    """
+    Run-wide ``name -> calendar ID`` lookup shared by every sync worker.
+
+    The calendar list is loaded once, on first use, through
+    :meth:`GoogleCalClient.calendar_index`; calendars created during the
+    run are added in place. Lookups and creations are serialized so two
+    workers can never both create a calendar with the same name.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def lookup(self, client: GoogleCalClient, name: str) -> str | None:
+        """Return the ID of the calendar named *name*, or ``None`` if missing."""
+        with self._lock:
+            if self._index is None:
+                self._index = client.calendar_index()
+            return self._index.get(name)
+
+    def get_or_create(
+        self, client: GoogleCalClient, name: str, description: str
+    ) -> tuple[str, bool]:
+        """
+        Return ``(calendar_id, created)`` for the calendar named *name*,
+        creating it (with *description*) through *client* if it is missing.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = client.calendar_index()
+            calendar_id = self._index.get(name)
+            if calendar_id is not None:
+                return calendar_id, False
+            calendar_id = client.insert_calendar(
+                calendar_name=name, description=description
+            )
+            self._index[name] = calendar_id
+            return calendar_id, True
+
 
 class GoogleCalClient:
     """
@@ -21,6 +403,19 @@ class GoogleCalClient:
 
     Attributes:
         name: Identifier for this client instance (used in log messages).
+        state: Optional persistent store enabling incremental event listing
+            and cached public-ACL checks.
+        acl_recheck_interval: How long a calendar confirmed public is
+            trusted before :meth:`ensure_calendar_public` lists its ACL
+            again (zero re-checks every time).
+        rate_limiter: Optional token bucket every API call draws from;
+            share one instance between clients to cap their combined rate.
+        metrics: Optional run metrics; every API call is counted and timed
+            by method and status, with retries and rate-limiter waits.
+
+    The discovery service runs on a pooled, thread-safe transport
+    (:class:`~libs.google_transport.SessionHttp`), so one client can be
+    shared by concurrent sync workers; size *pool_maxsize* to match them.
     """
 
     def __init__(
@@ -29,8 +424,17 @@ class GoogleCalClient:
         gcal_client_id: str,
         gcal_client_secret: str,
         gcal_refresh_token: str,
+        state: StateStore | None = None,
+        acl_recheck_interval: timedelta = DEFAULT_ACL_RECHECK_INTERVAL,
+        rate_limiter: TokenBucket | None = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        metrics: Metrics | None = None,
     ) -> None:
         self.name = name
+        self.state = state
+        self.acl_recheck_interval = acl_recheck_interval
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
 
         self.creds = Credentials.from_authorized_user_info(
             {
@@ -50,12 +454,160 @@ class GoogleCalClient:
                     'by running `uv run python src/libs/google_cal_client.py`.'
                 )
 
-        self.service = build("calendar", "v3", credentials=self.creds)
+        self.service = build(
+            "calendar", "v3", http=SessionHttp(self.creds, pool_maxsize=pool_maxsize)
+        )
         logger.debug(f"Created GCal client '{name}'")
 
+    def _execute(
+        self,
+        request,
+        tokens: int = 1,
+        before_retry: Callable[[], object | None] | None = None,
+    ):
+        """
+        Execute an API *request* under the rate limiter, with retry.
+
+        Transient failures (see :func:`_is_retryable_google_error`) are
+        retried up to ``_API_MAX_ATTEMPTS`` times with jittered exponential
+        backoff, re-acquiring *tokens* before every attempt. A quota error
+        also pauses the shared limiter for the backoff period, so other
+        threads back off too instead of burning their own attempts.
+
+        For writes that are not safe to repeat, *before_retry* is called
+        before every re-send to check whether a failed attempt took effect
+        anyway; a non-``None`` result is returned instead of re-sending.
+
+        With :attr:`metrics` set, every attempt is counted and timed under
+        the request's method (``"batch"`` for a batch request).
+        """
+        method = _method_name(request)
+
+        def _before_sleep(retry_state: RetryCallState) -> None:
+            exc = retry_state.outcome.exception()
+            wait = retry_state.next_action.sleep
+            if self.rate_limiter is not None and _is_rate_limit_error(exc):
+                self.rate_limiter.pause(wait)
+            if self.metrics is not None:
+                self.metrics.inc("gcal_retries_total", method=method)
+            logger.warning(
+                f"Calendar API call failed ({exc.resp.status}); retrying in {wait:.1f}s "
+                f"(attempt {retry_state.attempt_number + 1}/{_API_MAX_ATTEMPTS})"
+            )
+
+        for attempt in Retrying(
+            retry=retry_if_exception(_is_retryable_google_error),
+            stop=stop_after_attempt(_API_MAX_ATTEMPTS),
+            wait=wait_random_exponential(
+                multiplier=_API_WAIT_SECONDS, max=_API_WAIT_MAX_SECONDS
+            ),
+            before_sleep=_before_sleep,
+            reraise=True,
+        ):
+            with attempt:
+                if before_retry is not None and attempt.retry_state.attempt_number > 1:
+                    recovered = before_retry()
+                    if recovered is not None:
+                        return recovered
+                if self.rate_limiter is not None:
+                    started = time.perf_counter()
+                    self.rate_limiter.acquire(tokens)
+                    if self.metrics is not None:
+                        self.metrics.observe(
+                            "gcal_rate_limit_wait_seconds", time.perf_counter() - started
+                        )
+                if self.metrics is None:
+                    return request.execute()
+                return self._execute_timed(request, method)
+
+    def _execute_timed(self, request, method: str):
+        """Execute *request* once, recording its duration and outcome."""
+        started = time.perf_counter()
+        error: BaseException | None = None
+        try:
+            return request.execute()
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self.metrics.observe(
+                "gcal_call_seconds", time.perf_counter() - started, method=method
+            )
+            self.metrics.inc("gcal_calls_total", method=method, status=_status_label(error))
+
     def get_calendar_list(self) -> dict:
-        """Return the authenticated user's full calendar list."""
-        return self.service.calendarList().list().execute()
+        """Return the authenticated user's full calendar list, following pagination."""
+        items, _ = self._list_calendar_pages()
+        return {"items": items}
+
+    def calendar_index(self) -> dict[str, str]:
+        """
+        Return ``{summary: calendar_id}`` for every calendar on the account
+        (hidden ones included). For duplicate names the first listed wins.
+
+        With a :attr:`state` store the list is persisted and refreshed with
+        the calendar list's own ``syncToken``, so a run costs one small
+        request returning only calendars added, renamed or deleted since the
+        previous run (a full listing on the first run or after HTTP 410).
+        """
+        if self.state is None:
+            items, _ = self._list_calendar_pages(fields=_CALENDAR_LIST_FIELDS)
+            calendars = {item["id"]: item["summary"] for item in items}
+        else:
+            calendars = self._refresh_calendar_snapshot()
+
+        index: dict[str, str] = {}
+        for calendar_id, summary in calendars.items():
+            index.setdefault(summary, calendar_id)
+        return index
+
+    def _refresh_calendar_snapshot(self) -> dict[str, str]:
+        snapshot = self.state.get(_CALENDAR_SNAPSHOTS, _CALENDAR_LIST_KEY)
+        items: list[dict] | None = None
+        if snapshot and snapshot.get("sync_token"):
+            try:
+                items, sync_token = self._list_calendar_pages(
+                    syncToken=snapshot["sync_token"], fields=_CALENDAR_LIST_FIELDS
+                )
+            except HttpError as exc:
+                if exc.resp.status != 410:
+                    raise
+                logger.info("Calendar list sync token expired — full listing")
+
+        if items is None:
+            items, sync_token = self._list_calendar_pages(fields=_CALENDAR_LIST_FIELDS)
+            calendars: dict[str, str] = {}
+        else:
+            calendars = snapshot["calendars"]
+
+        for item in items:
+            if item.get("deleted"):
+                calendars.pop(item["id"], None)
+            else:
+                calendars[item["id"]] = item["summary"]
+
+        self.state.set(
+            _CALENDAR_SNAPSHOTS,
+            _CALENDAR_LIST_KEY,
+            {"sync_token": sync_token, "calendars": calendars},
+        )
+        logger.debug(f"Listed {len(items)} calendar change(s) ({len(calendars)} total)")
+        return calendars
+
+    def _list_calendar_pages(self, **params) -> tuple[list[dict], str | None]:
+        """Page through ``calendarList().list`` and return ``(items, nextSyncToken)``."""
+        items: list[dict] = []
+        page_token: str | None = None
+        if "syncToken" not in params:
+            params["showHidden"] = True
+        while True:
+            response = self._execute(self.service.calendarList().list(
+                pageToken=page_token, **params
+            ))
+            items.extend(response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return items, response.get("nextSyncToken")
 
     def insert_calendar(
         self,
@@ -63,23 +615,43 @@ class GoogleCalClient:
         description: str,
         time_zone: str = "Australia/Sydney",
     ) -> str:
-        """Create a new calendar and return its ID."""
+        """
+        Create a new calendar and return its ID.
+
+        Calendars cannot be given client-chosen IDs, so before a failed
+        insert is retried the calendar list is checked for *calendar_name*:
+        if the failed attempt did create it, that calendar is used instead
+        of creating a second one.
+        """
         body = {
             "summary": calendar_name,
             "description": description,
             "timeZone": time_zone,
         }
-        created = self.service.calendars().insert(body=body).execute()
+
+        def _created_anyway() -> dict | None:
+            calendar_id = self.calendar_index().get(calendar_name)
+            return {"id": calendar_id} if calendar_id else None
+
+        created = self._execute(
+            self.service.calendars().insert(body=body), before_retry=_created_anyway
+        )
+        if self.state is not None:
+            # Keep the persisted calendar list current without a re-listing.
+            snapshot = self.state.get(_CALENDAR_SNAPSHOTS, _CALENDAR_LIST_KEY)
+            if snapshot is not None:
+                snapshot["calendars"][created["id"]] = calendar_name
+                self.state.set(_CALENDAR_SNAPSHOTS, _CALENDAR_LIST_KEY, snapshot)
         return created["id"]
 
     def patch_calendar(self, calendar_id: str, patched_fields: dict) -> str:
         """Patch calendar metadata fields and return the calendar ID."""
-        response = self.service.calendars().patch(
+        response = self._execute(self.service.calendars().patch(
             calendarId=calendar_id, body=patched_fields
-        ).execute()
+        ))
         return response.get("id")
 
-    def ensure_calendar_public(self, calendar_id: str) -> None:
+    def ensure_calendar_public(self, calendar_id: str, force: bool = False) -> None:
         """
         Make the calendar publicly readable if it isn't already.
 
@@ -88,20 +660,43 @@ class GoogleCalClient:
         toggle creates. A ``freeBusyReader`` default rule does not count:
         event details must be visible for the shared links to be useful.
         Idempotent; safe to call on every sync run.
+
+        With a :attr:`state` store, a calendar confirmed public within the
+        last :attr:`acl_recheck_interval` is trusted without listing its ACL
+        again; *force* re-checks regardless.
         """
-        rules = self.service.acl().list(calendarId=calendar_id).execute()
+        if not force and self._known_public(calendar_id):
+            logger.debug(f"Calendar [{calendar_id}] is known to be public")
+            return
+
+        rules = self._execute(self.service.acl().list(calendarId=calendar_id))
         for rule in rules.get("items", []):
             if (
                 rule.get("scope", {}).get("type") == "default"
                 and rule.get("role") == "reader"
             ):
                 logger.debug(f"Calendar [{calendar_id}] is already public")
+                self._mark_public(calendar_id)
                 return
-        self.service.acl().insert(
+        self._execute(self.service.acl().insert(
             calendarId=calendar_id,
             body={"role": "reader", "scope": {"type": "default"}},
-        ).execute()
+        ))
         logger.info(f"Calendar [{calendar_id}] made publicly readable")
+        self._mark_public(calendar_id)
+
+    def _known_public(self, calendar_id: str) -> bool:
+        if self.state is None or self.acl_recheck_interval <= timedelta(0):
+            return False
+        record = self.state.get(_PUBLIC_ACL, calendar_id)
+        if record is None:
+            return False
+        age = time.time() - record["verified_at"]
+        return age < self.acl_recheck_interval.total_seconds()
+
+    def _mark_public(self, calendar_id: str) -> None:
+        if self.state is not None:
+            self.state.set(_PUBLIC_ACL, calendar_id, {"verified_at": time.time()})
 
     def create_event(
         self,
@@ -116,10 +711,17 @@ class GoogleCalClient:
         time_zone: str = "Australia/Sydney",
         color_id: int = 1,
         attendees: list = [],
+        event_id: str | None = None,
     ) -> str:
         """
         Insert a new Google Calendar event and return its ID.
 
+        With *event_id* (see :func:`event_id_for`) the insert is safe to
+        retry: before a failed attempt is re-sent, the event is looked up
+        and reused if that attempt created it. If another event — usually
+        one deleted from the calendar, whose ID Calendar keeps — already
+        holds the ID, it is restored and overwritten instead.
+
         Args:
             event_name: Event title/summary.
             start_time: Start datetime string ``"%Y-%m-%dT%H:%M:%S"``.
@@ -132,28 +734,45 @@ class GoogleCalClient:
             time_zone: IANA timezone name (default ``"Australia/Sydney"``).
             color_id: Google Calendar event color ID 1–11.
             attendees: List of attendee dicts e.g. ``[{"email": "..."}]``.
+            event_id: Optional client-chosen event ID (base32hex).
 
         Returns:
             The created event's ID.
         """
-        body: dict = {
-            "summary": event_name,
-            "start": {"dateTime": start_time, "timeZone": time_zone},
-            "end": {"dateTime": end_time, "timeZone": time_zone},
-            "attendees": attendees,
-            "location": location,
-            "extendedProperties": {"private": private_properties},
-            "guestsCanSeeOtherGuests": visible_attendees,
-            "colorId": color_id,
-        }
-        if description:
-            body["description"] = description
+        body = _event_body(
+            event_name, start_time, end_time, location, private_properties,
+            description, visible_attendees, time_zone, color_id, attendees,
+        )
+        if event_id is None:
+            response = self._execute(self.service.events().insert(
+                calendarId=calendar_id, body=body
+            ))
+            return response.get("id")
 
-        response = self.service.events().insert(
-            calendarId=calendar_id, body=body
-        ).execute()
+        try:
+            response = self._execute(
+                self.service.events().insert(calendarId=calendar_id, body={**body, "id": event_id}),
+                before_retry=lambda: self._live_event(calendar_id, event_id),
+            )
+        except HttpError as exc:
+            if not _is_duplicate_error(exc):
+                raise
+            logger.warning(f"Event [{event_id}] already exists — restoring it")
+            response = self._execute(self.service.events().patch(
+                calendarId=calendar_id, eventId=event_id, body={**body, "status": "confirmed"}
+            ))
         return response.get("id")
 
+    def _live_event(self, calendar_id: str, event_id: str) -> dict | None:
+        """Return event *event_id*, or ``None`` if it is missing or cancelled."""
+        try:
+            event = self.get_event_details(event_id, calendar_id=calendar_id)
+        except HttpError as exc:
+            if exc.resp.status == 404:
+                return None
+            raise
+        return None if event.get("status") == "cancelled" else event
+
     def patch_event(
         self,
         event_id: str,
@@ -161,11 +780,15 @@ class GoogleCalClient:
         calendar_id: str = "primary",
     ) -> str:
         """Patch specific fields on an existing event and return the event ID."""
-        response = self.service.events().patch(
+        response = self._execute(self.service.events().patch(
             calendarId=calendar_id, eventId=event_id, body=patched_fields
-        ).execute()
+        ))
         return response.get("id")
 
+    def batch(self) -> EventBatch:
+        """Return an empty :class:`EventBatch` bound to this client."""
+        return EventBatch(self)
+
     def update_event(
         self,
         event_id: str,
@@ -173,34 +796,155 @@ class GoogleCalClient:
         calendar_id: str = "primary",
     ) -> dict:
         """Full PUT-style replacement of an event. Returns the updated event dict."""
-        return self.service.events().update(
+        return self._execute(self.service.events().update(
             calendarId=calendar_id, eventId=event_id, body=updated_event
-        ).execute()
+        ))
 
-    def list_events(self, calendar_id: str = "primary") -> list[dict]:
+    def list_events(
+        self,
+        calendar_id: str = "primary",
+        incremental: bool = False,
+        *,
+        private_properties: dict | None = None,
+        time_min: datetime | None = None,
+        time_max: datetime | None = None,
+        fields: str | None = None,
+        max_results: int = _MAX_LIST_RESULTS,
+    ) -> list[dict]:
         """
         Return **all** events for *calendar_id*, following pagination.
 
-        The Calendar API returns at most 250 events per page; without
-        pagination, events beyond the first page would be silently missed
-        and re-created as duplicates.
+        The Calendar API returns at most *max_results* events per page;
+        without pagination, events beyond the first page would be silently
+        missed and re-created as duplicates.
+
+        With ``incremental=True`` (requires :attr:`state`), only events
+        changed since the previous run are fetched using the stored
+        ``nextSyncToken`` and merged into the persisted snapshot; see
+        :meth:`_list_events_incremental`.
+
+        Args:
+            private_properties: Server-side filter — only events whose private
+                extended properties include every ``key: value`` pair.
+            time_min: Only events ending after this instant.
+            time_max: Only events starting before this instant.
+            fields: Partial-response projection, e.g. :data:`SYNC_EVENT_FIELDS`.
+            max_results: Page size (the API caps it at 2500).
+
+        Raises:
+            ValueError: If filters are combined with ``incremental`` — the API
+                does not issue sync tokens for filtered listings.
+        """
+        params: dict = {"maxResults": max_results}
+        if fields:
+            params["fields"] = fields
+
+        if incremental:
+            if private_properties or time_min or time_max:
+                raise ValueError("Incremental listing cannot be combined with filters")
+            events, _ = self._list_events_incremental(calendar_id, **params)
+            return events
+
+        if private_properties:
+            params["privateExtendedProperty"] = [
+                f"{key}={value}" for key, value in private_properties.items()
+            ]
+        if time_min:
+            params["timeMin"] = time_min.isoformat()
+        if time_max:
+            params["timeMax"] = time_max.isoformat()
+        events, _ = self._list_event_pages(calendar_id, **params)
+        return events
+
+    def sync_events(
+        self,
+        calendar_id: str,
+        *,
+        fields: str | None = None,
+        max_results: int = _MAX_LIST_RESULTS,
+    ) -> tuple[list[dict], list[dict] | None]:
+        """
+        Incrementally refresh *calendar_id* and return ``(events, changes)``.
+
+        *events* is the same as ``list_events(incremental=True)``; *changes*
+        holds the events created, edited or cancelled since the previous
+        listing, or is ``None`` when a full listing was needed (first run or
+        expired sync token), so an empty list reliably means "untouched".
         """
+        params: dict = {"maxResults": max_results}
+        if fields:
+            params["fields"] = fields
+        return self._list_events_incremental(calendar_id, **params)
+
+    def _list_event_pages(self, calendar_id: str, **params) -> tuple[list[dict], str | None]:
+        """Page through ``events().list`` and return ``(items, nextSyncToken)``."""
         events: list[dict] = []
         page_token: str | None = None
         while True:
-            response = self.service.events().list(
-                calendarId=calendar_id, pageToken=page_token
-            ).execute()
+            response = self._execute(self.service.events().list(
+                calendarId=calendar_id, pageToken=page_token, **params
+            ))
             events.extend(response.get("items", []))
             page_token = response.get("nextPageToken")
             if not page_token:
-                return events
+                return events, response.get("nextSyncToken")
+
+    def _list_events_incremental(
+        self, calendar_id: str, **params
+    ) -> tuple[list[dict], list[dict] | None]:
+        """
+        Refresh the persisted event snapshot for *calendar_id* and return
+        ``(events, changes)`` — *changes* is ``None`` after a full listing.
+
+        The first run (or a run whose token Google has expired with HTTP 410)
+        does a full listing; later runs send the stored ``syncToken`` and only
+        receive events changed since, with deletions marked ``cancelled``.
+        """
+        if self.state is None:
+            raise ValueError("Incremental listing requires a state store")
+
+        snapshot = self.state.get(_EVENT_SNAPSHOTS, calendar_id)
+        items: list[dict] | None = None
+        if snapshot and snapshot.get("sync_token"):
+            try:
+                items, sync_token = self._list_event_pages(
+                    calendar_id, syncToken=snapshot["sync_token"], **params
+                )
+            except HttpError as exc:
+                if exc.resp.status != 410:
+                    raise
+                logger.info(
+                    f"Sync token for calendar [{calendar_id}] expired — full listing"
+                )
+
+        if items is None:
+            items, sync_token = self._list_event_pages(calendar_id, **params)
+            events: dict[str, dict] = {}
+            changes = None
+        else:
+            events = snapshot["events"]
+            changes = items
+
+        for item in items:
+            if item.get("status") == "cancelled":
+                events.pop(item["id"], None)
+            else:
+                events[item["id"]] = item
+
+        self.state.set(
+            _EVENT_SNAPSHOTS, calendar_id, {"sync_token": sync_token, "events": events}
+        )
+        logger.debug(
+            f"Listed {len(items)} changed event(s) for calendar [{calendar_id}] "
+            f"({len(events)} total)"
+        )
+        return list(events.values()), changes
 
     def get_event_details(self, event_id: str, calendar_id: str = "primary") -> dict:
         """Return the full event dict for *event_id*."""
-        return self.service.events().get(
+        return self._execute(self.service.events().get(
             calendarId=calendar_id, eventId=event_id
-        ).execute()
+        ))
 
 
 # Running this module directly triggers the one-time OAuth flow used to
@@ -0,0 +1,83 @@
+"""
+Thread-safe, connection-pooling HTTP transport for the Google API client.
+
+``googleapiclient`` talks to an ``httplib2.Http``-shaped object, and its
+default ``httplib2`` transport is neither thread-safe nor pooled. The
+:class:`SessionHttp` adapter exposes the same ``request()`` interface on top
+of a google-auth :class:`~google.auth.transport.requests.AuthorizedSession`
+(a ``requests`` session that attaches and refreshes OAuth tokens), so one
+discovery service can be shared by every sync worker and reuse keep-alive
+connections.
+"""
+
+from __future__ import annotations
+
+import httplib2
+from google.auth.credentials import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections kept to the Calendar API host; size it to the
+# number of threads making Calendar calls at once.
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT_SECONDS = 60
+
+# Response headers that describe the wire encoding ``requests`` has already
+# undone; passing them on would make the body look still-encoded.
+_DECODED_HEADERS = {"content-encoding", "transfer-encoding"}
+
+
+class SessionHttp:
+    """
+    ``httplib2.Http`` stand-in backed by a pooled ``AuthorizedSession``.
+
+    Attributes:
+        session: The underlying authorized session (thread-safe).
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        self.session = AuthorizedSession(credentials)
+        # Retries are handled by GoogleCalClient._execute, not the adapter.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: bytes | str | None = None,
+        headers: dict | None = None,
+        redirections: int = 5,
+        connection_type=None,
+    ) -> tuple[httplib2.Response, bytes]:
+        """
+        Send one request and return ``(response, content)`` in the shape
+        ``googleapiclient`` expects from ``httplib2.Http.request``.
+        """
+        response = self.session.request(
+            method,
+            uri,
+            data=body,
+            headers=headers,
+            timeout=self.timeout,
+            allow_redirects=redirections > 0,
+        )
+        info = {
+            key.lower(): value
+            for key, value in response.headers.items()
+            if key.lower() not in _DECODED_HEADERS
+        }
+        info["status"] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+
+    def close(self) -> None:
+        self.session.close()
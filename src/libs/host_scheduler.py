@@ -0,0 +1,135 @@
+"""
+Per-host request scheduler that keeps concurrent scraping polite.
+
+Every request made by :class:`~libs.scraper_client.ScraperClient` runs
+inside :meth:`HostScheduler.slot`, which caps how many requests to the same
+host are in flight at once and spaces out their start times. A server that
+answers ``429`` / ``503`` with ``Retry-After`` can put its host on hold via
+:meth:`HostScheduler.defer`; other hosts are unaffected.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MIN_INTERVAL = 0.1
+
+# Upper bound on how long a single Retry-After may hold a host.
+MAX_RETRY_AFTER_SECONDS = 300.0
+
+
+@dataclass
+class _HostState:
+    semaphore: threading.BoundedSemaphore
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    next_start: float = 0.0
+    blocked_until: float = 0.0
+
+
+class HostScheduler:
+    """
+    Host-keyed concurrency and pacing limits, safe to share between threads.
+
+    Attributes:
+        max_in_flight: Maximum concurrent requests per host.
+        min_interval: Minimum seconds between request starts to one host.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight!r}")
+        if min_interval < 0:
+            raise ValueError(f"min_interval must not be negative, got {min_interval!r}")
+        self.max_in_flight = max_in_flight
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _state(self, url: str) -> _HostState:
+        host = self.host(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(threading.BoundedSemaphore(self.max_in_flight))
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """
+        Hold one of *url*'s host slots for the duration of the ``with``
+        block, waiting first for a free slot, the host's pacing interval and
+        any :meth:`defer` hold.
+        """
+        state = self._state(url)
+        with state.semaphore:
+            while True:
+                with state.lock:
+                    now = self._clock()
+                    start = max(now, state.next_start, state.blocked_until)
+                    if start <= now:
+                        state.next_start = now + self.min_interval
+                        break
+                self._sleep(start - now)
+            yield
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Hold every request to *url*'s host for *seconds* (capped)."""
+        seconds = min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+        state = self._state(url)
+        with state.lock:
+            state.blocked_until = max(state.blocked_until, self._clock() + seconds)
+        logger.warning(f"Host '{self.host(url)}' asked us to back off for {seconds:.1f}s")
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Return the delay in seconds requested by a ``Retry-After`` header
+    (either delta-seconds or an HTTP date), or ``None`` if absent/invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+def scheduler_from_env() -> HostScheduler:
+    """
+    Build the scheduler configured by the environment: ``SCRAPE_HOST_CONCURRENCY``
+    (default 4) and ``SCRAPE_HOST_INTERVAL`` in seconds (default 0.1).
+    """
+    return HostScheduler(
+        max_in_flight=int(os.environ.get("SCRAPE_HOST_CONCURRENCY", DEFAULT_MAX_IN_FLIGHT)),
+        min_interval=float(os.environ.get("SCRAPE_HOST_INTERVAL", DEFAULT_MIN_INTERVAL)),
+    )
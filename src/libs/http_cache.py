@@ -0,0 +1,177 @@
+"""
+On-disk HTTP response cache with conditional-request revalidation.
+
+Each entry is one JSON file named by a hash of the URL and query params. The
+stored ``ETag`` / ``Last-Modified`` validators let :class:`ScraperClient`
+send ``If-None-Match`` / ``If-Modified-Since`` and serve a ``304 Not
+Modified`` from disk. The directory is bounded in size; the least recently
+used entries are evicted first.
+
+File timestamps carry the bookkeeping, so hits and revalidations never
+rewrite an entry: the access time records the last use (for LRU order) and
+the modification time the last (re)validation (for the TTL).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_CACHE_DIR = ".state/http-cache"
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body plus the validators needed to revalidate it."""
+
+    url: str
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float = field(default_factory=time.time)
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that ask the server to reply 304 if unchanged."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of HTTP responses stored under *directory*.
+
+    Attributes:
+        directory: Cache directory (created on first use).
+        max_bytes: Total size the directory is trimmed back to once a write
+            takes it over the limit.
+        ttl: If set, entries younger than this many seconds are served
+            without contacting the server at all; otherwise every hit is
+            revalidated with a conditional request.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Running size of the directory, so writes only scan it to evict.
+        self._total = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(url: str, params: dict | None = None) -> str:
+        """Stable cache key for *url* + *params* (param order is irrelevant)."""
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the entry for *key* (marking it recently used), or ``None``."""
+        path = self._path(key)
+        try:
+            entry = CachedResponse(**json.loads(path.read_text(encoding="utf-8")))
+            validated = path.stat().st_mtime
+            os.utime(path, (time.time(), validated))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError):
+            logger.warning(f"Discarding unreadable HTTP cache entry {path.name}")
+            self._remove(path)
+            return None
+        entry.stored_at = validated
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """True if the TTL override allows serving *entry* without revalidating."""
+        return self.ttl is not None and time.time() - entry.stored_at < self.ttl
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store *entry* atomically, evicting old entries if past ``max_bytes``."""
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(asdict(entry), fh)
+        size = os.path.getsize(tmp)
+        with self._lock:
+            self._total += size - _size(path)
+            os.replace(tmp, path)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, entry: CachedResponse) -> None:
+        """Record a successful revalidation (restarts the entry's TTL)."""
+        entry.stored_at = time.time()
+        try:
+            os.utime(self._path(key), (entry.stored_at, entry.stored_at))
+        except FileNotFoundError:  # evicted since it was read
+            self.put(key, entry)
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """``(last used, size, path)`` for every entry on disk."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+        return entries
+
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            self._total -= _size(path)
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under ``max_bytes`` (lock held)."""
+        entries = self._entries()
+        # Resynchronize with the disk (entries may have vanished under us).
+        self._total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._total -= size
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def cache_from_env() -> ResponseCache | None:
+    """
+    Build the response cache configured by the environment.
+
+    ``HTTP_CACHE_DIR`` sets the directory (default ``.state/http-cache``; an
+    empty value disables caching) and ``HTTP_CACHE_TTL`` optionally sets the
+    no-revalidation window in seconds.
+    """
+    directory = os.environ.get("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+    if not directory:
+        return None
+    ttl = os.environ.get("HTTP_CACHE_TTL")
+    return ResponseCache(directory, ttl=float(ttl) if ttl else None)
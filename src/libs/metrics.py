@@ -0,0 +1,198 @@
+"""
+Per-run counters and timers, reported as JSON and Prometheus text.
+
+One :class:`Metrics` instance is shared by every client of a run (it is
+thread-safe). Series are identified by a name plus keyword labels, e.g.
+``metrics.inc("gcal_calls_total", method="events.insert", status="ok")``;
+timers keep a count, total and maximum per series. At the end of the run
+:meth:`Metrics.write_report` writes both formats — the Prometheus file can
+be fed to a node-exporter textfile collector or a Pushgateway as-is.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+# Prefix for every series in the Prometheus output.
+PROMETHEUS_NAMESPACE = "calendar_webscraper"
+
+# Default directory for run reports (METRICS_DIR; empty disables them).
+DEFAULT_REPORT_DIR = "metrics"
+REPORT_JSON = "run-metrics.json"
+REPORT_PROMETHEUS = "run-metrics.prom"
+
+_SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class Timing:
+    """Aggregate of the durations observed for one timer series."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+def _key(name: str, labels: dict[str, object]) -> _SeriesKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and timers for one run.
+
+    Attributes:
+        started: When the registry was created (the run's start time).
+    """
+
+    def __init__(self) -> None:
+        self.started = datetime.now(tz=timezone.utc)
+        self._lock = threading.Lock()
+        self._counters: dict[_SeriesKey, float] = {}
+        self._gauges: dict[_SeriesKey, float] = {}
+        self._timers: dict[_SeriesKey, Timing] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: object) -> None:
+        """Add *amount* to the counter *name* for *labels*."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: object) -> None:
+        """Set the gauge *name* for *labels* to *value*."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        """Record one duration of *seconds* on the timer *name* for *labels*."""
+        key = _key(name, labels)
+        with self._lock:
+            timing = self._timers.setdefault(key, Timing())
+            timing.count += 1
+            timing.total += seconds
+            timing.max = max(timing.max, seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        """Time the ``with`` block on the timer *name* (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name: str, **labels: object) -> float:
+        """Current value of a counter series (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def timing(self, name: str, **labels: object) -> Timing:
+        """Copy of a timer series (all zero if never observed)."""
+        with self._lock:
+            timing = self._timers.get(_key(name, labels), Timing())
+            return Timing(timing.count, timing.total, timing.max)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all its label values."""
+        with self._lock:
+            return sum(value for (series, _), value in self._counters.items() if series == name)
+
+    # ── reports ─────────────────────────────────────────────────────────
+
+    def to_dict(self) -> dict:
+        """Every series as JSON-serializable data, sorted by name and labels."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted(
+                (key, Timing(t.count, t.total, t.max)) for key, t in self._timers.items()
+            )
+        return {
+            "started": self.started.isoformat(),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in counters
+            ],
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in gauges
+            ],
+            "timers": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": timing.count,
+                    "seconds": timing.total,
+                    "max_seconds": timing.max,
+                }
+                for (name, labels), timing in timers
+            ],
+        }
+
+    def to_prometheus(self, namespace: str = PROMETHEUS_NAMESPACE) -> str:
+        """
+        Render every series in the Prometheus text exposition format.
+
+        Counters and gauges map directly; each timer becomes a ``summary``
+        (``_count`` / ``_sum``) plus a ``<name>_max_seconds`` gauge.
+        """
+        data = self.to_dict()
+        lines: list[str] = []
+
+        def _family(kind: str, items: list[dict], render) -> None:
+            seen: set[str] = set()
+            for item in items:
+                name = f"{namespace}_{item['name']}"
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} {kind}")
+                render(name, item)
+
+        _family("counter", data["counters"],
+                lambda name, item: lines.append(_sample(name, item["labels"], item["value"])))
+        _family("gauge", data["gauges"],
+                lambda name, item: lines.append(_sample(name, item["labels"], item["value"])))
+
+        def _summary(name: str, item: dict) -> None:
+            lines.append(_sample(f"{name}_count", item["labels"], item["count"]))
+            lines.append(_sample(f"{name}_sum", item["labels"], item["seconds"]))
+
+        _family("summary", data["timers"], _summary)
+        maxima = [
+            {**item, "name": _strip_suffix(item["name"], "_seconds") + "_max_seconds"}
+            for item in data["timers"]
+        ]
+        _family("gauge", maxima,
+                lambda name, item: lines.append(_sample(name, item["labels"], item["max_seconds"])))
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, directory: str | Path) -> tuple[Path, Path]:
+        """Write the JSON and Prometheus reports into *directory*; return their paths."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / REPORT_JSON
+        prometheus_path = directory / REPORT_PROMETHEUS
+        json_path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        prometheus_path.write_text(self.to_prometheus(), encoding="utf-8")
+        return json_path, prometheus_path
+
+
+def _strip_suffix(name: str, suffix: str) -> str:
+    return name[: -len(suffix)] if name.endswith(suffix) else name
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    rendered = ",".join(f'{label}="{_escape(text)}"' for label, text in labels.items())
+    number = repr(float(value))
+    return f"{name}{{{rendered}}} {number}" if rendered else f"{name} {number}"
@@ -0,0 +1,108 @@
+"""
+Thread-safe token-bucket rate limiter shared by API clients.
+
+Tokens refill continuously at ``rate`` per second up to ``burst``. A caller
+may take more tokens than are available (e.g. a 50-request batch against a
+burst of 10): the bucket goes into debt and later callers wait it off, so
+the long-run request rate never exceeds ``rate``. :meth:`TokenBucket.pause`
+lets a caller that hit a server-side rate limit hold back every other user
+of the bucket too.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable
+
+from loguru import logger
+
+# Calendar API's default per-user quota is 600 requests/minute.
+DEFAULT_QPS = 10.0
+DEFAULT_BURST = 10
+
+# Tolerance for float drift in the token count, so a caller is never left
+# sleeping for a vanishingly small remainder.
+_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """
+    Token bucket limiting callers to *rate* acquisitions per second.
+
+    Attributes:
+        rate: Tokens added per second.
+        burst: Bucket capacity — how many tokens can be taken back-to-back
+            after an idle period.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst!r}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Take *tokens*, blocking until the bucket allows it.
+
+        Requests larger than ``burst`` wait for a full bucket and then leave
+        it in debt rather than waiting forever.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                needed = min(tokens, self.burst)
+                if now >= self._paused_until and self._tokens >= needed - _EPSILON:
+                    self._tokens -= tokens
+                    return waited
+                delay = max(
+                    self._paused_until - now,
+                    (needed - self._tokens) / self.rate,
+                )
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least *seconds* (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def limiter_from_env() -> TokenBucket | None:
+    """
+    Build the Calendar API limiter configured by the environment.
+
+    ``GCAL_QPS`` sets the sustained rate (default 10/s; ``0`` disables
+    limiting) and ``GCAL_BURST`` the bucket size (default 10).
+    """
+    qps = float(os.environ.get("GCAL_QPS", DEFAULT_QPS))
+    if qps <= 0:
+        return None
+    burst = int(os.environ.get("GCAL_BURST", DEFAULT_BURST))
+    logger.debug(f"Calendar API rate limit: {qps}/s (burst {burst})")
+    return TokenBucket(qps, burst)
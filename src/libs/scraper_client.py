@@ -5,28 +5,62 @@ to HTMLHelper.
 
 from __future__ import annotations
 
+import codecs
+import time
+from typing import Iterator, Mapping
+from urllib.parse import urlsplit
+
 import requests
 from loguru import logger
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception,
     stop_after_attempt,
     wait_exponential,
     before_sleep_log,
 )
+import json
 import logging
 
 from helpers.html_parser import HTMLHelper
+from libs.host_scheduler import HostScheduler, parse_retry_after
+from libs.http_cache import CachedResponse, ResponseCache
+from libs.metrics import Metrics
 
-# Retry on connection/timeout errors or 5xx server errors.
-# 4xx errors (bad URL, auth failure) are not transient — don't retry them.
-_RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+# Retry on connection/timeout errors, 5xx server errors, and 429 Too Many
+# Requests (after any Retry-After hold, see HostScheduler.defer). Other 4xx
+# errors (bad URL, auth failure) are not transient — don't retry them.
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 _MAX_ATTEMPTS = 3
 _WAIT_MIN_SECONDS = 2
 _WAIT_MAX_SECONDS = 10
 
+# Characters per chunk yielded by ScraperClient.iter_html.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Connection pooling: one pool per host for up to this many hosts, each
+# keeping this many idle keep-alive connections for reuse. The pool size
+# should cover the most requests ever in flight to one host (the WP page
+# fetchers default to 8).
+_POOL_CONNECTIONS = 10
+_POOL_MAXSIZE = 16
+
+
+_log_retry = before_sleep_log(logging.getLogger(__name__), logging.WARNING)
+
+
+def _before_retry(retry_state: RetryCallState) -> None:
+    """Log a retry of a :class:`ScraperClient` method and count it."""
+    _log_retry(retry_state)
+    # Every decorated method is called as (self, address, ...).
+    client, address = retry_state.args[:2]
+    client._count_retry(address)
+
 
 def _is_retryable(exc: BaseException) -> bool:
     """Return True for transient errors worth retrying."""
@@ -47,13 +81,44 @@ class ScraperClient:
     Attributes:
         name: Identifier for this client instance (used in log messages).
         default_timeout: Request timeout in seconds.
+        cache: Optional on-disk response cache; cached URLs are revalidated
+            with conditional requests (see :mod:`libs.http_cache`).
+        scheduler: Per-host concurrency/pacing limits every request goes
+            through (see :mod:`libs.host_scheduler`); share one between
+            clients to enforce the limits across all of them.
+        pool_connections: Number of per-host connection pools kept.
+        pool_maxsize: Keep-alive connections kept per host; concurrent
+            requests beyond this open throwaway connections.
+        metrics: Optional run metrics; every request (by host and status),
+            retry and cache lookup is counted and timed there.
     """
 
-    def __init__(self, name: str, default_timeout: int = 30) -> None:
+    def __init__(
+        self,
+        name: str,
+        default_timeout: int = 30,
+        cache: ResponseCache | None = None,
+        scheduler: HostScheduler | None = None,
+        pool_connections: int = _POOL_CONNECTIONS,
+        pool_maxsize: int = _POOL_MAXSIZE,
+        metrics: Metrics | None = None,
+    ) -> None:
         self.name = name
         self.default_timeout = default_timeout
+        self.cache = cache
+        self.metrics = metrics
+        self.scheduler = scheduler or HostScheduler()
         self._session = requests.Session()
+        # Retries stay with tenacity (see _is_retryable); the adapter only
+        # sizes the keep-alive pools so concurrent fetches reuse TLS sessions.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._session.headers["User-Agent"] = f"calendar-webscraper/1.0 ({name})"
+        # "gzip,deflate", plus "br" when a brotli package is installed.
+        self._session.headers["Accept-Encoding"] = ACCEPT_ENCODING
         logger.debug(f"Created scraper client '{name}' (timeout={default_timeout}s)")
 
     def get_html(self, address: str) -> str:
@@ -64,9 +129,11 @@ class ScraperClient:
         Retries are triggered by:
         - :class:`requests.Timeout`
         - :class:`requests.ConnectionError`
-        - :class:`requests.HTTPError` with a 5xx status code
+        - :class:`requests.HTTPError` with a 429 or 5xx status code
 
-        4xx responses (e.g. 404, 403) are **not** retried and raise
+        A 429 or 503 carrying ``Retry-After`` also puts the host on hold
+        (:meth:`HostScheduler.defer`), so the retry waits at least that long.
+        Other 4xx responses (e.g. 404, 403) are **not** retried and raise
         immediately.
 
         Args:
@@ -76,8 +143,8 @@ class ScraperClient:
             Response body as a string.
 
         Raises:
-            requests.HTTPError: On a non-retryable HTTP error (4xx), or if all
-                retry attempts for a 5xx error are exhausted.
+            requests.HTTPError: On a non-retryable HTTP error (4xx other than
+                429), or if all retry attempts for a 429/5xx error are exhausted.
             requests.Timeout: If all retry attempts time out.
             requests.ConnectionError: If all retry attempts fail to connect.
         """
@@ -87,15 +154,13 @@ class ScraperClient:
         retry=retry_if_exception(_is_retryable),
         stop=stop_after_attempt(_MAX_ATTEMPTS),
         wait=wait_exponential(multiplier=1, min=_WAIT_MIN_SECONDS, max=_WAIT_MAX_SECONDS),
-        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+        before_sleep=_before_retry,
         reraise=True,
     )
     def _get_with_retry(self, address: str) -> str:
         """Internal method that tenacity decorates for retry logic."""
         logger.debug(f"Fetching HTML from '{address}'")
-        response = self._session.get(address, timeout=self.default_timeout)
-        response.raise_for_status()
-        return response.text
+        return self._fetch_text(address, None)[0]
 
     def get_json(self, address: str, params: dict | None = None) -> list | dict:
         """
@@ -109,21 +174,216 @@ class ScraperClient:
         Returns:
             The parsed JSON body (list or dict).
         """
+        return self._get_json_with_retry(address, params)[0]
+
+    def get_json_page(
+        self, address: str, params: dict | None = None
+    ) -> tuple[list | dict, Mapping[str, str]]:
+        """
+        Like :meth:`get_json`, but also return the (case-insensitive)
+        response headers — used to read WordPress pagination totals
+        (``X-WP-TotalPages``).
+        """
         return self._get_json_with_retry(address, params)
 
     @retry(
         retry=retry_if_exception(_is_retryable),
         stop=stop_after_attempt(_MAX_ATTEMPTS),
         wait=wait_exponential(multiplier=1, min=_WAIT_MIN_SECONDS, max=_WAIT_MAX_SECONDS),
-        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+        before_sleep=_before_retry,
         reraise=True,
     )
-    def _get_json_with_retry(self, address: str, params: dict | None) -> list | dict:
+    def _get_json_with_retry(
+        self, address: str, params: dict | None
+    ) -> tuple[list | dict, Mapping[str, str]]:
         """Internal method that tenacity decorates for retry logic."""
         logger.debug(f"Fetching JSON from '{address}' (params={params})")
-        response = self._session.get(address, params=params, timeout=self.default_timeout)
+        text, headers = self._fetch_text(address, params)
+        return json.loads(text), headers
+
+    def _fetch_text(self, address: str, params: dict | None) -> tuple[str, Mapping[str, str]]:
+        """
+        GET *address* and return ``(body text, response headers)``, going
+        through :attr:`cache` when one is configured.
+
+        A cached entry within the cache TTL is returned without a request;
+        otherwise its validators are sent and a ``304`` is served from disk.
+        """
+        if self.cache is None:
+            response = self._get(address, params=params)
+            response.raise_for_status()
+            return response.text, response.headers
+
+        key = self.cache.key(address, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.debug(f"HTTP cache hit (fresh) for '{address}'")
+            self._count_cache("fresh")
+            return entry.body, CaseInsensitiveDict(entry.headers)
+
+        response = self._get(
+            address,
+            params=params,
+            headers=entry.conditional_headers() if entry else None,
+        )
+        if entry is not None and response.status_code == 304:
+            logger.debug(f"HTTP cache hit (304 Not Modified) for '{address}'")
+            self._count_cache("revalidated")
+            self.cache.touch(key, entry)
+            return entry.body, CaseInsensitiveDict(entry.headers)
+        self._count_cache("miss")
         response.raise_for_status()
-        return response.json()
+
+        if self._is_cacheable(response):
+            self._store(key, response, response.text)
+        return response.text, response.headers
+
+    def _get(self, address: str, **kwargs) -> requests.Response:
+        """
+        Send one GET through the host scheduler. A ``429`` / ``503`` carrying
+        ``Retry-After`` puts the whole host on hold for the requested time,
+        so the retry (and every other request to that host) waits it out.
+        """
+        with self.scheduler.slot(address):
+            started = time.perf_counter()
+            try:
+                response = self._session.get(address, timeout=self.default_timeout, **kwargs)
+            except requests.RequestException as exc:
+                self._count_request(address, type(exc).__name__, started)
+                raise
+            self._count_request(address, response.status_code, started)
+        if response.status_code in (429, 503):
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is not None:
+                self.scheduler.defer(address, delay)
+        return response
+
+    def _count_request(self, address: str, status: int | str, started: float) -> None:
+        if self.metrics is not None:
+            host = urlsplit(address).netloc
+            self.metrics.inc("scraper_requests_total", host=host, status=status)
+            self.metrics.observe(
+                "scraper_request_seconds", time.perf_counter() - started, host=host
+            )
+
+    def _count_retry(self, address: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("scraper_retries_total", host=urlsplit(address).netloc)
+
+    def _count_cache(self, result: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("scraper_cache_total", result=result)
+
+    def _is_cacheable(self, response: requests.Response) -> bool:
+        """True if *response* carries validators (or a TTL makes it reusable)."""
+        return bool(
+            response.headers.get("ETag")
+            or response.headers.get("Last-Modified")
+            or self.cache.ttl is not None
+        )
+
+    def _store(self, key: str, response: requests.Response, body: str) -> None:
+        self.cache.put(
+            key,
+            CachedResponse(
+                url=response.url,
+                body=body,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                headers=dict(response.headers),
+            ),
+        )
+
+    def iter_html(self, address: str, chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Stream the HTML at *address* as decoded text chunks.
+
+        Opening the response (up to and including the status line) is
+        retried exactly like :meth:`get_html`; once the body has started
+        arriving, errors propagate to the caller. A cached page within the
+        cache TTL, or revalidated with a ``304``, is yielded from disk. When
+        the response is cacheable the chunks are also kept so the complete
+        body can be stored once the stream ends.
+
+        Args:
+            address: URL to fetch.
+            chunk_size: Approximate size of each yielded chunk.
+
+        Yields:
+            Consecutive pieces of the response body.
+        """
+        response, entry = self._open_stream(address)
+        if response is None:
+            for start in range(0, len(entry.body), chunk_size):
+                yield entry.body[start:start + chunk_size]
+            return
+
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+            errors="replace"
+        )
+        parts: list[str] | None = (
+            [] if self.cache is not None and self._is_cacheable(response) else None
+        )
+        with response:
+            for raw in response.iter_content(chunk_size):
+                text = decoder.decode(raw)
+                if text:
+                    if parts is not None:
+                        parts.append(text)
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                if parts is not None:
+                    parts.append(tail)
+                yield tail
+        if parts is not None:
+            self._store(self.cache.key(address, None), response, "".join(parts))
+
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(_MAX_ATTEMPTS),
+        wait=wait_exponential(multiplier=1, min=_WAIT_MIN_SECONDS, max=_WAIT_MAX_SECONDS),
+        before_sleep=_before_retry,
+        reraise=True,
+    )
+    def _open_stream(
+        self, address: str
+    ) -> tuple[requests.Response | None, CachedResponse | None]:
+        """
+        Start a streamed GET of *address*.
+
+        Returns ``(response, None)`` for a body to be read from the network,
+        or ``(None, entry)`` when the cached entry can be served instead.
+        """
+        logger.debug(f"Streaming HTML from '{address}'")
+        entry = None
+        if self.cache is not None:
+            key = self.cache.key(address, None)
+            entry = self.cache.get(key)
+            if entry is not None and self.cache.is_fresh(entry):
+                logger.debug(f"HTTP cache hit (fresh) for '{address}'")
+                self._count_cache("fresh")
+                return None, entry
+
+        response = self._get(
+            address,
+            headers=entry.conditional_headers() if entry else None,
+            stream=True,
+        )
+        if entry is not None and response.status_code == 304:
+            response.close()
+            logger.debug(f"HTTP cache hit (304 Not Modified) for '{address}'")
+            self._count_cache("revalidated")
+            self.cache.touch(key, entry)
+            return None, entry
+        if self.cache is not None:
+            self._count_cache("miss")
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response, None
 
     def scrape_events(self, html_content: str, parse_type: str) -> list[dict]:
         """
@@ -0,0 +1,78 @@
+"""
+Small SQLite-backed key/value store for state persisted between runs.
+
+Values are JSON-encoded and grouped by namespace (e.g. one namespace for
+Calendar sync tokens). The store is safe to share between worker threads;
+every write is committed immediately, so a crashed run keeps whatever state
+it had already recorded.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+class StateStore:
+    """
+    Persistent ``(namespace, key) -> JSON value`` store.
+
+    Attributes:
+        path: Location of the SQLite database file (``":memory:"`` for tests).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+        logger.debug(f"Opened state store at '{self.path}'")
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """Return the stored value for *key*, or ``None`` if absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store *value* (must be JSON-serializable) under *key*."""
+        encoded = json.dumps(value, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, encoded, time.time()),
+            )
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove *key* if present."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -4,43 +4,91 @@ Main entry point for the calendar-webscraper pipeline.
 Reads all active ``calendar-configs/config-*.yaml`` files, fetches the
 corresponding basketball schedule pages (WordPress API with HTML fallback),
 and syncs the results into Google Calendar (creating new events, patching
-reschedules, and updating stale fields).
+reschedules, and updating stale fields). Scraping and syncing run as a
+pipeline: scrape workers feed a bounded queue that sync workers drain.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable
 from zoneinfo import ZoneInfo
 
 from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
 from loguru import logger
 
 from helpers.ascii_strings import IMPORTANT_STUFF_1, IMPORTANT_STUFF_2, IMPORTANT_STUFF_3
 from helpers.config_loader import CalendarConfig, load_configs
 from helpers.site_builder import build_site
-from helpers.event_sync import (
-    build_field_patch,
-    build_reschedule_patch,
-    filter_events_by_schedule,
-    match_game_to_event,
-    parse_existing_events,
-)
+from helpers.event_sync import filter_events_by_schedule, parse_existing_events, sync_fingerprint
 from helpers.models import Game
-from helpers.sources import fetch_games
-from libs.google_cal_client import GoogleCalClient
+from helpers.sources import MatchIndex, fetch_games
+from helpers.sync_plan import PlannedOperation, SyncPlan, plan_operations
+from libs.google_cal_client import (
+    DEFAULT_ACL_RECHECK_INTERVAL,
+    SYNC_EVENT_FIELDS,
+    CalendarDirectory,
+    EventBatch,
+    GoogleCalClient,
+)
+from libs.google_transport import DEFAULT_POOL_MAXSIZE
+from libs.host_scheduler import scheduler_from_env
+from libs.http_cache import cache_from_env
+from libs.metrics import DEFAULT_REPORT_DIR, Metrics
+from libs.rate_limiter import limiter_from_env
 from libs.scraper_client import ScraperClient
+from libs.state_store import StateStore
 
 CONFIG_DIR = "./calendar-configs"
 
+# Serial by default; raise via SYNC_WORKERS / --workers once the Calendar
+# quota has headroom for concurrent syncs.
+DEFAULT_SYNC_WORKERS = 1
+
+# Scrapers feeding the sync workers (SCRAPE_WORKERS / --scrape-workers).
+# One is enough to keep the next schedule ready while a calendar syncs.
+DEFAULT_SCRAPE_WORKERS = 1
+
+# Scraped schedules allowed to wait for a sync worker before the scrapers
+# block (PIPELINE_QUEUE_SIZE / --queue-size).
+DEFAULT_QUEUE_SIZE = 2
+
+# Full (non-incremental) listings only fetch events ending after the
+# earliest scraped game minus this margin, so a keyed event that was moved
+# earlier than the season's first game is still found.
+LIST_WINDOW_MARGIN = timedelta(days=28)
+
+# Persistent run-to-run state (Calendar sync tokens); set STATE_DB to an
+# empty string to disable it and always do full listings.
+DEFAULT_STATE_DB = ".state/sync-state.sqlite3"
+
+# Where --dry-run writes the planned operations of every config.
+DEFAULT_PLAN_FILE = "sync-plan.json"
+
+# StateStore namespace: per-config record of the last successful sync
+# (schedule fingerprint + calendar ID), used to skip unchanged calendars.
+SYNC_RECORDS = "sync_records"
+
 
 def configure_logging(log_level: str) -> None:
     """Set up loguru sinks (file + stderr) with a custom MAJOR level."""
     logger.remove()
     logger.add("logs/cal_run_{time}.log")
-    logger.level("MAJOR", no=21, color="<yellow>")
+    try:
+        logger.level("MAJOR")
+    except ValueError:  # first call in this process
+        logger.level("MAJOR", no=21, color="<yellow>")
     logger.add(
         sink=sys.stderr,
         format=(
@@ -55,7 +103,12 @@ def configure_logging(log_level: str) -> None:
     logger.info(f"Log level: {log_level}")
 
 
-def get_or_create_calendar(gclient: GoogleCalClient, name: str, source_url: str) -> str:
+def get_or_create_calendar(
+    gclient: GoogleCalClient,
+    name: str,
+    source_url: str,
+    directory: CalendarDirectory | None = None,
+) -> str:
     """
     Return the calendar ID for *name*, creating it if it doesn't exist.
 
@@ -63,22 +116,19 @@ def get_or_create_calendar(gclient: GoogleCalClient, name: str, source_url: str)
         gclient: Authenticated Google Calendar client.
         name: Display name of the calendar.
         source_url: Schedule URL used in the calendar description.
+        directory: Run-wide calendar index; without one the calendar list
+            is fetched for this lookup alone.
 
     Returns:
         Google Calendar ID string.
     """
-    calendar_list = gclient.get_calendar_list()
-
-    for calendar in calendar_list.get("items", []):
-        if calendar["summary"] == name:
-            calendar_id = calendar["id"]
-            logger.info(f"Calendar [{name}] already exists with id [{calendar_id}]")
-            return calendar_id
-
+    directory = directory or CalendarDirectory()
     description = f'This calendar has been extracted from "{source_url}"'
-    logger.info(f"Calendar [{name}] does not yet exist - Creating:")
-    calendar_id = gclient.insert_calendar(calendar_name=name, description=description)
-    logger.info(f" -> Calendar [{name}] created with id [{calendar_id}]")
+    calendar_id, created = directory.get_or_create(gclient, name, description)
+    if created:
+        logger.info(f"Calendar [{name}] did not exist - created with id [{calendar_id}]")
+    else:
+        logger.info(f"Calendar [{name}] already exists with id [{calendar_id}]")
     return calendar_id
 
 
@@ -86,6 +136,8 @@ def sync_calendar(
     gclient: GoogleCalClient,
     scraper: ScraperClient,
     config: CalendarConfig,
+    match_index: MatchIndex | None = None,
+    directory: CalendarDirectory | None = None,
 ) -> str:
     """
     Fetch the schedule for *config* and sync it into Google Calendar.
@@ -98,120 +150,624 @@ def sync_calendar(
     * **reschedule** — event exists but the time changed; fully re-patched.
     * **create** — no matching event; a new one is inserted.
 
+    All writes are planned first (:func:`plan_sync`) and then applied by
+    :func:`execute_plan` through the Calendar batch endpoint (one
+    round-trip per 50 writes).
     The calendar is made publicly readable automatically (ACL default-reader rule).
+
+    With a state store, a config whose scraped schedule is identical to the
+    last successful sync, and whose calendar has not been edited since, is
+    skipped after a single incremental ``events.list`` (see
+    :func:`_unchanged_calendar`).
     """
-    games = fetch_games(scraper, config)
+    games = fetch_games(scraper, config, match_index=match_index)
+    return sync_games(gclient, config, games, directory)
+
+
+def sync_games(
+    gclient: GoogleCalClient,
+    config: CalendarConfig,
+    games: list[Game],
+    directory: CalendarDirectory | None = None,
+    metrics: Metrics | None = None,
+) -> str:
+    """
+    Sync already-scraped *games* for *config* into Google Calendar.
+
+    This is the Calendar half of :func:`sync_calendar`, split out so the
+    pipelined runner can scrape and sync on separate threads. With
+    *metrics*, each phase (``check``, ``calendar``, ``plan``, ``execute``)
+    is timed per config and the outcome and planned writes are counted.
+
+    Returns:
+        Google Calendar ID string.
+    """
+    fingerprint = sync_fingerprint(games, config.url, config.color_id)
+
+    with _phase(metrics, config, "check"):
+        unchanged_id = _unchanged_calendar(gclient, config, fingerprint)
+        if unchanged_id is not None:
+            # Free while the calendar's public record is fresh; keeps
+            # --recheck-acl and ACL_RECHECK_DAYS honest for skipped calendars.
+            gclient.ensure_calendar_public(unchanged_id)
+    if unchanged_id is not None:
+        logger.success(f"'{config.name}' is unchanged since the last sync — skipped")
+        if metrics is not None:
+            metrics.inc("sync_configs_total", outcome="skipped")
+        return unchanged_id
+    if gclient.state is not None:
+        # The incremental listing in plan_sync moves the stored sync token
+        # past any external edits, so the last record must not survive a
+        # sync that then fails: a later run with the recorded schedule would
+        # see no changes and skip the calendar with the edits intact.
+        gclient.state.delete(SYNC_RECORDS, config.name)
 
     logger.log("MAJOR", IMPORTANT_STUFF_1)
-    calendar_id = get_or_create_calendar(gclient, config.name, config.url)
-    gclient.ensure_calendar_public(calendar_id)
+    with _phase(metrics, config, "calendar"):
+        calendar_id = get_or_create_calendar(gclient, config.name, config.url, directory)
+        gclient.ensure_calendar_public(calendar_id)
 
     logger.log("MAJOR", IMPORTANT_STUFF_2)
-    all_events = gclient.list_events(calendar_id=calendar_id)
-    schedule_events = filter_events_by_schedule(all_events, config.url)
-    existing = parse_existing_events(schedule_events)
-
-    for game in games:
-        action, matched = match_game_to_event(game, existing)
-        if matched is not None:
-            existing.remove(matched)  # an event can only be matched once per run
-
-        if action == "exact":
-            logger.info(f"[{game.title}] already exists — checking for stale fields...")
-            event_details = gclient.get_event_details(
-                calendar_id=calendar_id, event_id=matched.id
-            )
-            patch = build_field_patch(event_details, game, config.color_id)
-            if patch:
-                gclient.patch_event(
-                    calendar_id=calendar_id, event_id=matched.id, patched_fields=patch
-                )
-                logger.info(f"\tPatched {sorted(patch)} for [{game.title}]")
+    with _phase(metrics, config, "plan"):
+        plan = plan_sync(gclient, config, games, calendar_id)
+    with _phase(metrics, config, "execute"):
+        written = execute_plan(gclient, plan)
+    _record_sync(gclient, config, calendar_id, fingerprint, written)
+    if metrics is not None:
+        metrics.inc("sync_configs_total", outcome="synced")
+        for action, count in plan.counts().items():
+            metrics.inc("sync_operations_total", count, action=action)
 
-        elif action == "reschedule":
-            logger.info(f"[{game.title}] has been rescheduled — patching...")
-            patch = build_reschedule_patch(game, config.color_id)
-            gclient.patch_event(
-                calendar_id=calendar_id, event_id=matched.id, patched_fields=patch
-            )
-            logger.info(
-                f"\tEvent [{game.title}] updated to [{game.start.isoformat()}] "
-                f"- id [{matched.id}]"
+    logger.success(f"Finished syncing '{config.name}'")
+    return calendar_id
+
+
+def _phase(
+    metrics: Metrics | None, config: CalendarConfig, phase: str
+) -> AbstractContextManager:
+    """Time one phase of *config*'s run on ``config_phase_seconds`` (no-op without metrics)."""
+    if metrics is None:
+        return nullcontext()
+    return metrics.timer("config_phase_seconds", config=config.name, phase=phase)
+
+
+def plan_sync(
+    gclient: GoogleCalClient,
+    config: CalendarConfig,
+    games: list[Game],
+    calendar_id: str | None,
+    incremental: bool = True,
+) -> SyncPlan:
+    """
+    List *calendar_id*'s events and plan the writes that bring them in line
+    with *games* — without writing anything.
+
+    A ``None`` *calendar_id* (a calendar that does not exist yet) plans a
+    create for every game. With *incremental* (and a state store) the
+    listing goes through the stored sync token, which advances it.
+    """
+    plan = SyncPlan(config.name, config.url, calendar_id)
+    if calendar_id is None:
+        existing: list[dict] = []
+    elif incremental and gclient.state is not None:
+        # Sync tokens are only issued for unfiltered listings.
+        existing = gclient.list_events(
+            calendar_id=calendar_id, incremental=True, fields=SYNC_EVENT_FIELDS
+        )
+    else:
+        existing = gclient.list_events(
+            calendar_id=calendar_id,
+            private_properties={"schedule": config.url},
+            time_min=min(game.start for game in games) - LIST_WINDOW_MARGIN,
+            fields=SYNC_EVENT_FIELDS,
+        )
+    schedule_events = filter_events_by_schedule(existing, config.url)
+    plan.operations = plan_operations(
+        games, parse_existing_events(schedule_events), config.url, config.color_id
+    )
+    for operation in plan.operations:
+        logger.info(f"[{operation.title}] planned: {operation.describe()}")
+    logger.info(
+        f"Plan for '{config.name}': {plan.counts()} "
+        f"({plan.batch_requests} batch request(s))"
+    )
+    return plan
+
+
+def dry_run_games(
+    gclient: GoogleCalClient,
+    config: CalendarConfig,
+    games: list[Game],
+    directory: CalendarDirectory | None = None,
+) -> SyncPlan:
+    """
+    Plan *config*'s sync without creating calendars, changing ACLs or
+    writing events. A missing calendar plans a create for every game.
+
+    The listing is a full one so stored sync tokens are left untouched — a
+    dry run must not hide external edits from the next real sync.
+    """
+    directory = directory or CalendarDirectory()
+    calendar_id = directory.lookup(gclient, config.name)
+    if calendar_id is None:
+        logger.info(f"Calendar [{config.name}] does not exist yet — would be created")
+    return plan_sync(gclient, config, games, calendar_id, incremental=False)
+
+
+def execute_plan(gclient: GoogleCalClient, plan: SyncPlan) -> set[str]:
+    """
+    Apply every operation in *plan* through one :class:`EventBatch`.
+
+    Returns:
+        IDs of the events created or patched.
+
+    Raises:
+        ValueError: If *plan* has no target calendar.
+        RuntimeError: If any write still failed after batch retries.
+    """
+    if plan.calendar_id is None:
+        raise ValueError(f"Plan for '{plan.config_name}' has no calendar to write to")
+    batch = gclient.batch()
+    queued: dict[str, PlannedOperation] = {}
+    for request_id, operation in enumerate(plan.operations):
+        request_id = str(request_id)
+        if operation.action == "create":
+            batch.create_event(request_id, calendar_id=plan.calendar_id, **operation.fields)
+        else:
+            batch.patch_event(
+                request_id, event_id=operation.event_id,
+                patched_fields=operation.fields, calendar_id=plan.calendar_id,
             )
+        queued[request_id] = operation
+    return _flush_writes(batch, queued)
 
-        else:  # "create"
-            _create_event(gclient, calendar_id, game, config)
 
-    logger.success(f"Finished syncing '{config.name}'")
-    return calendar_id
+def write_plans(path: Path, plans: list[SyncPlan]) -> None:
+    """Save *plans* as JSON to *path* and log the run-wide totals."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps([plan.to_dict() for plan in plans], indent=2), encoding="utf-8"
+    )
+    operations = sum(len(plan.operations) for plan in plans)
+    batch_requests = sum(plan.batch_requests for plan in plans)
+    logger.success(
+        f"Dry run: {operations} planned write(s) in {batch_requests} batch request(s) "
+        f"across {len(plans)} calendar(s) — saved to {path}"
+    )
 
 
-def _create_event(
+def _unchanged_calendar(
+    gclient: GoogleCalClient, config: CalendarConfig, fingerprint: str
+) -> str | None:
+    """
+    Return the recorded calendar ID if *config* needs no sync this run.
+
+    That is the case when the last successful sync recorded the same
+    schedule *fingerprint* and an incremental listing against the stored
+    sync token reports no changes since — i.e. nobody has edited, added or
+    deleted an event in the meantime. Returns ``None`` otherwise (including
+    when no state store is configured).
+    """
+    if gclient.state is None:
+        return None
+    record = gclient.state.get(SYNC_RECORDS, config.name)
+    if not record or record.get("fingerprint") != fingerprint:
+        return None
+
+    calendar_id = record["calendar_id"]
+    try:
+        _, changes = gclient.sync_events(calendar_id, fields=SYNC_EVENT_FIELDS)
+    except HttpError as exc:
+        if exc.resp.status != 404:
+            raise
+        logger.warning(f"Recorded calendar [{calendar_id}] for '{config.name}' is gone")
+        return None
+
+    if changes is None:
+        logger.info(f"No usable sync token for '{config.name}' — running a full sync")
+    elif changes:
+        logger.info(
+            f"{len(changes)} event(s) edited in [{config.name}] since the last sync "
+            "— running a full sync"
+        )
+    else:
+        return calendar_id
+    return None
+
+
+def _record_sync(
     gclient: GoogleCalClient,
-    calendar_id: str,
-    game: Game,
     config: CalendarConfig,
+    calendar_id: str,
+    fingerprint: str,
+    written: set[str],
 ) -> None:
-    """Insert a new Google Calendar event and log the result."""
-    logger.info(f"[{game.title}] is a new event — creating...")
-    event_id = gclient.create_event(
-        calendar_id=calendar_id,
-        event_name=game.title,
-        start_time=game.start.isoformat(),
-        end_time=game.end.isoformat(),
-        location=game.venue,
-        private_properties={"schedule": config.url, "gameKey": game.key},
-        color_id=config.color_id,
-        description=game.details_url,
-    )
-    logger.success(f"\tEvent [{event_id}] created for [{game.title}]")
-
-
-def main() -> None:
+    """
+    Record a successful sync so an identical next run can be skipped.
+
+    This run's own writes move the calendar past the sync token stored by
+    its listing, so after any writes the token is advanced once more; the
+    record is only kept if every change seen is one of the *written* event
+    IDs (no one else edited the calendar meanwhile).
+    """
+    if gclient.state is None:
+        return
+    if written:
+        _, changes = gclient.sync_events(calendar_id, fields=SYNC_EVENT_FIELDS)
+        if changes is None or any(event["id"] not in written for event in changes):
+            gclient.state.delete(SYNC_RECORDS, config.name)
+            return
+    gclient.state.set(
+        SYNC_RECORDS,
+        config.name,
+        {
+            "fingerprint": fingerprint,
+            "calendar_id": calendar_id,
+            "writes": len(written),
+            "synced_at": datetime.now(tz=timezone.utc).isoformat(),
+        },
+    )
+
+
+def _flush_writes(batch: EventBatch, queued: dict[str, PlannedOperation]) -> set[str]:
+    """
+    Send all queued event writes and log each outcome.
+
+    Returns:
+        IDs of the events created or patched.
+
+    Raises:
+        RuntimeError: If any write still failed after batch retries, so the
+            config is reported as failed (the successful writes are kept).
+    """
+    if not queued:
+        return set()
+    results = batch.flush()
+    failed: list[str] = []
+    written: set[str] = set()
+    for request_id, operation in queued.items():
+        result = results[request_id]
+        if result.ok:
+            event_id = (result.response or {}).get("id")
+            if event_id:
+                written.add(event_id)
+            logger.success(f"\t{operation.describe()} for [{operation.title}] - id [{event_id}]")
+        else:
+            logger.error(f"\t{operation.describe()} failed for [{operation.title}]: {result.error}")
+            failed.append(operation.title)
+    if failed:
+        raise RuntimeError(f"{len(failed)}/{len(queued)} event write(s) failed: {failed}")
+    return written
+
+
+@dataclass
+class StageTiming:
+    """Seconds one config spent in each stage of :func:`run_pipeline`."""
+
+    name: str
+    scrape: float = 0.0
+    blocked: float = 0.0  # scraper waiting for room in the full queue
+    queued: float = 0.0  # scraped schedule waiting for a sync worker
+    sync: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    """
+    Outcome of :func:`run_pipeline`.
+
+    Attributes:
+        synced: ``[(name, calendar_id), ...]`` for successful configs, in
+            config order.
+        failures: Names of the configs that failed to scrape or sync.
+        timings: Per-config stage timings, in config order.
+        elapsed: Wall-clock seconds for the whole run.
+    """
+
+    synced: list[tuple[str, str]] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+    timings: list[StageTiming] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+_DONE = object()
+
+
+def run_pipeline(
+    configs: list[CalendarConfig],
+    fetch_one: Callable[[CalendarConfig], list[Game]],
+    sync_one: Callable[[CalendarConfig, list[Game]], str],
+    sync_workers: int = DEFAULT_SYNC_WORKERS,
+    scrape_workers: int = DEFAULT_SCRAPE_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> PipelineResult:
+    """
+    Scrape and sync every config as a two-stage pipeline.
+
+    *scrape_workers* threads run *fetch_one* over the configs in order and
+    put each ``(config, games)`` onto a queue bounded at *queue_size*;
+    *sync_workers* threads take them off and run *sync_one*. Scraping the
+    next schedule therefore overlaps with syncing the previous one, and a
+    full queue blocks the scrapers (backpressure) instead of piling up
+    schedules the Calendar side cannot keep up with.
+
+    Each config is isolated: an exception in either stage is logged and
+    recorded as a failure without affecting the others. Results are
+    returned in config order regardless of completion order, so the
+    published page stays stable.
+    """
+    work: queue.Queue = queue.Queue(maxsize=queue_size)
+    timings = [StageTiming(config.name) for config in configs]
+    results: list[str | None] = [None] * len(configs)
+    pending = iter(enumerate(configs))
+    pending_lock = threading.Lock()
+
+    def _produce() -> None:
+        while True:
+            with pending_lock:
+                index, config = next(pending, (None, None))
+            if config is None:
+                return
+            started = time.perf_counter()
+            try:
+                games = fetch_one(config)
+            except Exception:
+                logger.exception(f"Failed to scrape schedule for '{config.name}'")
+                continue
+            finally:
+                timings[index].scrape = time.perf_counter() - started
+            put_at = time.perf_counter()
+            work.put((index, games, put_at))  # blocks while the queue is full
+            timings[index].blocked = time.perf_counter() - put_at
+
+    def _consume() -> None:
+        while (item := work.get()) is not _DONE:
+            index, games, put_at = item
+            config = configs[index]
+            started = time.perf_counter()
+            timings[index].queued = started - put_at
+            try:
+                results[index] = sync_one(config, games)
+            except Exception:
+                logger.exception(f"Failed to sync calendar '{config.name}'")
+            finally:
+                timings[index].sync = time.perf_counter() - started
+
+    run_started = time.perf_counter()
+    consumers = [
+        threading.Thread(target=_consume, name=f"sync-{i}") for i in range(sync_workers)
+    ]
+    producers = [
+        threading.Thread(target=_produce, name=f"scrape-{i}") for i in range(scrape_workers)
+    ]
+    for thread in consumers + producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    for _ in consumers:
+        work.put(_DONE)
+    for thread in consumers:
+        thread.join()
+
+    result = PipelineResult(timings=timings, elapsed=time.perf_counter() - run_started)
+    for config, calendar_id in zip(configs, results):
+        if calendar_id is None:
+            result.failures.append(config.name)
+        else:
+            result.synced.append((config.name, calendar_id))
+    _log_timings(result)
+    return result
+
+
+def _log_timings(result: PipelineResult) -> None:
+    for timing in result.timings:
+        logger.debug(
+            f"'{timing.name}': scrape {timing.scrape:.2f}s, blocked {timing.blocked:.2f}s, "
+            f"queued {timing.queued:.2f}s, sync {timing.sync:.2f}s"
+        )
+    totals = {
+        stage: sum(getattr(timing, stage) for timing in result.timings)
+        for stage in ("scrape", "blocked", "queued", "sync")
+    }
+    logger.info(
+        f"Pipeline finished in {result.elapsed:.2f}s — stage totals: "
+        + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in totals.items())
+    )
+
+
+def record_pipeline(metrics: Metrics, result: PipelineResult) -> None:
+    """
+    Add *result*'s per-config stage timings (``scrape``, ``blocked``,
+    ``queued``, ``sync``) and run totals to *metrics*.
+    """
+    for timing in result.timings:
+        for stage in ("scrape", "blocked", "queued", "sync"):
+            metrics.observe(
+                "config_phase_seconds", getattr(timing, stage), config=timing.name, phase=stage
+            )
+    if result.failures:
+        metrics.inc("sync_configs_total", len(result.failures), outcome="failed")
+    metrics.set("run_duration_seconds", result.elapsed)
+    metrics.set("run_configs", len(result.timings))
+
+
+def write_metrics(metrics: Metrics, directory: str) -> None:
+    """Write the run report into *directory* and log a one-line summary."""
+    cache_hits = sum(
+        metrics.counter("scraper_cache_total", result=result) for result in ("fresh", "revalidated")
+    )
+    logger.info(
+        f"Run metrics: {metrics.total('scraper_requests_total'):g} scrape request(s) "
+        f"({metrics.total('scraper_retries_total'):g} retries, {cache_hits:g} cache hits), "
+        f"{metrics.total('gcal_calls_total'):g} Calendar call(s) "
+        f"({metrics.total('gcal_retries_total'):g} retries)"
+    )
+    json_path, prometheus_path = metrics.write_report(directory)
+    logger.info(f"Wrote run metrics to {json_path} and {prometheus_path}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse CLI flags; ``--workers``, ``--scrape-workers``, ``--queue-size``
+    and ``--acl-recheck-days`` default to ``SYNC_WORKERS``,
+    ``SCRAPE_WORKERS``, ``PIPELINE_QUEUE_SIZE`` and ``ACL_RECHECK_DAYS``
+    from the environment.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("SYNC_WORKERS", DEFAULT_SYNC_WORKERS)),
+        help="Number of calendars to sync concurrently (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--scrape-workers",
+        type=int,
+        default=int(os.environ.get("SCRAPE_WORKERS", DEFAULT_SCRAPE_WORKERS)),
+        help="Number of schedules to scrape concurrently (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=int(os.environ.get("PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+        help="Scraped schedules that may wait for a sync worker before "
+        "scraping pauses (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--acl-recheck-days",
+        type=float,
+        default=float(
+            os.environ.get("ACL_RECHECK_DAYS", DEFAULT_ACL_RECHECK_INTERVAL.days)
+        ),
+        help="Days a calendar confirmed public is trusted before its ACL is "
+        "listed again (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--recheck-acl",
+        action="store_true",
+        help="List every calendar's ACL this run, ignoring cached public status.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Plan every config's writes and save them to --plan-file without "
+        "changing any calendar.",
+    )
+    parser.add_argument(
+        "--plan-file",
+        type=Path,
+        default=Path(DEFAULT_PLAN_FILE),
+        help="JSON file the --dry-run plan is written to (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.scrape_workers < 1:
+        parser.error("--scrape-workers must be at least 1")
+    if args.queue_size < 1:
+        parser.error("--queue-size must be at least 1")
+    if args.acl_recheck_days < 0:
+        parser.error("--acl-recheck-days must not be negative")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
     """Entry point: load .env, configure logging, build clients, sync calendars."""
     # Load .env if present — values already in the environment take precedence
     load_dotenv(override=False)
 
+    args = parse_args(argv)
+
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     configure_logging(log_level)
+    logger.info(
+        f"Sync workers: {args.workers}, scrape workers: {args.scrape_workers}, "
+        f"queue size: {args.queue_size}"
+    )
 
-    scraper = ScraperClient("Peter Parker")
+    # Shared by every client and worker; written out when the run ends.
+    metrics = Metrics()
+    scraper = ScraperClient(
+        "Peter Parker", cache=cache_from_env(), scheduler=scheduler_from_env(), metrics=metrics
+    )
+    # One /match crawl per site serves every config's games this run.
+    match_index = MatchIndex(scraper)
+    # Likewise one calendar-list fetch serves every config's calendar lookup.
+    directory = CalendarDirectory()
+
+    state_path = os.environ.get("STATE_DB", DEFAULT_STATE_DB)
+    state = StateStore(state_path) if state_path else None
+    acl_recheck_interval = (
+        timedelta(0) if args.recheck_acl else timedelta(days=args.acl_recheck_days)
+    )
+    # Its pooled transport is thread-safe, so every sync worker shares this
+    # one client (and its keep-alive connections and rate limiter). It is
+    # built before any scraping so bad credentials fail fast.
     gclient = GoogleCalClient(
         "Cal.Endar",
         os.environ["GCAL_CLIENT_ID"],
         os.environ["GCAL_CLIENT_SECRET"],
         os.environ["GCAL_REFRESH_TOKEN"],
+        state=state,
+        acl_recheck_interval=acl_recheck_interval,
+        rate_limiter=limiter_from_env(),
+        pool_maxsize=max(args.workers, DEFAULT_POOL_MAXSIZE),
+        metrics=metrics,
     )
 
     configs = load_configs(CONFIG_DIR)
+    plans: dict[str, SyncPlan] = {}
+
+    def _dry_run_one(config: CalendarConfig, games: list[Game]) -> str:
+        plans[config.name] = dry_run_games(gclient, config, games, directory)
+        return plans[config.name].calendar_id or ""
+
+    # The report is written however the run ends (including sys.exit on
+    # failures), so quota pressure on a failing run is still visible.
+    metrics_dir = os.environ.get("METRICS_DIR", DEFAULT_REPORT_DIR)
+    try:
+        result = run_pipeline(
+            configs,
+            fetch_one=lambda config: fetch_games(scraper, config, match_index=match_index),
+            sync_one=(
+                _dry_run_one
+                if args.dry_run
+                else lambda config, games: sync_games(
+                    gclient, config, games, directory, metrics=metrics
+                )
+            ),
+            sync_workers=args.workers,
+            scrape_workers=args.scrape_workers,
+            queue_size=args.queue_size,
+        )
+        record_pipeline(metrics, result)
+        synced, failures = result.synced, result.failures
 
-    failures: list[str] = []
-    synced: list[tuple[str, str]] = []
-    for config in configs:
-        try:
-            calendar_id = sync_calendar(gclient=gclient, scraper=scraper, config=config)
-            synced.append((config.name, calendar_id))
-        except Exception:
-            logger.exception(f"Failed to sync calendar '{config.name}'")
-            failures.append(config.name)
-
-    logger.log("MAJOR", IMPORTANT_STUFF_3)
-
-    if failures:
-        logger.error(
-            f"{len(failures)}/{len(configs)} calendar(s) failed to sync: {failures}"
+        logger.log("MAJOR", IMPORTANT_STUFF_3)
+
+        if failures:
+            logger.error(
+                f"{len(failures)}/{len(configs)} calendar(s) failed to sync: {failures}"
+            )
+            sys.exit(1)
+
+        if args.dry_run:
+            write_plans(args.plan_file, [plans[config.name] for config in configs])
+            return
+
+        # Only written on a fully successful run — a failed run leaves the
+        # previously deployed page in place rather than publishing a partial list.
+        site_path = Path("site/index.html")
+        site_path.parent.mkdir(exist_ok=True)
+        site_path.write_text(
+            build_site(synced, updated=datetime.now(tz=ZoneInfo("Australia/Sydney"))),
+            encoding="utf-8",
         )
-        sys.exit(1)
+        logger.success(f"Wrote calendar links page to {site_path}")
 
-    # Only written on a fully successful run — a failed run leaves the
-    # previously deployed page in place rather than publishing a partial list.
-    site_path = Path("site/index.html")
-    site_path.parent.mkdir(exist_ok=True)
-    site_path.write_text(
-        build_site(synced, updated=datetime.now(tz=ZoneInfo("Australia/Sydney"))),
-        encoding="utf-8",
-    )
-    logger.success(f"Wrote calendar links page to {site_path}")
+    finally:
+        if metrics_dir:
+            write_metrics(metrics, metrics_dir)
 
 
 if __name__ == "__main__":
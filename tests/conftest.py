@@ -5,6 +5,9 @@ Loguru writes to the real stderr file descriptor by default, which bypasses
 pytest's capsys capture.  This module provides a ``loguru_messages`` fixture
 that collects loguru log records into a list so tests can assert on warning
 output without relying on capsys or caplog.
+
+It also registers the custom ``MAJOR`` log level for every test, since code
+under test logs at it without going through ``main.configure_logging``.
 """
 
 from __future__ import annotations
@@ -16,6 +19,15 @@ import pytest
 from loguru import logger
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _major_level() -> None:
+    """Register loguru's ``MAJOR`` level, as ``main.configure_logging`` does."""
+    try:
+        logger.level("MAJOR")
+    except ValueError:  # not registered yet in this process
+        logger.level("MAJOR", no=21)
+
+
 @pytest.fixture()
 def loguru_messages() -> Generator[list[str], None, None]:
     """
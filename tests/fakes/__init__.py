@@ -0,0 +1,9 @@
+"""
+In-process fakes of the external services the pipeline talks to, for
+offline end-to-end tests and benchmarks.
+"""
+
+from fakes.google_calendar import FakeApiError, FakeCalendarBackend, FakeCalendarHttp, fake_gclient
+from fakes.ssb_site import FakeSsbSite
+
+__all__ = ["FakeApiError", "FakeCalendarBackend", "FakeCalendarHttp", "FakeSsbSite", "fake_gclient"]
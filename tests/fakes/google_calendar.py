@@ -0,0 +1,526 @@
+"""
+In-process fake of the Google Calendar v3 API.
+
+:class:`FakeCalendarHttp` is an ``httplib2.Http``-shaped transport (the same
+interface as :class:`~libs.google_transport.SessionHttp`) that answers the
+requests ``googleapiclient`` builds from the bundled Calendar discovery
+document. A real discovery service built on it exercises the whole client
+stack — request serialization, batch multipart encoding, ``HttpError``
+handling and :meth:`GoogleCalClient._execute` retries — without network or
+credentials::
+
+    backend = FakeCalendarBackend()
+    gclient = fake_gclient(backend, state=StateStore(":memory:"))
+
+Supported endpoints are the ones :class:`~libs.google_cal_client.GoogleCalClient`
+uses: ``calendarList.list`` (pagination, ``syncToken`` with deleted entries),
+``calendars.insert/patch``, ``acl.list/insert``, ``events.list``
+(pagination, ``syncToken`` with cancelled events, ``privateExtendedProperty``,
+``timeMin`` / ``timeMax``), ``events.insert/patch/update/get`` (inserts
+honour a client-chosen ``id``, 409 if it exists even as cancelled) and the
+batch endpoint. List responses honour ``fields`` projections such as
+``nextPageToken,items(id,summary)``, so a field the client reads but does not
+request comes back missing, as it would from the real API.
+
+Latency and quota errors can be injected for load tests; every API call and
+HTTP round-trip is counted in :attr:`FakeCalendarBackend.calls`.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.parser import Parser
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httplib2
+from googleapiclient.discovery import build
+
+from libs.google_cal_client import DEFAULT_ACL_RECHECK_INTERVAL, GoogleCalClient
+
+_API_PREFIX = "/calendar/v3"
+_BATCH_PATH = "/batch/calendar/v3"
+_DEFAULT_PAGE_SIZE = 250
+
+_REASONS = {400: "Bad Request", 403: "Forbidden", 404: "Not Found", 409: "Conflict",
+            410: "Gone", 429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class FakeApiError(Exception):
+    """An API error response, rendered as Google's JSON error body."""
+
+    def __init__(self, status: int, message: str, reason: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.reason = reason or _REASONS.get(status, "error")
+
+    def body(self) -> dict:
+        return {
+            "error": {
+                "code": self.status,
+                "message": self.message,
+                "errors": [{"domain": "global", "reason": self.reason, "message": self.message}],
+            }
+        }
+
+
+@dataclass
+class _Calendar:
+    id: str
+    summary: str
+    description: str = ""
+    time_zone: str = "UTC"
+    deleted: bool = False
+    seq: int = 0
+    acl: list[dict] = field(default_factory=list)
+    events: dict[str, dict] = field(default_factory=dict)  # id -> event (insertion order)
+    event_seq: dict[str, int] = field(default_factory=dict)
+
+    def resource(self) -> dict:
+        return {
+            "kind": "calendar#calendarListEntry",
+            "id": self.id,
+            "summary": self.summary,
+            "description": self.description,
+            "timeZone": self.time_zone,
+            "accessRole": "owner",
+            **({"deleted": True} if self.deleted else {}),
+        }
+
+
+class FakeCalendarBackend:
+    """
+    Thread-safe in-memory store behind :class:`FakeCalendarHttp`.
+
+    Attributes:
+        latency: Seconds slept per HTTP round-trip (a batch counts once).
+        error_rate: Probability that any API call (including each batch
+            sub-request) fails with a 403 ``rateLimitExceeded``.
+        calls: Count per API method (``"events.list"``, ...) plus ``"http"``
+            for HTTP round-trips.
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._calendars: dict[str, _Calendar] = {}
+        self._seq = 0
+        self._ids = 0
+        self._token_floor = 0  # sync tokens below this are expired
+        self._failures: list[tuple[str | None, FakeApiError, bool]] = []
+
+    # ── test helpers ────────────────────────────────────────────────────
+
+    def add_calendar(self, summary: str, calendar_id: str | None = None) -> str:
+        """Create a calendar directly (not counted as an API call)."""
+        with self._lock:
+            calendar_id = calendar_id or self._new_id("cal") + "@group.calendar.google.com"
+            self._calendars[calendar_id] = _Calendar(calendar_id, summary, seq=self._next_seq())
+            return calendar_id
+
+    def delete_calendar(self, calendar_id: str) -> None:
+        with self._lock:
+            calendar = self._calendar(calendar_id)
+            calendar.deleted = True
+            calendar.seq = self._next_seq()
+
+    def events(self, calendar_id: str, include_cancelled: bool = False) -> list[dict]:
+        """Copies of a calendar's events (as an external viewer would see them)."""
+        with self._lock:
+            return [
+                json.loads(json.dumps(event))
+                for event in self._calendar(calendar_id).events.values()
+                if include_cancelled or event["status"] != "cancelled"
+            ]
+
+    def edit_event(self, calendar_id: str, event_id: str, **fields) -> None:
+        """Simulate someone editing an event in the Calendar UI."""
+        with self._lock:
+            self._touch(self._calendar(calendar_id), self._event(calendar_id, event_id), fields)
+
+    def cancel_event(self, calendar_id: str, event_id: str) -> None:
+        """Simulate someone deleting an event in the Calendar UI."""
+        self.edit_event(calendar_id, event_id, status="cancelled")
+
+    def acl(self, calendar_id: str) -> list[dict]:
+        with self._lock:
+            return list(self._calendar(calendar_id).acl)
+
+    def expire_sync_tokens(self) -> None:
+        """Make every sync token issued so far answer HTTP 410."""
+        with self._lock:
+            self._token_floor = self._seq + 1
+
+    def fail_next(
+        self,
+        count: int = 1,
+        status: int = 403,
+        reason: str = "rateLimitExceeded",
+        method: str | None = None,
+        applied: bool = False,
+    ) -> None:
+        """
+        Fail the next *count* calls (optionally only to *method*) with *status*.
+
+        With *applied*, each call takes effect before the error is returned,
+        like a write whose response was lost.
+        """
+        with self._lock:
+            error = FakeApiError(status, f"Injected {status} {reason}", reason)
+            self._failures.extend([(method, error, applied)] * count)
+
+    # ── request handling ────────────────────────────────────────────────
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+
+    def call(self, method: str, path: str, query: dict[str, list[str]], body: dict | None) -> dict:
+        """Dispatch one API call; raises :class:`FakeApiError` on failure."""
+        if not path.startswith(_API_PREFIX):
+            raise FakeApiError(404, f"Unknown path {path}")
+        path = path[len(_API_PREFIX):]
+        for pattern, http_method, name in _ROUTES:
+            match = re.fullmatch(pattern, path)
+            if match and http_method == method:
+                with self._lock:
+                    self.calls[name] += 1
+                    lost = self._maybe_fail(name)
+                    handler = getattr(self, "_" + name.replace(".", "_"))
+                    ids = [unquote(group) for group in match.groups()]
+                    response = handler(*ids, query=query, body=body or {})
+                    if lost is not None:
+                        raise lost
+                    return response
+        raise FakeApiError(404, f"No route for {method} {path}")
+
+    def _maybe_fail(self, name: str) -> FakeApiError | None:
+        """Raise the next injected failure for *name*, or return it if applied."""
+        for index, (method, error, applied) in enumerate(self._failures):
+            if method in (None, name):
+                del self._failures[index]
+                if applied:
+                    return error
+                raise error
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise FakeApiError(403, "Rate Limit Exceeded", "rateLimitExceeded")
+        return None
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _new_id(self, prefix: str) -> str:
+        self._ids += 1
+        return f"{prefix}{self._ids:06d}"
+
+    def _calendar(self, calendar_id: str) -> _Calendar:
+        calendar = self._calendars.get(calendar_id)
+        if calendar is None or calendar.deleted:
+            raise FakeApiError(404, f"Calendar {calendar_id} not found", "notFound")
+        return calendar
+
+    def _event(self, calendar_id: str, event_id: str) -> dict:
+        event = self._calendar(calendar_id).events.get(event_id)
+        if event is None:
+            raise FakeApiError(404, f"Event {event_id} not found", "notFound")
+        return event
+
+    def _touch(self, calendar: _Calendar, event: dict, fields: dict, replace: bool = False) -> None:
+        if replace:
+            keep = {key: event[key] for key in ("id", "status", "created")}
+            event.clear()
+            event.update(keep)
+        for key, value in fields.items():
+            if key == "extendedProperties" and not replace:
+                # Calendar merges extended property keys on patch.
+                for scope, props in value.items():
+                    event.setdefault("extendedProperties", {}).setdefault(scope, {}).update(props)
+            elif key == "colorId":
+                event[key] = str(value)  # the API always returns color IDs as strings
+            elif key != "id":
+                event[key] = value
+        seq = self._next_seq()
+        event["updated"] = f"seq-{seq}"
+        calendar.event_seq[event["id"]] = seq
+
+    def _check_token(self, token: str) -> int:
+        try:
+            seq = int(token.removeprefix("sync-"))
+        except ValueError:
+            raise FakeApiError(400, "Invalid sync token", "invalid") from None
+        if seq < self._token_floor:
+            raise FakeApiError(410, "Sync token is no longer valid, a full sync is required.",
+                               "fullSyncRequired")
+        return seq
+
+    @staticmethod
+    def _page(items: list[dict], query: dict, watermark: int) -> dict:
+        offset = 0
+        if "pageToken" in query:
+            offset_str, watermark_str = query["pageToken"][0].split(":")
+            offset, watermark = int(offset_str), int(watermark_str)
+        size = int(query.get("maxResults", [_DEFAULT_PAGE_SIZE])[0])
+        page = items[offset:offset + size]
+        response: dict = {"items": json.loads(json.dumps(page))}
+        if offset + size < len(items):
+            response["nextPageToken"] = f"{offset + size}:{watermark}"
+        else:
+            response["nextSyncToken"] = f"sync-{watermark}"
+        if "fields" in query:
+            response = _project(response, _parse_fields(query["fields"][0]))
+        return response
+
+    @staticmethod
+    def _watermark(query: dict, current: int) -> int:
+        if "pageToken" in query:
+            return int(query["pageToken"][0].split(":")[1])
+        return current
+
+    def _calendarList_list(self, query: dict, body: dict) -> dict:
+        watermark = self._watermark(query, self._seq)
+        since = self._check_token(query["syncToken"][0]) if "syncToken" in query else None
+        items = [
+            calendar.resource()
+            for calendar in self._calendars.values()
+            if calendar.seq <= watermark
+            and ((since is None and not calendar.deleted) or (since is not None and calendar.seq > since))
+        ]
+        return self._page(items, query, watermark)
+
+    def _calendars_insert(self, query: dict, body: dict) -> dict:
+        calendar_id = self.add_calendar(body.get("summary", ""))
+        calendar = self._calendars[calendar_id]
+        calendar.description = body.get("description", "")
+        calendar.time_zone = body.get("timeZone", "UTC")
+        return {"kind": "calendar#calendar", "id": calendar_id, "summary": calendar.summary}
+
+    def _calendars_patch(self, calendar_id: str, query: dict, body: dict) -> dict:
+        calendar = self._calendar(calendar_id)
+        calendar.summary = body.get("summary", calendar.summary)
+        calendar.description = body.get("description", calendar.description)
+        calendar.seq = self._next_seq()
+        return {"kind": "calendar#calendar", "id": calendar_id, "summary": calendar.summary}
+
+    def _acl_list(self, calendar_id: str, query: dict, body: dict) -> dict:
+        return {"items": json.loads(json.dumps(self._calendar(calendar_id).acl))}
+
+    def _acl_insert(self, calendar_id: str, query: dict, body: dict) -> dict:
+        rule = {"id": f"{body['scope']['type']}:{len(self._calendar(calendar_id).acl)}", **body}
+        self._calendar(calendar_id).acl.append(rule)
+        return rule
+
+    def _events_list(self, calendar_id: str, query: dict, body: dict) -> dict:
+        calendar = self._calendar(calendar_id)
+        filters = query.get("privateExtendedProperty", [])
+        time_min = _parse_time(query.get("timeMin", [None])[0])
+        time_max = _parse_time(query.get("timeMax", [None])[0])
+        since = None
+        if "syncToken" in query:
+            if filters or time_min or time_max:
+                raise FakeApiError(400, "Sync token cannot be used with filters", "invalid")
+            since = self._check_token(query["syncToken"][0])
+        watermark = self._watermark(query, self._seq)
+
+        items = []
+        for event_id, event in calendar.events.items():
+            seq = calendar.event_seq[event_id]
+            if seq > watermark:
+                continue
+            if since is not None:
+                if seq > since:
+                    items.append(event)
+                continue
+            if event["status"] == "cancelled":
+                continue
+            private = event.get("extendedProperties", {}).get("private", {})
+            if any(private.get(k) != v for k, _, v in (f.partition("=") for f in filters)):
+                continue
+            if time_min and _parse_time(event["end"]["dateTime"]) <= time_min:
+                continue
+            if time_max and _parse_time(event["start"]["dateTime"]) >= time_max:
+                continue
+            items.append(event)
+        return self._page(items, query, watermark)
+
+    def _events_insert(self, calendar_id: str, query: dict, body: dict) -> dict:
+        calendar = self._calendar(calendar_id)
+        event_id = body.get("id") or self._new_id("ev")
+        if event_id in calendar.events:
+            raise FakeApiError(409, "The requested identifier already exists.", "duplicate")
+        event = {"kind": "calendar#event", "id": event_id, "status": "confirmed"}
+        event["created"] = f"seq-{self._seq + 1}"
+        calendar.events[event["id"]] = event
+        self._touch(calendar, event, body)
+        return json.loads(json.dumps(event))
+
+    def _events_get(self, calendar_id: str, event_id: str, query: dict, body: dict) -> dict:
+        return json.loads(json.dumps(self._event(calendar_id, event_id)))
+
+    def _events_patch(self, calendar_id: str, event_id: str, query: dict, body: dict) -> dict:
+        event = self._event(calendar_id, event_id)
+        self._touch(self._calendar(calendar_id), event, body)
+        return json.loads(json.dumps(event))
+
+    def _events_update(self, calendar_id: str, event_id: str, query: dict, body: dict) -> dict:
+        event = self._event(calendar_id, event_id)
+        self._touch(self._calendar(calendar_id), event, body, replace=True)
+        return json.loads(json.dumps(event))
+
+
+_ID = r"([^/]+)"
+_ROUTES = [
+    (r"/users/me/calendarList", "GET", "calendarList.list"),
+    (r"/calendars", "POST", "calendars.insert"),
+    (rf"/calendars/{_ID}", "PATCH", "calendars.patch"),
+    (rf"/calendars/{_ID}/acl", "GET", "acl.list"),
+    (rf"/calendars/{_ID}/acl", "POST", "acl.insert"),
+    (rf"/calendars/{_ID}/events", "GET", "events.list"),
+    (rf"/calendars/{_ID}/events", "POST", "events.insert"),
+    (rf"/calendars/{_ID}/events/{_ID}", "GET", "events.get"),
+    (rf"/calendars/{_ID}/events/{_ID}", "PATCH", "events.patch"),
+    (rf"/calendars/{_ID}/events/{_ID}", "PUT", "events.update"),
+]
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def _parse_fields(spec: str) -> dict:
+    """
+    Parse a partial-response ``fields`` spec into ``{name: sub-selection}``,
+    where the sub-selection is ``None`` (whole value) or a nested dict:
+    ``"a,b(c,d)"`` -> ``{"a": None, "b": {"c": None, "d": None}}``.
+    """
+    def parse(pos: int) -> tuple[dict, int]:
+        selection: dict = {}
+        name = ""
+        while pos < len(spec):
+            char = spec[pos]
+            pos += 1
+            if char == "(":
+                selection[name.strip()], pos = parse(pos)
+                name = ""
+            elif char in ",)":
+                if name.strip():
+                    selection[name.strip()] = None
+                name = ""
+                if char == ")":
+                    return selection, pos
+            else:
+                name += char
+        if name.strip():
+            selection[name.strip()] = None
+        return selection, pos
+
+    return parse(0)[0]
+
+
+def _project(value, selection: dict | None):
+    """Apply a :func:`_parse_fields` selection to a resource (or list of them)."""
+    if selection is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, selection) for item in value]
+    return {key: _project(value[key], sub) for key, sub in selection.items() if key in value}
+
+
+class FakeCalendarHttp:
+    """
+    ``httplib2.Http`` stand-in answering Calendar API requests from a
+    :class:`FakeCalendarBackend`. Safe to share between threads.
+    """
+
+    def __init__(self, backend: FakeCalendarBackend) -> None:
+        self.backend = backend
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: bytes | str | None = None,
+        headers: dict | None = None,
+        redirections: int = 5,
+        connection_type=None,
+    ) -> tuple[httplib2.Response, bytes]:
+        self.backend.count("http")
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        parts = urlsplit(uri)
+        if parts.path == _BATCH_PATH:
+            return self._batch(body or "", (headers or {}).get("content-type", ""))
+        status, payload = self._dispatch(method, parts.path, parts.query, body)
+        return _response(status, "application/json"), json.dumps(payload).encode("utf-8")
+
+    def _dispatch(self, method: str, path: str, query: str, body: str | None) -> tuple[int, dict]:
+        try:
+            payload = self.backend.call(
+                method, path, parse_qs(query, keep_blank_values=True),
+                json.loads(body) if body else None,
+            )
+        except FakeApiError as exc:
+            return exc.status, exc.body()
+        return 200, payload
+
+    def _batch(self, body: str, content_type: str) -> tuple[httplib2.Response, bytes]:
+        message = Parser().parsestr(f"Content-Type: {content_type}\r\n\r\n{body}")
+        boundary = f"batch_{uuid.uuid4().hex}"
+        chunks: list[str] = []
+        for part in message.get_payload():
+            request_line, _, serialized = part.get_payload().partition("\n")
+            method, target, _ = request_line.split(" ", 2)
+            inner = Parser().parsestr(serialized)
+            path, _, query = target.partition("?")
+            status, payload = self._dispatch(method, path, query, inner.get_payload() or None)
+            content_id = part["Content-ID"][1:-1]
+            chunks.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        return (
+            _response(200, f"multipart/mixed; boundary={boundary}"),
+            "".join(chunks).encode("utf-8"),
+        )
+
+
+def _response(status: int, content_type: str) -> httplib2.Response:
+    resp = httplib2.Response({"status": str(status), "content-type": content_type})
+    resp.reason = _REASONS.get(status, "OK")
+    return resp
+
+
+def fake_gclient(backend: FakeCalendarBackend, **attributes) -> GoogleCalClient:
+    """
+    Build a credential-less :class:`GoogleCalClient` whose discovery service
+    talks to *backend*. *attributes* (``state``, ``rate_limiter``, ``metrics``,
+    ``acl_recheck_interval``) override the client's defaults.
+    """
+    client = object.__new__(GoogleCalClient)
+    client.name = "fake"
+    client.state = None
+    client.rate_limiter = None
+    client.metrics = None
+    client.acl_recheck_interval = DEFAULT_ACL_RECHECK_INTERVAL
+    for key, value in attributes.items():
+        setattr(client, key, value)
+    client.service = build("calendar", "v3", http=FakeCalendarHttp(backend))
+    return client
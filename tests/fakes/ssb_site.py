@@ -0,0 +1,340 @@
+"""
+Localhost fake of a Sydney Social Basketball (WordPress) site.
+
+:class:`FakeSsbSite` generates a synthetic league — *teams* team posts and a
+round-robin of *rounds* match posts — and serves it over HTTP on
+``127.0.0.1`` from a background thread, so the real
+:class:`~libs.scraper_client.ScraperClient` can scrape it::
+
+    with FakeSsbSite(teams=1000, rounds=10) as site:
+        config = CalendarConfig(name="T", url=site.team_url(0), color_id=9)
+        games = fetch_games(ScraperClient("bench"), config)
+
+Served endpoints:
+
+* ``/wp-json/wp/v2/team`` — ``slug``, ``search``, ``_fields``, ``per_page``
+  (max 100) and ``page``, with ``X-WP-Total`` / ``X-WP-TotalPages`` headers
+  and WordPress's ``400 rest_post_invalid_page_number`` one page past the end.
+* ``/wp-json/wp/v2/match`` — the same, plus ``after`` (post date filter).
+* ``/team/<slug>/`` — the team's HTML schedule page (``div.grid`` elements)
+  for the HTML fallback parser, with ``ETag`` revalidation.
+
+With ``seasons=2`` every team also has a previous-season post, so the
+configs built from :meth:`FakeSsbSite.team_url` with ``season=0`` are due a
+rollover. Matches are published 30 days ago, inside
+:class:`~helpers.sources.MatchIndex`'s lookback window; with
+``stale_rounds=n`` the first *n* rounds (and so the team posts) were
+published 200 days ago, outside it. Latency and error responses can be injected; requests are
+counted per endpoint in :attr:`FakeSsbSite.requests`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_MAX_PER_PAGE = 100
+_DEFAULT_PER_PAGE = 10
+
+# First round's tip-off (Sydney wall clock) and the league's courts.
+_SEASON_START = datetime(2026, 2, 2, 19, 0)
+_COURTS = ("Court 1", "Court 2", "Court 3", "Court 4")
+
+# Post ages relative to now: inside and outside MatchIndex's 120-day lookback.
+_RECENT = timedelta(days=30)
+_STALE = timedelta(days=200)
+
+
+@dataclass(frozen=True)
+class _Team:
+    id: int
+    slug: str
+    title: str
+    date: str  # post publish date, ISO 8601
+
+
+class FakeSsbSite:
+    """
+    Synthetic SSB site served on localhost.
+
+    Attributes:
+        latency: Seconds slept before answering each request.
+        error_rate: Probability that a request is answered ``503`` (with
+            ``Retry-After: 0``).
+        requests: Count per endpoint (``"team"``, ``"match"``, ``"html"``).
+    """
+
+    def __init__(
+        self,
+        teams: int = 20,
+        rounds: int = 8,
+        seasons: int = 1,
+        stale_rounds: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._failures: list[int] = []
+        self._server: ThreadingHTTPServer | None = None
+        self.url = ""
+
+        self.teams: list[list[_Team]] = []  # [team index][season]
+        self._team_posts: list[_Team] = []
+        now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        # Each season's team posts go up shortly before its first matches.
+        first_published = now - (_STALE if stale_rounds else _RECENT)
+        next_id = 1000
+        for index in range(teams):
+            posts = []
+            for season in range(seasons):
+                year, number = divmod(2025 * 4 + 3 + season, 4)  # 2025 s4, 2026 s1, ...
+                slug = f"team-{index}" + (f"-{season + 1}" if season else "")
+                posts.append(_Team(
+                    id=next_id,
+                    slug=slug,
+                    title=f"Team {index} &amp; Co {year} s{number + 1}",
+                    date=(first_published - timedelta(days=10 + 90 * (seasons - 1 - season)))
+                    .strftime("%Y-%m-%dT%H:%M:%S"),
+                ))
+                next_id += 1
+            self.teams.append(posts)
+            self._team_posts.extend(posts)
+        self._matches = self._round_robin(rounds, stale_rounds, now, next_id)
+
+    def _round_robin(self, rounds: int, stale_rounds: int, now: datetime, next_id: int) -> list[dict]:
+        """Circle-method fixtures between each team's latest-season posts."""
+        recent = (now - _RECENT).strftime("%Y-%m-%dT%H:%M:%S")
+        stale = (now - _STALE).strftime("%Y-%m-%dT%H:%M:%S")
+        current = [posts[-1] for posts in self.teams]
+        slots: list[_Team | None] = current + ([None] if len(current) % 2 else [])
+        matches: list[dict] = []
+        for round_number in range(1, rounds + 1):
+            for pair in range(len(slots) // 2):
+                home, away = slots[pair], slots[-1 - pair]
+                if home is None or away is None:
+                    continue
+                start = _SEASON_START + timedelta(weeks=round_number - 1, minutes=40 * (pair % 3))
+                slug = f"{home.slug}-vs-{away.slug}-r{round_number}"
+                matches.append({
+                    "id": next_id,
+                    "slug": slug,
+                    "date": stale if round_number <= stale_rounds else recent,
+                    "title": {"rendered": f"{home.title} vs {away.title}"},
+                    "link": f"{{base}}/match/{slug}/",
+                    "acf": {
+                        # Sydney wall clock encoded as a UTC epoch, as on the real site.
+                        "time": int(start.replace(tzinfo=timezone.utc).timestamp()),
+                        "home_team": {"ID": home.id, "post_title": home.title},
+                        "away_team": {"ID": away.id, "post_title": away.title},
+                        "venue": {"post_title": _COURTS[pair % len(_COURTS)]},
+                    },
+                })
+                next_id += 1
+            slots = [slots[0], slots[-1], *slots[1:-1]]
+        return matches
+
+    # ── lifecycle ───────────────────────────────────────────────────────
+
+    def start(self) -> FakeSsbSite:
+        site = self
+
+        class _Handler(_SiteHandler):
+            fake = site
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> FakeSsbSite:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── helpers for tests ───────────────────────────────────────────────
+
+    def team_url(self, index: int, season: int = -1) -> str:
+        """Public URL of team *index*'s post for *season* (default: latest)."""
+        return f"{self.url}/team/{self.teams[index][season].slug}/"
+
+    def matches_for(self, index: int) -> list[dict]:
+        """Match posts involving team *index*'s latest-season post."""
+        team_id = self.teams[index][-1].id
+        return [
+            self._render(match) for match in self._matches
+            if team_id in (match["acf"]["home_team"]["ID"], match["acf"]["away_team"]["ID"])
+        ]
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """Answer the next *count* requests with *status*."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    # ── request handling ────────────────────────────────────────────────
+
+    def _render(self, match: dict) -> dict:
+        return {**match, "link": match["link"].replace("{base}", self.url)}
+
+    def _injected_failure(self) -> int | None:
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503
+        return None
+
+    def collection(self, kind: str, query: dict[str, str]) -> tuple[int, object, dict]:
+        """Answer a WP REST collection request: ``(status, body, headers)``."""
+        try:
+            per_page = int(query.get("per_page", _DEFAULT_PER_PAGE))
+            page = int(query.get("page", 1))
+        except ValueError:
+            return 400, _wp_error("rest_invalid_param", "Invalid parameter(s)"), {}
+        if not 1 <= per_page <= _MAX_PER_PAGE:
+            return 400, _wp_error("rest_invalid_param", "Invalid parameter(s): per_page"), {}
+
+        if kind == "team":
+            posts = [
+                {"id": t.id, "slug": t.slug, "date": t.date, "title": {"rendered": t.title}}
+                for t in self._team_posts
+            ]
+        else:
+            posts = [self._render(match) for match in self._matches]
+        if "slug" in query:
+            posts = [post for post in posts if post["slug"] == query["slug"]]
+        if "search" in query:
+            term = query["search"].lower()
+            posts = [post for post in posts if term in _plain(post["title"]["rendered"])]
+        if "after" in query:
+            posts = [post for post in posts if post["date"] > query["after"]]
+
+        total = len(posts)
+        total_pages = -(-total // per_page)
+        if page > max(total_pages, 1):
+            return 400, _wp_error(
+                "rest_post_invalid_page_number",
+                "The page number requested is larger than the number of pages available.",
+            ), {}
+        items = posts[(page - 1) * per_page:page * per_page]
+        if "_fields" in query:
+            items = [_project(item, query["_fields"].split(",")) for item in items]
+        return 200, items, {"X-WP-Total": str(total), "X-WP-TotalPages": str(total_pages)}
+
+    def team_page(self, slug: str) -> str | None:
+        """The HTML schedule page for the team post *slug*, or ``None``."""
+        team = next((t for t in self._team_posts if t.slug == slug), None)
+        if team is None:
+            return None
+        grids = []
+        for match in self._matches:
+            acf = match["acf"]
+            if team.id not in (acf["home_team"]["ID"], acf["away_team"]["ID"]):
+                continue
+            opponent = acf["away_team"] if acf["home_team"]["ID"] == team.id else acf["home_team"]
+            start = datetime.fromtimestamp(acf["time"], tz=timezone.utc)
+            grids.append(
+                '<div class="grid">'
+                f'<div><h5>Round</h5>Round {match["slug"].rsplit("-r", 1)[1]}</div>'
+                f'<div><h5>Opponent</h5><a href="#">{opponent["post_title"]}</a></div>'
+                f'<div><h5>Date</h5>{start:%d/%m/%Y}</div>'
+                f'<div><h5>Time</h5>{start:%I:%M%p}</div>'
+                f'<div><h5>Court</h5>{acf["venue"]["post_title"]}</div>'
+                f'<div><h5>Score</h5><a href="{self._render(match)["link"]}">View</a></div>'
+                "</div>"
+            )
+        return (
+            f"<html><head><title>{team.title}</title></head><body>"
+            f"<h1>{team.title}</h1>{''.join(grids)}</body></html>"
+        )
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    fake: FakeSsbSite
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real server
+
+    def log_message(self, format: str, *args) -> None:  # silence stderr logging
+        pass
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        kind = "html" if path.startswith("/team/") else path.rsplit("/", 1)[-1]
+        with self.fake._lock:
+            self.fake.requests[kind] += 1
+
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        status = self.fake._injected_failure()
+        if status is not None:
+            self._send(status, b"", "text/plain", {"Retry-After": "0"})
+            return
+
+        if path in ("/wp-json/wp/v2/team", "/wp-json/wp/v2/match"):
+            status, body, headers = self.fake.collection(kind, query)
+            self._send(status, json.dumps(body).encode(), "application/json", headers)
+        elif kind == "html" and (page := self.fake.team_page(path.rsplit("/", 1)[-1])):
+            body = page.encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", "text/html", {"ETag": etag})
+            else:
+                self._send(200, body, "text/html; charset=UTF-8", {"ETag": etag})
+        else:
+            self._send(404, json.dumps(_wp_error("rest_no_route", "No route")).encode(),
+                       "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _wp_error(code: str, message: str) -> dict:
+    return {"code": code, "message": message, "data": {"status": 400}}
+
+
+def _plain(title: str) -> str:
+    return title.replace("&amp;", "&").lower()
+
+
+def _project(item: dict, fields: list[str]) -> dict:
+    """Apply a WP ``_fields`` projection (dotted paths select nested keys)."""
+    projected: dict = {}
+    for path in fields:
+        source, target = item, projected
+        keys = path.split(".")
+        for depth, key in enumerate(keys):
+            if not isinstance(source, dict) or key not in source:
+                break
+            if depth == len(keys) - 1:
+                target[key] = source[key]
+            else:
+                source = source[key]
+                target = target.setdefault(key, {})
+    return projected
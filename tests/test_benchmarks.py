@@ -0,0 +1,88 @@
+"""
+Tests for the benchmark harness (benchmarks/harness.py): timing, stored
+results and regression comparison. The benchmarks themselves are run with
+``python -m benchmarks``, not here.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from benchmarks import harness
+from benchmarks.harness import Benchmark, Result, compare, latest, load, measure, save
+
+
+def _result(name: str, median: float) -> Result:
+    return Result(name=name, rounds=3, min=median, median=median, mean=median, stdev=0.0)
+
+
+class TestMeasure:
+
+    def test_setup_runs_once_and_cleanup_after_timing(self):
+        events = []
+
+        def _bench():
+            events.append("setup")
+            yield lambda: events.append("call")
+            events.append("cleanup")
+
+        result = measure(Benchmark("b", contextmanager(_bench), rounds=3))
+        assert events == ["setup"] + ["call"] * 4 + ["cleanup"]  # 1 warm-up + 3 timed
+        assert result.rounds == 3
+        assert 0 <= result.min <= result.median
+
+    def test_rounds_override(self):
+        calls = []
+
+        def _bench():
+            yield lambda: calls.append(1)
+
+        assert measure(Benchmark("b", contextmanager(_bench), rounds=10), rounds=2).rounds == 2
+        assert len(calls) == 3
+
+    def test_duplicate_names_are_rejected(self, monkeypatch):
+        monkeypatch.setattr(harness, "_REGISTRY", {})
+
+        def _bench():
+            yield lambda: None
+
+        harness.benchmark(name="dup")(_bench)
+        with pytest.raises(ValueError):
+            harness.benchmark(name="dup")(_bench)
+
+
+class TestStoredResults:
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = save([_result("a", 0.5)], directory=tmp_path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["commit"] in path.name
+        assert load(path) == {"a": _result("a", 0.5)}
+
+    def test_latest_skips_the_current_run(self, tmp_path):
+        older = tmp_path / "20260101T000000Z_aaa.json"
+        newer = tmp_path / "20260102T000000Z_bbb.json"
+        older.write_text("{}")
+        newer.write_text("{}")
+        assert latest(tmp_path) == newer
+        assert latest(tmp_path, exclude=newer) == older
+        assert latest(tmp_path / "missing") is None
+
+
+class TestCompare:
+
+    def test_slowdown_beyond_threshold_is_a_regression(self):
+        baseline = {"fast": _result("fast", 1.0), "slow": _result("slow", 1.0)}
+        current = [_result("fast", 0.5), _result("slow", 1.2), _result("new", 1.0)]
+        lines, regressions = compare(current, baseline, threshold=0.1)
+        assert regressions == ["slow"]
+        assert "improved" in lines[0]
+        assert "REGRESSION" in lines[1]
+        assert "(new)" in lines[2]
+
+    def test_noise_within_threshold_is_ignored(self):
+        _, regressions = compare([_result("a", 1.05)], {"a": _result("a", 1.0)}, threshold=0.1)
+        assert regressions == []
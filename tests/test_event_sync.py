@@ -4,12 +4,16 @@ Unit tests for helpers.event_sync — all pure functions, no I/O.
 
 from __future__ import annotations
 
-from datetime import datetime
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import pytest
 
 from helpers.event_sync import (
+    EventMatcher,
+    sync_fingerprint,
     build_field_patch,
     build_reschedule_patch,
     filter_events_by_schedule,
@@ -163,6 +167,86 @@ class TestMatchGameToEvent:
         assert matched.id == "e1"
 
 
+def _reference_match(game, existing):
+    """The original list-scanning matcher, kept as an oracle for EventMatcher."""
+    by_key = {e.key: e for e in existing if e.key}
+    if game.key in by_key:
+        event = by_key[game.key]
+        return ("exact" if event.start == game.start else "reschedule"), event
+    legacy = [e for e in existing if e.key is None]
+    for event in legacy:
+        if event.start == game.start:
+            return "exact", event
+    for event in legacy:
+        if event.start.astimezone(game.start.tzinfo).date() == game.start.date():
+            return "reschedule", event
+    return "create", None
+
+
+class TestEventMatcher:
+
+    def test_consume_prevents_double_match(self):
+        game = _game()
+        ev = ExistingEvent(id="e1", key=None, start=game.start)
+        matcher = EventMatcher([ev])
+        assert matcher.match(game, consume=True) == ("exact", ev)
+        assert matcher.match(game) == ("create", None)
+
+    def test_match_without_consume_is_repeatable(self):
+        game = _game()
+        ev = ExistingEvent(id="e1", key="round1", start=game.start)
+        matcher = EventMatcher([ev])
+        assert matcher.match(game) == matcher.match(game) == ("exact", ev)
+
+    def test_duplicate_keys_last_wins_then_next(self):
+        game = _game()
+        first = ExistingEvent(id="e1", key="round1", start=game.start)
+        second = ExistingEvent(id="e2", key="round1", start=game.start)
+        matcher = EventMatcher([first, second])
+        assert matcher.match(game, consume=True)[1] is second
+        assert matcher.match(game, consume=True)[1] is first
+
+    def test_consumed_legacy_event_leaves_date_index(self):
+        game = _game()
+        ev = ExistingEvent(
+            id="e1", key=None, start=datetime(2026, 1, 15, 19, 0, tzinfo=SYDNEY)
+        )
+        matcher = EventMatcher([ev])
+        assert matcher.match(game, consume=True) == ("reschedule", ev)
+        assert matcher.match(_game(key="round2")) == ("create", None)
+
+    def test_matches_reference_sequence(self):
+        """A full consume-on-match run gives the same actions as the original
+        list-based loop, across keyed, legacy, duplicate and UTC-offset events."""
+        rng = random.Random(7)
+        base = datetime(2026, 1, 1, 19, 0, tzinfo=SYDNEY)
+        existing = []
+        for i in range(300):
+            start = base + timedelta(days=rng.randrange(60), hours=rng.choice([0, 1, 2]))
+            if rng.random() < 0.5:
+                start = start.astimezone(ZoneInfo("UTC"))
+            key = rng.choice([None, f"round{rng.randrange(40)}"])
+            existing.append(ExistingEvent(id=f"e{i}", key=key, start=start))
+        games = [
+            _game(
+                key=f"round{rng.randrange(50)}",
+                start=base + timedelta(days=rng.randrange(60), hours=rng.choice([0, 1])),
+            )
+            for _ in range(200)
+        ]
+
+        remaining = list(existing)
+        expected = []
+        for game in games:
+            action, matched = _reference_match(game, remaining)
+            if matched is not None:
+                remaining.remove(matched)
+            expected.append((action, matched))
+
+        matcher = EventMatcher(existing)
+        assert [matcher.match(g, consume=True) for g in games] == expected
+
+
 class TestBuildReschedulePatch:
 
     def test_full_patch_payload(self):
@@ -181,28 +265,66 @@ class TestBuildReschedulePatch:
 
 class TestBuildFieldPatch:
 
-    def _details(self, game, color_id=9):
-        return {
-            "summary": game.title,
-            "colorId": str(color_id),
-            "description": game.details_url,
-            "location": game.venue,
-            "extendedProperties": {"private": {"gameKey": game.key}},
-        }
+    def _event(self, game, color_id=9):
+        return ExistingEvent(
+            id="e1", key=game.key, start=game.start,
+            summary=game.title,
+            color_id=str(color_id),
+            description=game.details_url,
+            location=game.venue,
+        )
 
     def test_no_drift_returns_empty_patch(self):
         game = _game()
-        assert build_field_patch(self._details(game), game, color_id=9) == {}
+        assert build_field_patch(self._event(game), game, color_id=9) == {}
 
     def test_drifted_summary_patched(self):
         game = _game()
-        details = self._details(game)
-        details["summary"] = "old name"
-        assert build_field_patch(details, game, color_id=9) == {"summary": game.title}
+        event = replace(self._event(game), summary="old name")
+        assert build_field_patch(event, game, color_id=9) == {"summary": game.title}
 
     def test_missing_key_is_adopted(self):
         game = _game()
-        details = self._details(game)
-        details["extendedProperties"] = {"private": {"schedule": "u"}}
-        patch = build_field_patch(details, game, color_id=9)
+        event = replace(self._event(game), key=None)
+        patch = build_field_patch(event, game, color_id=9)
         assert patch == {"extendedProperties": {"private": {"gameKey": "round1"}}}
+
+    def test_runs_on_parsed_list_response(self):
+        """Fields captured from the list response are enough for the drift check."""
+        game = _game()
+        events = [{
+            "id": "e1",
+            "summary": game.title,
+            "colorId": "3",
+            "description": game.details_url,
+            "location": game.venue,
+            "start": {"dateTime": game.start.isoformat()},
+            "extendedProperties": {"private": {"schedule": "u", "gameKey": game.key}},
+        }]
+        event = parse_existing_events(events)[0]
+        assert build_field_patch(event, game, color_id=9) == {"colorId": "9"}
+
+
+class TestSyncFingerprint:
+
+    def test_stable_and_order_independent(self):
+        a, b = _game(key="round1"), _game(key="round2")
+        assert sync_fingerprint([a, b], "u", 9) == sync_fingerprint([b, a], "u", 9)
+
+    @pytest.mark.parametrize("change", [
+        {"title": "Round 1: Someone Else"},
+        {"venue": "Court 9"},
+        {"details_url": "https://other/"},
+        {"start": datetime(2026, 1, 15, 20, 0, tzinfo=SYDNEY)},
+    ])
+    def test_any_written_field_changes_hash(self, change):
+        game = _game()
+        assert sync_fingerprint([game], "u", 9) != sync_fingerprint(
+            [replace(game, **change)], "u", 9
+        )
+
+    def test_schedule_and_colour_change_hash(self):
+        game = _game()
+        base = sync_fingerprint([game], "u", 9)
+        assert sync_fingerprint([game], "u2", 9) != base
+        assert sync_fingerprint([game], "u", 3) != base
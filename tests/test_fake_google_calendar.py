@@ -0,0 +1,373 @@
+"""
+End-to-end tests of GoogleCalClient and the sync engine against the
+in-process fake Calendar API (tests/fakes/google_calendar.py).
+
+These drive the real discovery client — request serialization, batch
+multipart encoding and retry handling — so no credentials or network are
+needed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from googleapiclient.errors import HttpError
+
+import libs.google_cal_client as gcal_module
+from fakes import FakeCalendarBackend, fake_gclient
+from helpers.config_loader import CalendarConfig
+from helpers.models import Game
+from libs.google_cal_client import CalendarDirectory, event_id_for
+from libs.metrics import Metrics
+from libs.state_store import StateStore
+from main import SYNC_RECORDS, run_pipeline, sync_games
+
+SYD = ZoneInfo("Australia/Sydney")
+CONFIG = CalendarConfig(name="Team", url="https://x/team/t/", color_id=9)
+
+
+def _games(n: int) -> list[Game]:
+    games = []
+    for i in range(n):
+        start = datetime(2026, 2, 2, 20, 0, tzinfo=SYD) + timedelta(days=7 * i)
+        games.append(Game(
+            key=f"round{i + 1}",
+            title=f"Round {i + 1}: Rivals",
+            start=start,
+            end=start + timedelta(hours=1),
+            venue="Court 1",
+            details_url=f"https://x/match/{i + 1}/",
+        ))
+    return games
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(gcal_module, "_API_WAIT_SECONDS", 0)
+    monkeypatch.setattr(gcal_module, "_BATCH_WAIT_SECONDS", 0)
+
+
+@pytest.fixture
+def backend():
+    return FakeCalendarBackend()
+
+
+class TestFakeCalendarApi:
+
+    def test_calendar_list_pages_and_sync_token(self, backend):
+        for i in range(3):
+            backend.add_calendar(f"Cal {i}")
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        assert set(gclient.calendar_index()) == {"Cal 0", "Cal 1", "Cal 2"}
+
+        doomed = gclient.calendar_index()["Cal 1"]
+        backend.delete_calendar(doomed)
+        backend.add_calendar("Cal 3")
+        assert set(gclient.calendar_index()) == {"Cal 0", "Cal 2", "Cal 3"}
+
+    def test_event_listing_paginates(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        for i in range(5):
+            gclient.create_event(f"E{i}", "2026-02-02T20:00:00+11:00",
+                                 "2026-02-02T21:00:00+11:00", "Court", {}, calendar_id=calendar_id)
+        events = gclient.list_events(calendar_id, max_results=2)
+        assert [event["summary"] for event in events] == [f"E{i}" for i in range(5)]
+        assert backend.calls["events.list"] == 3
+
+    def test_private_property_and_time_filters(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        gclient.create_event("Mine", "2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00",
+                             "Court", {"schedule": "a"}, calendar_id=calendar_id)
+        gclient.create_event("Other", "2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00",
+                             "Court", {"schedule": "b"}, calendar_id=calendar_id)
+        gclient.create_event("Old", "2025-02-02T20:00:00+11:00", "2025-02-02T21:00:00+11:00",
+                             "Court", {"schedule": "a"}, calendar_id=calendar_id)
+        events = gclient.list_events(
+            calendar_id,
+            private_properties={"schedule": "a"},
+            time_min=datetime(2026, 1, 1, tzinfo=SYD),
+        )
+        assert [event["summary"] for event in events] == ["Mine"]
+
+    def test_sync_token_reports_changes_and_expiry(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        event_id = gclient.create_event("E", "2026-02-02T20:00:00+11:00",
+                                        "2026-02-02T21:00:00+11:00", "Court", {},
+                                        calendar_id=calendar_id)
+        assert gclient.sync_events(calendar_id)[1] is None  # first listing is full
+        assert gclient.sync_events(calendar_id)[1] == []
+
+        backend.cancel_event(calendar_id, event_id)
+        events, changes = gclient.sync_events(calendar_id)
+        assert events == []
+        assert [change["status"] for change in changes] == ["cancelled"]
+
+        backend.expire_sync_tokens()
+        assert gclient.sync_events(calendar_id)[1] is None  # 410 -> full listing
+
+    def test_batch_writes_and_sub_request_errors(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        batch = gclient.batch()
+        for i in range(3):
+            batch.create_event(str(i), f"E{i}", "2026-02-02T20:00:00+11:00",
+                               "2026-02-02T21:00:00+11:00", "Court", {}, calendar_id=calendar_id)
+        backend.fail_next(method="events.insert")  # first sub-request hits quota once
+        results = batch.flush()
+        assert all(result.ok for result in results.values())
+        assert len(backend.events(calendar_id)) == 3
+        assert backend.calls["events.insert"] == 4
+
+    def test_retried_batch_insert_is_not_duplicated(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        batch = gclient.batch()
+        event_id = event_id_for("https://x/team/t/", "round1")
+        batch.create_event("0", "E", "2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00",
+                           "Court", {}, calendar_id=calendar_id, event_id=event_id)
+        # The insert lands but its response is lost, so the batch re-sends it.
+        backend.fail_next(status=503, reason="backendError", method="events.insert", applied=True)
+        results = batch.flush()
+        assert results["0"].ok and results["0"].response["id"] == event_id
+        assert [event["id"] for event in backend.events(calendar_id)] == [event_id]
+        assert backend.calls["events.insert"] == 2
+
+    def test_insert_over_deleted_event_restores_it(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        event_id = event_id_for("https://x/team/t/", "round1")
+
+        def _create(summary: str) -> bool:
+            batch = gclient.batch()
+            batch.create_event("0", summary, "2026-02-02T20:00:00+11:00",
+                               "2026-02-02T21:00:00+11:00", "Court", {},
+                               calendar_id=calendar_id, event_id=event_id)
+            return batch.flush()["0"].ok
+
+        assert _create("Old")
+        backend.cancel_event(calendar_id, event_id)
+        assert _create("New")  # 409 (the ID survives deletion) -> restoring patch
+        assert [(e["summary"], e["status"]) for e in backend.events(calendar_id)] == [
+            ("New", "confirmed")
+        ]
+        assert backend.calls["events.patch"] == 1
+
+    def test_retried_insert_reuses_event_created_by_failed_attempt(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        event_id = event_id_for("https://x/team/t/", "round1")
+        backend.fail_next(status=503, reason="backendError", method="events.insert", applied=True)
+        assert gclient.create_event("E", "2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00",
+                                    "Court", {}, calendar_id=calendar_id,
+                                    event_id=event_id) == event_id
+        assert len(backend.events(calendar_id)) == 1
+        assert (backend.calls["events.insert"], backend.calls["events.get"]) == (1, 1)
+
+    def test_single_insert_over_deleted_event_restores_it(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        event_id = event_id_for("https://x/team/t/", "round1")
+        times = ("2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00")
+        gclient.create_event("Old", *times, "Court", {}, calendar_id=calendar_id, event_id=event_id)
+        backend.cancel_event(calendar_id, event_id)
+        gclient.create_event("New", *times, "Court", {}, calendar_id=calendar_id, event_id=event_id)
+        assert [(e["summary"], e["status"]) for e in backend.events(calendar_id)] == [
+            ("New", "confirmed")
+        ]
+
+    def test_retried_calendar_insert_reuses_created_calendar(self, backend):
+        gclient = fake_gclient(backend)
+        backend.fail_next(status=503, reason="backendError", method="calendars.insert", applied=True)
+        calendar_id = gclient.insert_calendar("Team", "desc")
+        assert gclient.calendar_index() == {"Team": calendar_id}
+        assert backend.calls["calendars.insert"] == 1
+
+    def test_fields_projection_trims_listed_events(self, backend):
+        calendar_id = backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        gclient.create_event("E", "2026-02-02T20:00:00+11:00", "2026-02-02T21:00:00+11:00",
+                             "Court", {"schedule": "a"}, calendar_id=calendar_id)
+        [event] = gclient.list_events(calendar_id, fields="items(id,start(dateTime))")
+        assert set(event) == {"id", "start"}
+        assert event["start"] == {"dateTime": "2026-02-02T20:00:00+11:00"}
+
+    def test_quota_errors_are_retried(self, backend):
+        backend.add_calendar("Team")
+        gclient = fake_gclient(backend)
+        backend.fail_next(count=2, status=429, reason="rateLimitExceeded")
+        assert "Team" in gclient.calendar_index()
+        assert backend.calls["calendarList.list"] == 3
+
+    def test_missing_calendar_is_404(self, backend):
+        gclient = fake_gclient(backend)
+        with pytest.raises(HttpError) as excinfo:
+            gclient.list_events("nope")
+        assert excinfo.value.resp.status == 404
+
+
+class TestEndToEndSync:
+
+    def test_first_sync_creates_calendar_and_events(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(3), CalendarDirectory())
+
+        events = backend.events(calendar_id)
+        assert sorted(event["summary"] for event in events) == [
+            "Round 1: Rivals", "Round 2: Rivals", "Round 3: Rivals"
+        ]
+        assert events[0]["extendedProperties"]["private"]["schedule"] == CONFIG.url
+        assert backend.acl(calendar_id)[0]["scope"] == {"type": "default"}
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name)["writes"] == 3
+
+    def test_unchanged_rerun_is_skipped(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        sync_games(gclient, CONFIG, _games(3), CalendarDirectory())
+        backend.calls.clear()
+
+        sync_games(gclient, CONFIG, _games(3), CalendarDirectory())
+        assert backend.calls["events.list"] == 1
+        assert backend.calls["events.insert"] + backend.calls["events.patch"] == 0
+
+    def test_recheck_acl_covers_unchanged_calendars(self, backend):
+        # --recheck-acl / ACL_RECHECK_DAYS=0 give the client a zero interval.
+        gclient = fake_gclient(
+            backend, state=StateStore(":memory:"), acl_recheck_interval=timedelta(0)
+        )
+        sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        backend.calls.clear()
+
+        sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        assert backend.calls["events.insert"] + backend.calls["events.patch"] == 0
+        assert backend.calls["acl.list"] == 1
+
+    def test_unchanged_calendar_trusts_fresh_acl_record(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        backend.calls.clear()
+        sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        assert backend.calls["acl.list"] == 0
+
+    def test_external_edit_is_repaired(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        edited = backend.events(calendar_id)[0]
+        backend.edit_event(calendar_id, edited["id"], location="Somewhere else")
+
+        sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        assert backend.calls["events.patch"] == 1
+        assert all(event["location"] == "Court 1" for event in backend.events(calendar_id))
+
+    def test_every_compared_field_is_listed_and_repaired(self, backend):
+        # Listings use SYNC_EVENT_FIELDS and the fake applies it, so a field
+        # build_field_patch compares but the projection drops would read as
+        # changed on every event and patch the untouched one too.
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        original = backend.events(calendar_id)
+        backend.edit_event(calendar_id, original[0]["id"], summary="VANDALISED", colorId=1,
+                           description="gone", location="Somewhere else")
+
+        sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        assert backend.calls["events.patch"] == 1
+        fields = ("summary", "colorId", "description", "location")
+        assert [{k: e[k] for k in fields} for e in backend.events(calendar_id)] == [
+            {k: e[k] for k in fields} for e in original
+        ]
+
+    def test_failed_repair_is_retried_next_run(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        [event] = backend.events(calendar_id)
+        backend.edit_event(calendar_id, event["id"], summary="VANDALISED")
+
+        backend.fail_next(status=400, reason="badRequest", method="events.patch")
+        with pytest.raises(RuntimeError):
+            sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name) is None
+
+        sync_games(gclient, CONFIG, _games(1), CalendarDirectory())
+        assert [e["summary"] for e in backend.events(calendar_id)] == ["Round 1: Rivals"]
+
+    def test_failed_sync_of_changed_schedule_is_repaired_later(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        first = backend.events(calendar_id)[0]
+        backend.edit_event(calendar_id, first["id"], summary="VANDALISED")
+
+        # A changed schedule: its listing consumes the edit, then its writes fail.
+        changed = [Game(**{**game.__dict__, "venue": "Court 2"}) for game in _games(2)]
+        backend.fail_next(count=2, status=400, reason="badRequest", method="events.patch")
+        with pytest.raises(RuntimeError):
+            sync_games(gclient, CONFIG, changed, CalendarDirectory())
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name) is None
+
+        sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        assert sorted(e["summary"] for e in backend.events(calendar_id)) == [
+            "Round 1: Rivals", "Round 2: Rivals"
+        ]
+
+    def test_deleted_event_is_restored(self, backend):
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        calendar_id = sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        deleted = backend.events(calendar_id)[0]
+        backend.cancel_event(calendar_id, deleted["id"])
+
+        sync_games(gclient, CONFIG, _games(2), CalendarDirectory())
+        assert sorted(event["summary"] for event in backend.events(calendar_id)) == [
+            "Round 1: Rivals", "Round 2: Rivals"
+        ]
+        assert len(backend.events(calendar_id, include_cancelled=True)) == 2
+
+    def test_rescheduled_game_is_moved_not_duplicated(self, backend):
+        gclient = fake_gclient(backend)
+        games = _games(2)
+        calendar_id = sync_games(gclient, CONFIG, games, CalendarDirectory())
+
+        moved = [games[0], Game(**{**games[1].__dict__, "start": games[1].start + timedelta(days=1),
+                                   "end": games[1].end + timedelta(days=1)})]
+        sync_games(gclient, CONFIG, moved, CalendarDirectory())
+        events = backend.events(calendar_id)
+        assert len(events) == 2
+        assert {event["start"]["dateTime"] for event in events} == {
+            game.start.isoformat() for game in moved
+        }
+
+    def test_metrics_record_calls_phases_and_writes(self, backend):
+        metrics = Metrics()
+        gclient = fake_gclient(backend, state=StateStore(":memory:"), metrics=metrics)
+        sync_games(gclient, CONFIG, _games(3), CalendarDirectory(), metrics=metrics)
+        sync_games(gclient, CONFIG, _games(3), CalendarDirectory(), metrics=metrics)
+
+        assert metrics.counter("gcal_calls_total", method="calendars.insert", status="ok") == 1
+        assert metrics.counter("gcal_calls_total", method="batch", status="ok") == 1
+        assert metrics.counter(
+            "gcal_batch_subrequests_total", method="events.insert", status="ok"
+        ) == 3
+        assert metrics.counter("sync_operations_total", action="create") == 3
+        assert metrics.counter("sync_configs_total", outcome="synced") == 1
+        assert metrics.counter("sync_configs_total", outcome="skipped") == 1
+        for phase in ("calendar", "plan", "execute"):
+            assert metrics.timing("config_phase_seconds", config="Team", phase=phase).count == 1
+        assert metrics.timing("config_phase_seconds", config="Team", phase="check").count == 2
+
+    def test_concurrent_workers_share_one_client(self):
+        backend = FakeCalendarBackend(latency=0.005)
+        gclient = fake_gclient(backend, state=StateStore(":memory:"))
+        directory = CalendarDirectory()
+        configs = [CalendarConfig(name=f"Team {i}", url=f"https://x/t{i}/", color_id=9) for i in range(4)]
+
+        result = run_pipeline(
+            configs,
+            fetch_one=lambda config: _games(3),
+            sync_one=lambda config, games: sync_games(gclient, config, games, directory),
+            sync_workers=4,
+            queue_size=4,
+        )
+        assert result.failures == []
+        assert len({calendar_id for _, calendar_id in result.synced}) == 4
+        assert backend.calls["events.insert"] == 12
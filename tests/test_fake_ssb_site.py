@@ -0,0 +1,135 @@
+"""
+End-to-end scraping tests against the localhost fake SSB site
+(tests/fakes/ssb_site.py).
+
+The real ScraperClient talks HTTP to a server bound to 127.0.0.1, so these
+cover pagination headers, the page-past-end 400, the HTML fallback and
+retries without touching the live site.
+"""
+
+from __future__ import annotations
+
+import pytest
+import requests
+import tenacity
+
+from fakes import FakeSsbSite
+from helpers.config_loader import CalendarConfig
+from helpers.rollover import check_config_rollover
+from helpers.sources import MatchIndex, fetch_games_ssb_api, fetch_games_ssb_html
+from libs.host_scheduler import HostScheduler
+from libs.scraper_client import ScraperClient
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    for method in (ScraperClient._get_with_retry, ScraperClient._get_json_with_retry):
+        monkeypatch.setattr(method.retry, "wait", tenacity.wait_none())
+
+
+@pytest.fixture(scope="module")
+def site():
+    # 26 teams x 8 rounds = 104 matches: two WP pages of the match index.
+    with FakeSsbSite(teams=26, rounds=8, seasons=2) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client():
+    return ScraperClient("fake-site", scheduler=HostScheduler(min_interval=0))
+
+
+def _config(site: FakeSsbSite, index: int) -> CalendarConfig:
+    return CalendarConfig(name=f"Team {index}", url=site.team_url(index), color_id=9)
+
+
+class TestWpApi:
+
+    def test_collection_pagination_headers(self, site, client):
+        body, headers = client.get_json_page(
+            f"{site.url}/wp-json/wp/v2/match", params={"per_page": 100, "page": 1}
+        )
+        assert len(body) == 100
+        assert headers["X-WP-Total"] == "104"
+        assert headers["X-WP-TotalPages"] == "2"
+
+    def test_page_past_end_is_400(self, site, client):
+        with pytest.raises(requests.HTTPError) as excinfo:
+            client.get_json_page(
+                f"{site.url}/wp-json/wp/v2/match", params={"per_page": 100, "page": 3}
+            )
+        assert excinfo.value.response.status_code == 400
+
+    def test_fields_projection(self, site, client):
+        [team] = client.get_json(
+            f"{site.url}/wp-json/wp/v2/team", params={"slug": "team-3-2", "_fields": "id,title"}
+        )
+        assert set(team) == {"id", "title"}
+        assert team["title"]["rendered"] == "Team 3 &amp; Co 2026 s1"
+
+    def test_api_source_finds_every_round(self, site, client):
+        games = fetch_games_ssb_api(client, _config(site, 3))
+        assert [game.key for game in games] == [f"round{r}" for r in range(1, 9)]
+        assert all(" & Co 2026 s1" in game.title for game in games)
+
+    def test_match_index_crawls_all_pages(self, site, client):
+        index = MatchIndex(client)
+        before = site.requests["match"]
+        games = fetch_games_ssb_api(client, _config(site, 5), match_index=index)
+        assert len(games) == 8
+        api_base = f"{site.url}/wp-json/wp/v2"
+        _, by_team = index._sites[api_base]
+        assert sum(len(matches) for matches in by_team.values()) == 2 * 104
+        assert site.requests["match"] - before == 2  # no per-team search
+
+    def test_match_index_partial_team_falls_back_to_search(self, client):
+        # Round 1 was published before the index window; rounds 2-4 after it.
+        with FakeSsbSite(teams=4, rounds=4, stale_rounds=1) as stale_site:
+            index = MatchIndex(client)
+            games = fetch_games_ssb_api(client, _config(stale_site, 0), match_index=index)
+            api_base = f"{stale_site.url}/wp-json/wp/v2"
+            _, by_team = index._sites[api_base]
+        assert len(by_team[stale_site.teams[0][-1].id]) == 3
+        assert [game.key for game in games] == [f"round{r}" for r in range(1, 5)]
+
+
+class TestHtmlPages:
+
+    def test_html_source_matches_api_source(self, site, client):
+        config = _config(site, 7)
+        html_games = fetch_games_ssb_html(client, config)
+        api_games = fetch_games_ssb_api(client, config)
+        assert [(g.key, g.title, g.start, g.venue) for g in html_games] == [
+            (g.key, g.title, g.start, g.venue) for g in api_games
+        ]
+
+    def test_unknown_team_page_is_404(self, site, client):
+        with pytest.raises(requests.HTTPError):
+            client.get_html(f"{site.url}/team/nobody/")
+
+
+class TestFaultInjection:
+
+    def test_injected_503s_are_retried(self, site, client):
+        before = site.requests["team"]
+        site.fail_next(2)
+        teams = client.get_json(f"{site.url}/wp-json/wp/v2/team", params={"slug": "team-1"})
+        assert [team["slug"] for team in teams] == ["team-1"]
+        assert site.requests["team"] - before == 3
+
+
+class TestRollover:
+
+    def test_previous_season_config_is_rolled_over(self, site, client, tmp_path):
+        config_path = tmp_path / "config-team-4.yaml"
+        config_path.write_text(
+            f"name: Team 4\nurl: {site.team_url(4, season=0)}\ncolor_id: 9\n", encoding="utf-8"
+        )
+        result = check_config_rollover(client, config_path)
+        assert result.status == "updated"
+        assert site.team_url(4) in config_path.read_text(encoding="utf-8")
+
+    def test_current_season_config_is_unchanged(self, site, client, tmp_path):
+        config_path = tmp_path / "config-team-4.yaml"
+        config_path.write_text(f"name: Team 4\nurl: {site.team_url(4)}\ncolor_id: 9\n", encoding="utf-8")
+        assert check_config_rollover(client, config_path).status == "unchanged"
@@ -7,13 +7,20 @@ credentials or network calls are made.
 
 from __future__ import annotations
 
+import json
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from googleapiclient.errors import HttpError
 
 with patch("libs.google_cal_client.build"), \
      patch("libs.google_cal_client.Credentials"):
-    from libs.google_cal_client import GoogleCalClient
+    from libs.google_cal_client import CalendarDirectory, GoogleCalClient
+from libs.metrics import Metrics
+from libs.rate_limiter import TokenBucket
+from libs.state_store import StateStore
 
 
 @pytest.fixture
@@ -40,6 +47,101 @@ class TestGetCalendarList:
         assert gclient.get_calendar_list() == fake
 
 
+class TestCalendarIndex:
+
+    def _client(self, responses, state=None):
+        client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
+        client.state = state
+        client.service = MagicMock()
+        client.service.calendarList.return_value.list.return_value.execute.side_effect = responses
+        return client
+
+    def _list_kwargs(self, client):
+        return [c.kwargs for c in client.service.calendarList.return_value.list.call_args_list]
+
+    def test_follows_pagination_and_first_name_wins(self):
+        client = self._client([
+            {"items": [{"id": "a", "summary": "Team"}], "nextPageToken": "p2"},
+            {"items": [{"id": "b", "summary": "Team"}, {"id": "c", "summary": "Other"}]},
+        ])
+        assert client.calendar_index() == {"Team": "a", "Other": "c"}
+        assert self._list_kwargs(client)[1]["pageToken"] == "p2"
+        assert self._list_kwargs(client)[0]["showHidden"] is True
+
+    def test_get_calendar_list_follows_pagination(self):
+        client = self._client([
+            {"items": [{"id": "a"}], "nextPageToken": "p2"},
+            {"items": [{"id": "b"}]},
+        ])
+        assert client.get_calendar_list() == {"items": [{"id": "a"}, {"id": "b"}]}
+
+    def test_incremental_refresh_applies_changes(self):
+        client = self._client(
+            [
+                {"items": [{"id": "a", "summary": "A"}, {"id": "b", "summary": "B"}],
+                 "nextSyncToken": "t1"},
+                {"items": [{"id": "a", "deleted": True}, {"id": "b", "summary": "B2"}],
+                 "nextSyncToken": "t2"},
+            ],
+            state=StateStore(":memory:"),
+        )
+        client.calendar_index()
+        assert client.calendar_index() == {"B2": "b"}
+        second = self._list_kwargs(client)[1]
+        assert second["syncToken"] == "t1"
+        assert "showHidden" not in second
+
+    def test_expired_token_falls_back_to_full_listing(self):
+        gone = HttpError(MagicMock(status=410, reason="Gone"), b"{}")
+        client = self._client(
+            [
+                {"items": [{"id": "a", "summary": "A"}], "nextSyncToken": "t1"},
+                gone,
+                {"items": [{"id": "z", "summary": "Z"}], "nextSyncToken": "t2"},
+            ],
+            state=StateStore(":memory:"),
+        )
+        client.calendar_index()
+        assert client.calendar_index() == {"Z": "z"}
+
+    def test_insert_updates_persisted_list(self):
+        client = self._client(
+            [{"items": [], "nextSyncToken": "t1"}, {"items": [], "nextSyncToken": "t2"}],
+            state=StateStore(":memory:"),
+        )
+        client.calendar_index()
+        client.service.calendars.return_value.insert.return_value.execute.return_value = {
+            "id": "new"
+        }
+        client.insert_calendar("Fresh", "desc")
+        assert client.calendar_index() == {"Fresh": "new"}
+
+
+class TestCalendarDirectory:
+
+    def test_lists_once_and_adds_created_calendars(self):
+        client = MagicMock()
+        client.calendar_index.return_value = {"A": "cal-a"}
+        client.insert_calendar.return_value = "cal-b"
+        directory = CalendarDirectory()
+        assert directory.get_or_create(client, "A", "d") == ("cal-a", False)
+        assert directory.get_or_create(client, "B", "d") == ("cal-b", True)
+        assert directory.get_or_create(client, "B", "d") == ("cal-b", False)
+        client.calendar_index.assert_called_once()
+        client.insert_calendar.assert_called_once_with(calendar_name="B", description="d")
+
+    def test_lookup_never_creates(self):
+        client = MagicMock()
+        client.calendar_index.return_value = {"A": "cal-a"}
+        directory = CalendarDirectory()
+        assert directory.lookup(client, "A") == "cal-a"
+        assert directory.lookup(client, "B") is None
+        client.calendar_index.assert_called_once()
+        client.insert_calendar.assert_not_called()
+
+
 class TestInsertCalendar:
     def test_returns_calendar_id(self, gclient):
         gclient.service.calendars().insert().execute.return_value = {"id": "new-cal"}
@@ -117,6 +219,8 @@ class TestListEventsPagination:
     def _client_with_pages(self, pages):
         """Build a GoogleCalClient with a stubbed events().list() chain."""
         client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
         service = MagicMock()
         executes = [
             {"items": items, **({"nextPageToken": tok} if tok else {})}
@@ -140,6 +244,113 @@ class TestListEventsPagination:
         assert second_call.kwargs["pageToken"] == "tok1"
 
 
+class TestListEventsFilters:
+
+    def _client(self):
+        client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
+        client.state = None
+        service = MagicMock()
+        service.events.return_value.list.return_value.execute.return_value = {"items": []}
+        client.service = service
+        return client, service
+
+    def test_default_page_size_is_2500(self):
+        client, service = self._client()
+        client.list_events("cal")
+        assert service.events.return_value.list.call_args.kwargs["maxResults"] == 2500
+
+    def test_server_side_filters_passed_through(self):
+        client, service = self._client()
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        client.list_events(
+            "cal",
+            private_properties={"schedule": "https://x/team/t/"},
+            time_min=start,
+            fields="items(id)",
+        )
+        kwargs = service.events.return_value.list.call_args.kwargs
+        assert kwargs["privateExtendedProperty"] == ["schedule=https://x/team/t/"]
+        assert kwargs["timeMin"] == "2026-01-01T00:00:00+00:00"
+        assert kwargs["fields"] == "items(id)"
+        assert "timeMax" not in kwargs
+
+    def test_filters_rejected_in_incremental_mode(self):
+        client, _ = self._client()
+        client.state = StateStore(":memory:")
+        with pytest.raises(ValueError):
+            client.list_events("cal", incremental=True, private_properties={"a": "b"})
+
+
+class TestListEventsIncremental:
+
+    def _client(self, responses):
+        """GoogleCalClient with an in-memory state store and scripted list responses."""
+        client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
+        client.state = StateStore(":memory:")
+        service = MagicMock()
+        service.events.return_value.list.return_value.execute.side_effect = responses
+        client.service = service
+        return client, service
+
+    def test_first_run_is_full_listing_and_stores_token(self):
+        client, service = self._client([{"items": [{"id": "a"}], "nextSyncToken": "t1"}])
+        assert client.list_events("cal", incremental=True) == [{"id": "a"}]
+        assert "syncToken" not in service.events.return_value.list.call_args.kwargs
+
+    def test_second_run_merges_changes(self):
+        client, service = self._client([
+            {"items": [{"id": "a", "summary": "old"}, {"id": "b"}], "nextSyncToken": "t1"},
+            {
+                "items": [
+                    {"id": "a", "summary": "new"},
+                    {"id": "b", "status": "cancelled"},
+                    {"id": "c"},
+                ],
+                "nextSyncToken": "t2",
+            },
+        ])
+        client.list_events("cal", incremental=True)
+        events = client.list_events("cal", incremental=True)
+        assert sorted(events, key=lambda e: e["id"]) == [
+            {"id": "a", "summary": "new"}, {"id": "c"},
+        ]
+        assert service.events.return_value.list.call_args.kwargs["syncToken"] == "t1"
+
+    def test_expired_token_falls_back_to_full_listing(self):
+        gone = HttpError(MagicMock(status=410, reason="Gone"), b"{}")
+        client, service = self._client([
+            {"items": [{"id": "a"}], "nextSyncToken": "t1"},
+            gone,
+            {"items": [{"id": "z"}], "nextSyncToken": "t2"},
+        ])
+        client.list_events("cal", incremental=True)
+        assert client.list_events("cal", incremental=True) == [{"id": "z"}]
+        last_call = service.events.return_value.list.call_args
+        assert "syncToken" not in last_call.kwargs
+
+    def test_requires_state_store(self):
+        client, _ = self._client([])
+        client.state = None
+        with pytest.raises(ValueError):
+            client.list_events("cal", incremental=True)
+
+    def test_sync_events_reports_changes(self):
+        client, service = self._client([
+            {"items": [{"id": "a"}], "nextSyncToken": "t1"},
+            {"items": [], "nextSyncToken": "t2"},
+            {"items": [{"id": "a", "status": "cancelled"}], "nextSyncToken": "t3"},
+        ])
+        assert client.sync_events("cal", fields="items(id)") == ([{"id": "a"}], None)
+        assert client.sync_events("cal") == ([{"id": "a"}], [])
+        events, changes = client.sync_events("cal")
+        assert events == [] and changes == [{"id": "a", "status": "cancelled"}]
+        assert service.events.return_value.list.call_args_list[0].kwargs["fields"] == "items(id)"
+
+
 class TestGetEventDetails:
     def test_returns_event_dict(self, gclient):
         fake = {"id": "e1", "summary": "Round 1"}
@@ -151,6 +362,10 @@ class TestEnsureCalendarPublic:
     def _client_with_acl(self, items):
         """Build a GoogleCalClient with a stubbed acl() chain."""
         client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
+        client.state = None
+        client.acl_recheck_interval = timedelta(days=7)
         service = MagicMock()
         service.acl.return_value.list.return_value.execute.return_value = {
             "items": items
@@ -182,3 +397,228 @@ class TestEnsureCalendarPublic:
         )
         client.ensure_calendar_public("cal-1")
         service.acl.return_value.insert.assert_called_once()
+
+    def test_known_public_calendar_skips_acl_list(self):
+        client, service = self._client_with_acl([])
+        client.state = StateStore(":memory:")
+        client.ensure_calendar_public("cal-1")  # inserts the rule and records it
+        client.ensure_calendar_public("cal-1")
+        assert service.acl.return_value.list.call_count == 1
+        service.acl.return_value.insert.assert_called_once()
+
+    def test_already_public_calendar_is_recorded(self):
+        client, service = self._client_with_acl(
+            [{"role": "reader", "scope": {"type": "default"}}]
+        )
+        client.state = StateStore(":memory:")
+        client.ensure_calendar_public("cal-1")
+        client.ensure_calendar_public("cal-1")
+        assert service.acl.return_value.list.call_count == 1
+
+    def test_stale_record_is_reverified(self):
+        client, service = self._client_with_acl(
+            [{"role": "reader", "scope": {"type": "default"}}]
+        )
+        client.state = StateStore(":memory:")
+        client.state.set("public_acl", "cal-1", {"verified_at": time.time() - 8 * 86400})
+        client.ensure_calendar_public("cal-1")
+        assert service.acl.return_value.list.call_count == 1
+
+    def test_force_and_zero_interval_always_list(self):
+        client, service = self._client_with_acl(
+            [{"role": "reader", "scope": {"type": "default"}}]
+        )
+        client.state = StateStore(":memory:")
+        client.ensure_calendar_public("cal-1")
+        client.ensure_calendar_public("cal-1", force=True)
+        client.acl_recheck_interval = timedelta(0)
+        client.ensure_calendar_public("cal-1")
+        assert service.acl.return_value.list.call_count == 3
+
+
+def _http_error(status: int, reason: str = "backendError") -> HttpError:
+    resp = MagicMock(status=status, reason="err")
+    content = json.dumps(
+        {"error": {"errors": [{"domain": "usageLimits", "reason": reason}], "message": reason}}
+    ).encode()
+    return HttpError(resp, content)
+
+
+class _FakeBatchRequest:
+    """Stand-in for googleapiclient's BatchHttpRequest that replays scripted outcomes."""
+
+    def __init__(self, callback, outcomes, sent):
+        self._callback = callback
+        self._outcomes = outcomes
+        self._sent = sent
+        self._ids: list[str] = []
+
+    def add(self, request, request_id=None):
+        self._ids.append(request_id)
+
+    def execute(self):
+        self._sent.append(list(self._ids))
+        for request_id in self._ids:
+            outcome = self._outcomes[request_id].pop(0)
+            if isinstance(outcome, Exception):
+                self._callback(request_id, None, outcome)
+            else:
+                self._callback(request_id, outcome, None)
+
+
+class TestEventBatch:
+
+    def _client(self, outcomes):
+        """GoogleCalClient whose batch endpoint replays *outcomes* per request id."""
+        client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = None
+        client.metrics = None
+        service = MagicMock()
+        sent: list[list[str]] = []
+        service.new_batch_http_request.side_effect = (
+            lambda callback: _FakeBatchRequest(callback, outcomes, sent)
+        )
+        client.service = service
+        return client, service, sent
+
+    def test_flush_returns_per_item_results(self):
+        client, _, _ = self._client({"a": [{"id": "evt-a"}], "b": [{"id": "evt-b"}]})
+        batch = client.batch()
+        batch.patch_event("a", "evt-a", {"summary": "x"}, calendar_id="cal")
+        batch.create_event(
+            "b", event_name="R1", start_time="s", end_time="e", location="L",
+            private_properties={}, calendar_id="cal",
+        )
+        results = batch.flush()
+        assert results["a"].ok and results["a"].response == {"id": "evt-a"}
+        assert results["b"].response == {"id": "evt-b"}
+        assert len(batch) == 0
+
+    def test_groups_into_batches_of_at_most_50(self):
+        outcomes = {str(i): [{"id": str(i)}] for i in range(120)}
+        client, _, sent = self._client(outcomes)
+        batch = client.batch()
+        for i in range(120):
+            batch.patch_event(str(i), f"evt-{i}", {}, calendar_id="cal")
+        batch.flush()
+        assert [len(ids) for ids in sent] == [50, 50, 20]
+
+    def test_retries_only_transient_failures(self, monkeypatch):
+        monkeypatch.setattr("libs.google_cal_client.time.sleep", lambda s: None)
+        client, _, sent = self._client({
+            "ok": [{"id": "1"}],
+            "flaky": [_http_error(403, "rateLimitExceeded"), {"id": "2"}],
+            "bad": [_http_error(404, "notFound")],
+        })
+        batch = client.batch()
+        for request_id in ("ok", "flaky", "bad"):
+            batch.patch_event(request_id, request_id, {}, calendar_id="cal")
+        results = batch.flush()
+        assert sent == [["ok", "flaky", "bad"], ["flaky"]]
+        assert results["flaky"].ok
+        assert not results["bad"].ok
+
+    def test_gives_up_after_max_attempts(self, monkeypatch):
+        monkeypatch.setattr("libs.google_cal_client.time.sleep", lambda s: None)
+        client, _, sent = self._client({"x": [_http_error(503)] * 3})
+        batch = client.batch()
+        batch.patch_event("x", "evt", {}, calendar_id="cal")
+        results = batch.flush()
+        assert len(sent) == 3
+        assert isinstance(results["x"].error, HttpError)
+
+    def test_metrics_count_subrequests_and_retries(self, monkeypatch):
+        monkeypatch.setattr("libs.google_cal_client.time.sleep", lambda s: None)
+        client, service, _ = self._client({
+            "ok": [{"id": "1"}],
+            "flaky": [_http_error(429, "rateLimitExceeded"), {"id": "2"}],
+        })
+        service.events.return_value.patch.return_value.methodId = "calendar.events.patch"
+        client.metrics = Metrics()
+        batch = client.batch()
+        for request_id in ("ok", "flaky"):
+            batch.patch_event(request_id, request_id, {}, calendar_id="cal")
+        batch.flush()
+        metrics = client.metrics
+        assert metrics.counter("gcal_batch_subrequests_total", method="events.patch", status="ok") == 2
+        assert metrics.counter("gcal_batch_subrequests_total", method="events.patch", status="429") == 1
+        assert metrics.counter("gcal_batch_retries_total") == 1
+        assert metrics.counter("gcal_calls_total", method="batch", status="ok") == 2
+
+    def test_duplicate_request_id_rejected(self):
+        client, _, _ = self._client({})
+        batch = client.batch()
+        batch.patch_event("a", "evt", {}, calendar_id="cal")
+        with pytest.raises(ValueError):
+            batch.patch_event("a", "evt", {}, calendar_id="cal")
+
+
+class TestExecuteRetry:
+
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch):
+        monkeypatch.setattr("libs.google_cal_client._API_WAIT_SECONDS", 0)
+
+    def _client(self, limiter=None, metrics=None):
+        client = object.__new__(GoogleCalClient)  # skip __init__ (no creds)
+        client.rate_limiter = limiter
+        client.metrics = metrics
+        return client
+
+    def _request(self, *outcomes):
+        request = MagicMock()
+        request.execute.side_effect = list(outcomes)
+        return request
+
+    @pytest.mark.parametrize("error", [
+        _http_error(429),
+        _http_error(503),
+        _http_error(403, "userRateLimitExceeded"),
+    ])
+    def test_transient_errors_are_retried(self, error):
+        request = self._request(error, {"id": "ok"})
+        assert self._client()._execute(request) == {"id": "ok"}
+        assert request.execute.call_count == 2
+
+    def test_non_retryable_error_raises_immediately(self):
+        request = self._request(_http_error(403, "forbidden"))
+        with pytest.raises(HttpError):
+            self._client()._execute(request)
+        assert request.execute.call_count == 1
+
+    def test_gives_up_after_max_attempts(self):
+        request = self._request(*[_http_error(500)] * 5)
+        with pytest.raises(HttpError):
+            self._client()._execute(request)
+        assert request.execute.call_count == 5
+
+    def test_every_attempt_draws_from_limiter(self):
+        limiter = MagicMock(spec=TokenBucket)
+        request = self._request(_http_error(502), {"id": "ok"})
+        self._client(limiter)._execute(request, tokens=3)
+        assert [c.args for c in limiter.acquire.call_args_list] == [(3,), (3,)]
+        limiter.pause.assert_not_called()
+
+    def test_rate_limit_error_pauses_shared_limiter(self):
+        limiter = MagicMock(spec=TokenBucket)
+        request = self._request(_http_error(403, "rateLimitExceeded"), {"id": "ok"})
+        self._client(limiter)._execute(request)
+        limiter.pause.assert_called_once()
+
+    def test_metrics_count_every_attempt(self):
+        metrics = Metrics()
+        limiter = MagicMock(spec=TokenBucket)
+        request = self._request(_http_error(503), {"id": "ok"})
+        request.methodId = "calendar.events.get"
+        self._client(limiter, metrics)._execute(request)
+        assert metrics.counter("gcal_calls_total", method="events.get", status="503") == 1
+        assert metrics.counter("gcal_calls_total", method="events.get", status="ok") == 1
+        assert metrics.counter("gcal_retries_total", method="events.get") == 1
+        assert metrics.timing("gcal_call_seconds", method="events.get").count == 2
+        assert metrics.timing("gcal_rate_limit_wait_seconds").count == 2
+
+    def test_api_methods_go_through_execute(self, gclient):
+        gclient.rate_limiter = MagicMock(spec=TokenBucket)
+        gclient.service.events().get().execute.return_value = {"id": "e1"}
+        gclient.get_event_details("e1", "cal-1")
+        gclient.rate_limiter.acquire.assert_called_once_with(1)
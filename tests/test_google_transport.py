@@ -0,0 +1,76 @@
+"""
+Unit tests for libs.google_transport — the httplib2-compatible adapter that
+runs the Calendar discovery client over a pooled ``AuthorizedSession``.
+
+HTTP is faked with ``requests_mock`` and the credentials carry a static
+token, so no network or OAuth refresh is involved.
+"""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from libs.google_transport import SessionHttp
+
+EVENT_URL = "https://www.googleapis.com/calendar/v3/calendars/cal-1/events/ev-1"
+
+
+@pytest.fixture
+def http():
+    return SessionHttp(Credentials(token="tok"), pool_maxsize=4)
+
+
+class TestSessionHttp:
+
+    def test_returns_httplib2_style_response(self, http, requests_mock):
+        requests_mock.get(EVENT_URL, json={"id": "ev-1"}, headers={"X-Custom": "1"})
+        resp, content = http.request(EVENT_URL)
+        assert resp.status == 200
+        assert resp["status"] == "200"
+        assert resp["x-custom"] == "1"
+        assert content == b'{"id": "ev-1"}'
+
+    def test_sends_bearer_token_and_body(self, http, requests_mock):
+        requests_mock.post(EVENT_URL, json={})
+        http.request(EVENT_URL, "POST", body=b"{}", headers={"content-type": "application/json"})
+        sent = requests_mock.last_request
+        assert sent.headers["Authorization"] == "Bearer tok"
+        assert sent.body == b"{}"
+
+    def test_strips_encoding_headers_of_decoded_body(self, http, requests_mock):
+        requests_mock.get(
+            EVENT_URL,
+            content=gzip.compress(b'{"id": "ev-1"}'),
+            headers={"Content-Encoding": "gzip"},
+        )
+        resp, content = http.request(EVENT_URL)
+        assert "content-encoding" not in resp
+        assert content == b'{"id": "ev-1"}'
+
+    def test_mounts_pooled_adapter(self, http):
+        adapter = http.session.get_adapter("https://www.googleapis.com/")
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 0
+
+
+class TestDiscoveryClient:
+
+    @pytest.fixture
+    def service(self, http):
+        return build("calendar", "v3", http=http)
+
+    def test_executes_requests_through_session(self, service, requests_mock):
+        requests_mock.get(EVENT_URL, json={"id": "ev-1", "summary": "Game"})
+        event = service.events().get(calendarId="cal-1", eventId="ev-1").execute()
+        assert event == {"id": "ev-1", "summary": "Game"}
+
+    def test_error_status_raises_http_error(self, service, requests_mock):
+        requests_mock.get(EVENT_URL, status_code=404, reason="Not Found", json={})
+        with pytest.raises(HttpError) as excinfo:
+            service.events().get(calendarId="cal-1", eventId="ev-1").execute()
+        assert excinfo.value.resp.status == 404
@@ -0,0 +1,132 @@
+"""
+Unit tests for libs.host_scheduler.
+
+Pacing and Retry-After holds are checked with a fake clock whose ``sleep``
+advances time; the in-flight cap uses real threads.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from libs.host_scheduler import (
+    MAX_RETRY_AFTER_SECONDS,
+    HostScheduler,
+    parse_retry_after,
+    scheduler_from_env,
+)
+
+URL_A = "https://ssb.example.com/wp-json/wp/v2/match"
+URL_B = "https://other.example.com/team/x/"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _scheduler(**kwargs):
+    clock = FakeClock()
+    return HostScheduler(clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+class TestHostScheduler:
+
+    def test_spaces_request_starts_per_host(self):
+        scheduler, clock = _scheduler(min_interval=0.5)
+        starts = []
+        for _ in range(3):
+            with scheduler.slot(URL_A):
+                starts.append(clock.now)
+        assert starts == [0.0, 0.5, 1.0]
+
+    def test_hosts_are_independent(self):
+        scheduler, clock = _scheduler(min_interval=10)
+        with scheduler.slot(URL_A):
+            pass
+        with scheduler.slot(URL_B):
+            pass
+        assert clock.now == 0.0
+
+    def test_host_key_ignores_path_and_case(self):
+        assert HostScheduler.host("https://SSB.example.com/a") == HostScheduler.host(
+            "https://ssb.example.com/b?x=1"
+        )
+
+    def test_defer_holds_host(self):
+        scheduler, clock = _scheduler(min_interval=0)
+        scheduler.defer(URL_A, 30)
+        with scheduler.slot(URL_B):
+            assert clock.now == 0.0
+        with scheduler.slot(URL_A):
+            assert clock.now == 30.0
+
+    def test_defer_is_capped(self):
+        scheduler, clock = _scheduler(min_interval=0)
+        scheduler.defer(URL_A, 10_000)
+        with scheduler.slot(URL_A):
+            assert clock.now == MAX_RETRY_AFTER_SECONDS
+
+    def test_caps_in_flight_requests(self):
+        scheduler = HostScheduler(max_in_flight=2, min_interval=0)
+        active = peak = 0
+        lock = threading.Lock()
+
+        def fetch():
+            nonlocal active, peak
+            with scheduler.slot(URL_A):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=fetch) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak == 2
+
+    @pytest.mark.parametrize("kwargs", [{"max_in_flight": 0}, {"min_interval": -1}])
+    def test_rejects_invalid_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            HostScheduler(**kwargs)
+
+
+class TestParseRetryAfter:
+
+    def test_delta_seconds(self):
+        assert parse_retry_after("120") == 120.0
+
+    def test_http_date(self):
+        when = datetime.now(tz=timezone.utc) + timedelta(seconds=60)
+        assert parse_retry_after(format_datetime(when, usegmt=True)) == pytest.approx(60, abs=2)
+
+    def test_past_date_is_zero(self):
+        assert parse_retry_after("Wed, 01 Jan 2020 00:00:00 GMT") == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon"])
+    def test_missing_or_invalid(self, value):
+        assert parse_retry_after(value) is None
+
+
+class TestSchedulerFromEnv:
+
+    def test_reads_environment(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_HOST_CONCURRENCY", "2")
+        monkeypatch.setenv("SCRAPE_HOST_INTERVAL", "0.5")
+        scheduler = scheduler_from_env()
+        assert (scheduler.max_in_flight, scheduler.min_interval) == (2, 0.5)
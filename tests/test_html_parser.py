@@ -12,14 +12,14 @@ from textwrap import dedent
 
 import pytest
 
+import helpers.html_parser as html_parser
 from helpers.html_parser import (
     HTMLHelper,
-    _extract_label_href,
-    _extract_label_link,
-    _extract_label_sibling,
+    _extract_ssb_fields,
     _parse_ssb_game_element,
+    resolve_backend,
 )
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 
 # ---------------------------------------------------------------------------
@@ -247,31 +247,219 @@ class TestParseSsbRobustness:
 # Low-level extraction helpers
 # ---------------------------------------------------------------------------
 
+# Per-label reference extractors: one tree search per label. The single-pass
+# _extract_ssb_fields must agree with them (see TestExtractSsbFields).
+
+def _extract_label_sibling(element: Tag, label: str) -> str | None:
+    """
+    Find an exact-text label inside *element* and return the text of its next
+    sibling node.
+
+    Exact matching (``string=label``) is used instead of a regex so that
+    opponent names containing the same words (e.g. "Round Hill FC") are not
+    mistakenly treated as labels.
+
+    Returns ``None`` if the label or its sibling cannot be found.
+    """
+    label_node = element.find(string=label)
+    if label_node is None:
+        return None
+    sibling = label_node.find_parent().find_next_sibling(string=True)
+    if sibling is None:
+        return None
+    return sibling.strip() or None
+
+
+def _extract_label_link(element: Tag, label: str) -> str | None:
+    """
+    Find an exact-text label inside *element* and return the text of the first
+    ``<a>`` tag that follows it.
+
+    Returns ``None`` if the label or a following anchor cannot be found.
+    """
+    label_node = element.find(string=label)
+    if label_node is None:
+        return None
+    anchor = label_node.find_next("a")
+    return anchor.get_text(strip=True) if anchor else None
+
+
+def _extract_label_href(element: Tag, label: str) -> str | None:
+    """
+    Find an exact-text label inside *element* and return the ``href`` of the
+    first ``<a>`` tag that follows it.
+
+    Returns ``None`` if the label or a following anchor cannot be found.
+    """
+    label_node = element.find(string=label)
+    if label_node is None:
+        return None
+    anchor = label_node.find_next("a", href=True)
+    return anchor.get("href") if anchor else None
+
+
 class TestExtractHelpers:
 
     def _element(self, html: str):
         return BeautifulSoup(html, "html.parser")
 
-    def test_extract_label_sibling_returns_value(self):
+    def test_label_sibling_returns_value(self):
         el = self._element("<div><h5>Date</h5>10/08/2025</div>")
-        assert _extract_label_sibling(el, "Date") == "10/08/2025"
+        assert _extract_ssb_fields(el)["Date"] == "10/08/2025"
 
-    def test_extract_label_sibling_returns_none_when_label_missing(self):
+    def test_label_sibling_returns_none_when_label_missing(self):
         el = self._element("<div><h5>Other</h5>value</div>")
-        assert _extract_label_sibling(el, "Date") is None
+        assert _extract_ssb_fields(el)["Date"] is None
 
-    def test_extract_label_link_returns_text(self):
+    def test_label_link_returns_text(self):
         el = self._element('<div><h5>Opponent</h5><a href="#">Team B</a></div>')
-        assert _extract_label_link(el, "Opponent") == "Team B"
+        assert _extract_ssb_fields(el)["Opponent"] == "Team B"
 
-    def test_extract_label_link_returns_none_when_missing(self):
+    def test_label_link_returns_none_when_missing(self):
         el = self._element("<div><h5>Other</h5>value</div>")
-        assert _extract_label_link(el, "Opponent") is None
+        assert _extract_ssb_fields(el)["Opponent"] is None
 
-    def test_extract_label_href_returns_url(self):
+    def test_label_href_returns_url(self):
         el = self._element('<div><h5>Score</h5><a href="https://ssb.com/1">View</a></div>')
-        assert _extract_label_href(el, "Score") == "https://ssb.com/1"
+        assert _extract_ssb_fields(el)["Score"] == "https://ssb.com/1"
 
-    def test_extract_label_href_returns_none_when_missing(self):
+    def test_label_href_returns_none_when_missing(self):
         el = self._element("<div><h5>Other</h5>value</div>")
-        assert _extract_label_href(el, "Score") is None
+        assert _extract_ssb_fields(el)["Score"] is None
+
+
+# ---------------------------------------------------------------------------
+# Single-pass extraction and parser backends
+# ---------------------------------------------------------------------------
+
+class TestExtractSsbFields:
+
+    @pytest.mark.parametrize("html", [
+        _make_game_html(),
+        _make_game_html(opponent="Round Hill FC"),
+        "<div class='grid'><div><h5>Round</h5>Round 1</div></div>",
+        "<div class='grid'><div><h5>Date</h5>   </div><div><h5>Score</h5><a>x</a></div></div>",
+        "<div class='grid'><div><h5>Opponent</h5></div><a href='/a'>A</a>"
+        "<div><h5>Score</h5></div><a>no href</a><a href='/b'>B</a></div>",
+    ])
+    def test_matches_per_label_helpers(self, html):
+        element = _game_element(html)
+        expected = {
+            "Round": _extract_label_sibling(element, "Round"),
+            "Opponent": _extract_label_link(element, "Opponent"),
+            "Date": _extract_label_sibling(element, "Date"),
+            "Time": _extract_label_sibling(element, "Time"),
+            "Court": _extract_label_sibling(element, "Court"),
+            "Score": _extract_label_href(element, "Score"),
+        }
+        assert _extract_ssb_fields(element) == expected
+
+    def test_anchor_search_continues_past_element(self):
+        html = (
+            "<div class='grid'><div><h5>Opponent</h5>TBA</div></div>"
+            "<p><a href='/x'>Later</a></p>"
+        )
+        soup = BeautifulSoup(html, "html.parser")
+        element = soup.find("div", class_="grid")
+        assert _extract_ssb_fields(element)["Opponent"] == "Later"
+
+
+class TestResolveBackend:
+
+    def test_explicit_backend_wins(self, monkeypatch):
+        monkeypatch.setenv("HTML_PARSER", "lxml")
+        assert resolve_backend("html.parser") == "html.parser"
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("HTML_PARSER", "html.parser")
+        monkeypatch.setattr(html_parser, "_lxml_available", lambda: True)
+        assert resolve_backend() == "html.parser"
+
+    def test_prefers_lxml_when_installed(self, monkeypatch):
+        monkeypatch.delenv("HTML_PARSER", raising=False)
+        monkeypatch.setattr(html_parser, "_lxml_available", lambda: True)
+        assert resolve_backend() == "lxml"
+
+    def test_falls_back_to_stdlib(self, monkeypatch):
+        monkeypatch.delenv("HTML_PARSER", raising=False)
+        monkeypatch.setattr(html_parser, "_lxml_available", lambda: False)
+        assert resolve_backend() == "html.parser"
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown HTML parser backend"):
+            resolve_backend("html5lib")
+
+    def test_missing_lxml_raises(self, monkeypatch):
+        monkeypatch.setattr(html_parser, "_lxml_available", lambda: False)
+        with pytest.raises(ValueError, match="not installed"):
+            resolve_backend("lxml")
+
+    def test_page_chrome_outside_grids_is_ignored(self):
+        html = (
+            "<html><body><nav><h5>Round</h5>Menu</nav>"
+            + _make_game_html(round_num="2")
+            + "</body></html>"
+        )
+        result = HTMLHelper.parse_html_content(html, "ssb", backend="html.parser")
+        assert [g["round_label"] for g in result] == ["Round 2"]
+
+    def test_lxml_matches_stdlib(self):
+        pytest.importorskip("lxml")
+        html = _make_page(
+            _make_game_html(round_num="1"),
+            _make_game_html(round_num="2", opponent="Round Hill FC", time="7:30PM"),
+        )
+        assert HTMLHelper.parse_html_content(html, "ssb", backend="lxml") == (
+            HTMLHelper.parse_html_content(html, "ssb", backend="html.parser")
+        )
+
+
+# ---------------------------------------------------------------------------
+# iter_ssb_content — streaming
+# ---------------------------------------------------------------------------
+
+def _chunked(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIterSsbContent:
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+    def test_matches_full_parse_for_any_chunking(self, size):
+        html = _make_page(
+            "<nav><div class='menu'><h5>Round</h5>Menu</div></nav>",
+            _make_game_html(round_num="1"),
+            _make_game_html(round_num="2", opponent="Fish &amp; Chips", time="7:30PM"),
+            _make_game_html(round_num="3", opponent="Round Hill FC"),
+        )
+        streamed = list(HTMLHelper.iter_ssb_content(_chunked(html, size)))
+        assert streamed == HTMLHelper._parse_ssb_content(html)
+        assert streamed[1]["round"] == "Round 2: Fish & Chips"
+
+    def test_yields_game_before_input_is_exhausted(self):
+        html = _make_page(_make_game_html(round_num="1"), _make_game_html(round_num="2"))
+        head, tail = html.split("</div>\n</div>", 1)
+        consumed = []
+
+        def chunks():
+            for chunk in (head + "</div>\n</div>", tail):
+                consumed.append(chunk)
+                yield chunk
+
+        games = HTMLHelper.iter_ssb_content(chunks())
+        assert next(games)["round_label"] == "Round 1"
+        assert len(consumed) == 1
+
+    def test_truncated_last_element_is_still_parsed(self):
+        html = _make_page(_make_game_html(round_num="4"))
+        truncated = html[: html.rindex("</div>")]
+        assert len(list(HTMLHelper.iter_ssb_content([truncated]))) == 1
+
+    def test_empty_page_emits_warning(self, loguru_messages):
+        assert list(HTMLHelper.iter_ssb_content(["<html><body></body></html>"])) == []
+        assert any("No game elements found" in m for m in loguru_messages)
+
+    def test_skipped_element_is_counted(self, loguru_messages):
+        html = _make_page(_make_game_html(), _make_game_html(date="not-a-date"))
+        assert len(list(HTMLHelper.iter_ssb_content(_chunked(html, 50)))) == 1
+        assert any("were skipped" in m for m in loguru_messages)
@@ -0,0 +1,395 @@
+"""
+Unit tests for main — the pipelined scrape/sync runner, CLI parsing, and the
+unchanged-calendar short-circuit in ``sync_calendar``.
+
+The per-config scrape/sync callables and the Calendar client are stubbed, so
+no credentials or network are needed.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from helpers.config_loader import CalendarConfig
+from helpers.event_sync import sync_fingerprint
+from helpers.models import Game
+from libs.google_cal_client import BatchResult
+from libs.metrics import Metrics
+from libs.state_store import StateStore
+from helpers.sync_plan import PlannedOperation, SyncPlan
+from main import (
+    SYNC_RECORDS,
+    dry_run_games,
+    execute_plan,
+    parse_args,
+    record_pipeline,
+    run_pipeline,
+    sync_calendar,
+    write_metrics,
+    write_plans,
+)
+
+
+def _configs(n: int) -> list[CalendarConfig]:
+    return [
+        CalendarConfig(name=f"Team {i}", url=f"https://x/team/t{i}/", color_id=9)
+        for i in range(n)
+    ]
+
+
+def _fetch(config):
+    return [config.name]
+
+
+class TestRunPipeline:
+
+    def test_serial_returns_results_in_config_order(self):
+        result = run_pipeline(_configs(3), _fetch, lambda c, games: f"id-{c.name}")
+        assert result.synced == [
+            ("Team 0", "id-Team 0"), ("Team 1", "id-Team 1"), ("Team 2", "id-Team 2")
+        ]
+        assert result.failures == []
+
+    def test_sync_receives_scraped_games(self):
+        seen = []
+        run_pipeline(_configs(2), _fetch, lambda c, games: seen.append((c.name, games)) or "cal")
+        assert seen == [("Team 0", ["Team 0"]), ("Team 1", ["Team 1"])]
+
+    def test_failure_is_isolated(self):
+        def sync_one(config, games):
+            if config.name == "Team 1":
+                raise RuntimeError("boom")
+            return "cal"
+
+        result = run_pipeline(_configs(3), _fetch, sync_one, sync_workers=2)
+        assert [name for name, _ in result.synced] == ["Team 0", "Team 2"]
+        assert result.failures == ["Team 1"]
+
+    def test_scrape_failure_is_isolated_and_never_synced(self):
+        def fetch_one(config):
+            if config.name == "Team 0":
+                raise RuntimeError("site down")
+            return []
+
+        sync_one = MagicMock(return_value="cal")
+        result = run_pipeline(_configs(2), fetch_one, sync_one)
+        assert result.failures == ["Team 0"]
+        assert [call.args[0].name for call in sync_one.call_args_list] == ["Team 1"]
+
+    def test_concurrent_preserves_config_order(self):
+        # Later configs finish first; output order must still follow input order.
+        def sync_one(config, games):
+            time.sleep(0.01 * (5 - int(config.name.split()[-1])))
+            return config.name
+
+        result = run_pipeline(_configs(5), _fetch, sync_one, sync_workers=5, queue_size=5)
+        assert [name for name, _ in result.synced] == [f"Team {i}" for i in range(5)]
+
+    def test_runs_configs_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def sync_one(config, games):
+            barrier.wait()  # deadlocks (then times out) unless all 3 run at once
+            return "cal"
+
+        result = run_pipeline(_configs(3), _fetch, sync_one, sync_workers=3, queue_size=3)
+        assert result.failures == []
+        assert len(result.synced) == 3
+
+    def test_scraping_overlaps_syncing(self):
+        # Team 1 must be scraped while Team 0 is still syncing.
+        scraped_next = threading.Event()
+
+        def fetch_one(config):
+            if config.name == "Team 1":
+                scraped_next.set()
+            return []
+
+        def sync_one(config, games):
+            if config.name == "Team 0":
+                assert scraped_next.wait(timeout=5)
+            return "cal"
+
+        result = run_pipeline(_configs(2), fetch_one, sync_one)
+        assert result.failures == []
+
+    def test_full_queue_blocks_scrapers(self):
+        release = threading.Event()
+        scraped: list[str] = []
+
+        def fetch_one(config):
+            scraped.append(config.name)
+            return []
+
+        def sync_one(config, games):
+            release.wait(timeout=5)
+            return "cal"
+
+        runner = threading.Thread(
+            target=run_pipeline, args=(_configs(5), fetch_one, sync_one), kwargs={"queue_size": 1}
+        )
+        runner.start()
+        time.sleep(0.2)
+        # One schedule being synced, one queued, one scraped and waiting to be queued.
+        assert scraped == ["Team 0", "Team 1", "Team 2"]
+        release.set()
+        runner.join(timeout=5)
+        assert len(scraped) == 5
+
+    def test_records_stage_timings(self):
+        def fetch_one(config):
+            time.sleep(0.02)
+            return []
+
+        def sync_one(config, games):
+            time.sleep(0.03)
+            return "cal"
+
+        result = run_pipeline(_configs(2), fetch_one, sync_one)
+        assert [timing.name for timing in result.timings] == ["Team 0", "Team 1"]
+        assert all(timing.scrape >= 0.02 and timing.sync >= 0.03 for timing in result.timings)
+        assert result.elapsed >= 0.05
+
+
+class TestRunMetrics:
+
+    def test_record_pipeline_adds_stage_timings_and_failures(self):
+        def sync_one(config, games):
+            if config.name == "Team 1":
+                raise RuntimeError("boom")
+            return "cal"
+
+        metrics = Metrics()
+        record_pipeline(metrics, run_pipeline(_configs(2), _fetch, sync_one))
+        for stage in ("scrape", "blocked", "queued", "sync"):
+            assert metrics.timing("config_phase_seconds", config="Team 0", phase=stage).count == 1
+        assert metrics.counter("sync_configs_total", outcome="failed") == 1
+        gauges = {gauge["name"]: gauge["value"] for gauge in metrics.to_dict()["gauges"]}
+        assert gauges["run_configs"] == 2
+        assert gauges["run_duration_seconds"] >= 0
+
+    def test_write_metrics_writes_both_reports(self, tmp_path):
+        metrics = Metrics()
+        metrics.inc("scraper_requests_total", host="x", status=200)
+        write_metrics(metrics, str(tmp_path))
+        assert json.loads((tmp_path / "run-metrics.json").read_text())["counters"]
+        assert "scraper_requests_total" in (tmp_path / "run-metrics.prom").read_text()
+
+
+class TestParseArgs:
+
+    def test_workers_defaults_from_env(self, monkeypatch):
+        monkeypatch.setenv("SYNC_WORKERS", "4")
+        assert parse_args([]).workers == 4
+
+    def test_cli_overrides_env(self, monkeypatch):
+        monkeypatch.setenv("SYNC_WORKERS", "4")
+        assert parse_args(["--workers", "8"]).workers == 8
+
+    def test_default_is_serial(self, monkeypatch):
+        monkeypatch.delenv("SYNC_WORKERS", raising=False)
+        assert parse_args([]).workers == 1
+
+    def test_pipeline_flags_default_from_env(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_WORKERS", "3")
+        monkeypatch.setenv("PIPELINE_QUEUE_SIZE", "8")
+        args = parse_args([])
+        assert (args.scrape_workers, args.queue_size) == (3, 8)
+
+    def test_rejects_zero_queue_size(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--queue-size", "0"])
+
+    def test_rejects_zero_workers(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--workers", "0"])
+
+    def test_acl_recheck_days_from_env(self, monkeypatch):
+        monkeypatch.setenv("ACL_RECHECK_DAYS", "2.5")
+        args = parse_args([])
+        assert args.acl_recheck_days == 2.5
+        assert args.recheck_acl is False
+
+    def test_recheck_acl_flag(self):
+        assert parse_args(["--recheck-acl"]).recheck_acl is True
+
+    def test_rejects_negative_acl_recheck_days(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--acl-recheck-days", "-1"])
+
+    def test_dry_run_flags(self, tmp_path):
+        args = parse_args(["--dry-run", "--plan-file", str(tmp_path / "plan.json")])
+        assert args.dry_run is True
+        assert args.plan_file == tmp_path / "plan.json"
+        assert parse_args([]).dry_run is False
+
+
+CONFIG = CalendarConfig(name="Team", url="https://x/team/t/", color_id=9)
+GAME = Game(
+    key="round1",
+    title="Round 1: Rivals",
+    start=datetime(2026, 1, 15, 21, 10, tzinfo=ZoneInfo("Australia/Sydney")),
+    end=datetime(2026, 1, 15, 22, 10, tzinfo=ZoneInfo("Australia/Sydney")),
+    venue="Court 1",
+    details_url="https://x/match/1/",
+)
+FINGERPRINT = sync_fingerprint([GAME], CONFIG.url, CONFIG.color_id)
+
+
+class TestSyncCalendarShortCircuit:
+
+    @pytest.fixture(autouse=True)
+    def _games(self, monkeypatch):
+        monkeypatch.setattr("main.fetch_games", lambda *a, **kw: [GAME])
+
+    def _gclient(self, sync_results, record=None):
+        gclient = MagicMock()
+        gclient.state = StateStore(":memory:")
+        if record is not None:
+            gclient.state.set(SYNC_RECORDS, CONFIG.name, record)
+        gclient.sync_events.side_effect = sync_results
+        gclient.calendar_index.return_value = {"Team": "cal-1"}
+        gclient.list_events.return_value = []
+        gclient.batch.return_value.flush.return_value = {
+            "0": BatchResult("0", {"id": "ev-1"}, None)
+        }
+        return gclient
+
+    def _record(self, fingerprint=FINGERPRINT):
+        return {"fingerprint": fingerprint, "calendar_id": "cal-1"}
+
+    def test_identical_schedule_and_untouched_calendar_is_skipped(self):
+        gclient = self._gclient([([], [])], record=self._record())
+        assert sync_calendar(gclient, MagicMock(), CONFIG) == "cal-1"
+        gclient.calendar_index.assert_not_called()
+        gclient.ensure_calendar_public.assert_called_once_with("cal-1")
+        gclient.batch.assert_not_called()
+
+    def test_first_sync_records_outcome_after_own_writes(self):
+        gclient = self._gclient([([], [{"id": "ev-1"}])])
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        record = gclient.state.get(SYNC_RECORDS, CONFIG.name)
+        assert record["fingerprint"] == FINGERPRINT
+        assert record["calendar_id"] == "cal-1"
+        assert record["writes"] == 1
+
+    def test_external_edit_forces_full_sync(self):
+        gclient = self._gclient(
+            [([], [{"id": "someone-elses"}]), ([], [{"id": "ev-1"}])],
+            record=self._record(),
+        )
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        gclient.batch.return_value.create_event.assert_called_once()
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name)["writes"] == 1
+
+    def test_changed_schedule_skips_check(self):
+        gclient = self._gclient([([], [{"id": "ev-1"}])], record=self._record("stale"))
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        assert gclient.sync_events.call_count == 1  # only the post-write refresh
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name)["fingerprint"] == FINGERPRINT
+
+    def test_concurrent_foreign_edit_is_not_recorded(self):
+        gclient = self._gclient([([], [{"id": "ev-1"}, {"id": "intruder"}])])
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name) is None
+
+    def test_no_writes_records_without_extra_listing(self):
+        gclient = self._gclient([], record=self._record("stale"))
+        gclient.list_events.return_value = [{
+            "id": "ev-1",
+            "summary": GAME.title,
+            "colorId": "9",
+            "description": GAME.details_url,
+            "location": GAME.venue,
+            "start": {"dateTime": GAME.start.isoformat()},
+            "extendedProperties": {"private": {"schedule": CONFIG.url, "gameKey": "round1"}},
+        }]
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        gclient.sync_events.assert_not_called()
+        assert gclient.state.get(SYNC_RECORDS, CONFIG.name)["writes"] == 0
+
+    def test_without_state_store_never_skips(self):
+        gclient = self._gclient([])
+        gclient.state = None
+        sync_calendar(gclient, MagicMock(), CONFIG)
+        gclient.sync_events.assert_not_called()
+        gclient.calendar_index.assert_called_once()
+
+
+class TestExecutePlan:
+
+    def test_dispatches_operations_to_one_batch(self):
+        gclient = MagicMock()
+        batch = gclient.batch.return_value
+        batch.flush.return_value = {
+            "0": BatchResult("0", {"id": "ev-new"}, None),
+            "1": BatchResult("1", {"id": "ev-1"}, None),
+        }
+        plan = SyncPlan("Team", CONFIG.url, "cal-1", [
+            PlannedOperation("create", "round1", "R1", None, {"event_name": "R1"}),
+            PlannedOperation("patch", "round2", "R2", "ev-1", {"location": "Court 2"}),
+        ])
+        assert execute_plan(gclient, plan) == {"ev-new", "ev-1"}
+        batch.create_event.assert_called_once_with("0", calendar_id="cal-1", event_name="R1")
+        batch.patch_event.assert_called_once_with(
+            "1", event_id="ev-1", patched_fields={"location": "Court 2"}, calendar_id="cal-1"
+        )
+        batch.flush.assert_called_once()
+
+    def test_failed_write_raises(self):
+        gclient = MagicMock()
+        gclient.batch.return_value.flush.return_value = {
+            "0": BatchResult("0", None, RuntimeError("quota"))
+        }
+        plan = SyncPlan("Team", CONFIG.url, "cal-1", [
+            PlannedOperation("patch", "round1", "R1", "ev-1", {"summary": "R1"}),
+        ])
+        with pytest.raises(RuntimeError, match="1/1 event write"):
+            execute_plan(gclient, plan)
+
+    def test_plan_without_calendar_is_rejected(self):
+        with pytest.raises(ValueError):
+            execute_plan(MagicMock(), SyncPlan("Team", CONFIG.url, None))
+
+
+class TestDryRun:
+
+    def test_plans_without_writing(self):
+        gclient = MagicMock()
+        gclient.state = StateStore(":memory:")
+        gclient.calendar_index.return_value = {"Team": "cal-1"}
+        gclient.list_events.return_value = []
+        plan = dry_run_games(gclient, CONFIG, [GAME])
+        assert plan.calendar_id == "cal-1"
+        assert [op.action for op in plan.operations] == ["create"]
+        # A full (filtered) listing, so stored sync tokens are not advanced.
+        assert "incremental" not in gclient.list_events.call_args.kwargs
+        gclient.insert_calendar.assert_not_called()
+        gclient.ensure_calendar_public.assert_not_called()
+        gclient.batch.assert_not_called()
+
+    def test_missing_calendar_plans_creates_without_listing(self):
+        gclient = MagicMock()
+        gclient.calendar_index.return_value = {}
+        plan = dry_run_games(gclient, CONFIG, [GAME])
+        assert plan.calendar_id is None
+        assert plan.counts()["create"] == 1
+        gclient.list_events.assert_not_called()
+        gclient.insert_calendar.assert_not_called()
+
+    def test_write_plans_saves_json(self, tmp_path):
+        path = tmp_path / "out" / "plan.json"
+        plan = SyncPlan("Team", CONFIG.url, "cal-1", [
+            PlannedOperation("patch", "round1", "R1", "ev-1", {"summary": "R1"}),
+        ])
+        write_plans(path, [plan])
+        [saved] = json.loads(path.read_text(encoding="utf-8"))
+        assert SyncPlan.from_dict(saved) == plan
+        assert saved["counts"]["patch"] == 1
@@ -0,0 +1,109 @@
+"""
+Unit tests for libs.metrics.Metrics.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from libs.metrics import REPORT_JSON, REPORT_PROMETHEUS, Metrics, Timing
+
+
+class TestSeries:
+
+    def test_counters_are_per_label_set(self):
+        metrics = Metrics()
+        metrics.inc("requests_total", host="a", status=200)
+        metrics.inc("requests_total", 2, status=200, host="a")  # label order irrelevant
+        metrics.inc("requests_total", host="b", status=200)
+        assert metrics.counter("requests_total", host="a", status="200") == 3
+        assert metrics.counter("requests_total", host="c", status=200) == 0
+        assert metrics.total("requests_total") == 4
+
+    def test_gauges_keep_the_last_value(self):
+        metrics = Metrics()
+        metrics.set("run_configs", 3)
+        metrics.set("run_configs", 5)
+        assert metrics.to_dict()["gauges"] == [{"name": "run_configs", "labels": {}, "value": 5}]
+
+    def test_timer_aggregates_count_total_and_max(self):
+        metrics = Metrics()
+        metrics.observe("call_seconds", 0.5, method="get")
+        metrics.observe("call_seconds", 1.5, method="get")
+        assert metrics.timing("call_seconds", method="get") == Timing(2, 2.0, 1.5)
+        assert metrics.timing("call_seconds", method="other") == Timing()
+
+    def test_timer_context_records_when_block_raises(self):
+        metrics = Metrics()
+        with pytest.raises(RuntimeError):
+            with metrics.timer("phase_seconds", phase="sync"):
+                raise RuntimeError("boom")
+        assert metrics.timing("phase_seconds", phase="sync").count == 1
+
+    def test_concurrent_increments_are_not_lost(self):
+        metrics = Metrics()
+
+        def _work():
+            for _ in range(1000):
+                metrics.inc("hits_total")
+                metrics.observe("hit_seconds", 0.001)
+
+        threads = [threading.Thread(target=_work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert metrics.counter("hits_total") == 8000
+        assert metrics.timing("hit_seconds").count == 8000
+
+
+class TestReports:
+
+    def _metrics(self) -> Metrics:
+        metrics = Metrics()
+        metrics.inc("gcal_calls_total", method="events.list", status="ok")
+        metrics.inc("gcal_calls_total", method="events.list", status="429")
+        metrics.set("run_duration_seconds", 12.5)
+        metrics.observe("gcal_call_seconds", 0.25, method="events.list")
+        metrics.observe("gcal_call_seconds", 0.75, method="events.list")
+        return metrics
+
+    def test_json_shape(self):
+        data = self._metrics().to_dict()
+        assert [c["labels"]["status"] for c in data["counters"]] == ["429", "ok"]
+        assert data["timers"] == [{
+            "name": "gcal_call_seconds",
+            "labels": {"method": "events.list"},
+            "count": 2,
+            "seconds": 1.0,
+            "max_seconds": 0.75,
+        }]
+        json.dumps(data)  # serializable as-is
+
+    def test_prometheus_text_format(self):
+        text = self._metrics().to_prometheus()
+        lines = text.splitlines()
+        assert "# TYPE calendar_webscraper_gcal_calls_total counter" in lines
+        assert lines.count("# TYPE calendar_webscraper_gcal_calls_total counter") == 1
+        assert 'calendar_webscraper_gcal_calls_total{method="events.list",status="429"} 1.0' in lines
+        assert "calendar_webscraper_run_duration_seconds 12.5" in lines
+        assert "# TYPE calendar_webscraper_gcal_call_seconds summary" in lines
+        assert 'calendar_webscraper_gcal_call_seconds_count{method="events.list"} 2.0' in lines
+        assert 'calendar_webscraper_gcal_call_seconds_sum{method="events.list"} 1.0' in lines
+        assert 'calendar_webscraper_gcal_call_max_seconds{method="events.list"} 0.75' in lines
+        assert text.endswith("\n")
+
+    def test_prometheus_label_values_are_escaped(self):
+        metrics = Metrics()
+        metrics.inc("sync_configs_total", config='Team "A"\\B\n')
+        assert 'config="Team \\"A\\"\\\\B\\n"' in metrics.to_prometheus()
+
+    def test_write_report(self, tmp_path):
+        json_path, prometheus_path = self._metrics().write_report(tmp_path / "metrics")
+        assert json_path.name == REPORT_JSON
+        assert prometheus_path.name == REPORT_PROMETHEUS
+        assert json.loads(json_path.read_text(encoding="utf-8"))["counters"]
+        assert prometheus_path.read_text(encoding="utf-8").startswith("# TYPE")
@@ -0,0 +1,106 @@
+"""
+Unit tests for libs.rate_limiter.TokenBucket.
+
+A fake clock whose ``sleep`` advances time keeps the tests instant and
+deterministic.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from libs.rate_limiter import TokenBucket, limiter_from_env
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _bucket(rate=10.0, burst=5):
+    clock = FakeClock()
+    return TokenBucket(rate, burst, clock=clock, sleep=clock.sleep), clock
+
+
+class TestTokenBucket:
+
+    def test_burst_is_free(self):
+        bucket, clock = _bucket(burst=5)
+        for _ in range(5):
+            assert bucket.acquire() == 0
+        assert clock.sleeps == []
+
+    def test_sustained_rate_is_enforced(self):
+        bucket, clock = _bucket(rate=10.0, burst=1)
+        for _ in range(11):
+            bucket.acquire()
+        assert clock.now == pytest.approx(1.0)
+
+    def test_refills_while_idle_up_to_burst(self):
+        bucket, clock = _bucket(rate=10.0, burst=5)
+        for _ in range(5):
+            bucket.acquire()
+        clock.now += 100  # long idle period: still only `burst` free tokens
+        for _ in range(5):
+            assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.1)
+
+    def test_oversized_request_goes_into_debt(self):
+        bucket, clock = _bucket(rate=10.0, burst=5)
+        assert bucket.acquire(50) == 0  # full bucket: allowed at once
+        # ...but the next caller waits for the 45-token debt plus one token.
+        assert bucket.acquire() == pytest.approx(4.6)
+
+    def test_pause_holds_back_callers(self):
+        bucket, clock = _bucket()
+        bucket.pause(3.0)
+        assert bucket.acquire() == pytest.approx(3.0)
+        bucket.pause(1.0)
+        bucket.pause(0.5)  # a shorter pause never shortens an existing one
+        assert bucket.acquire() == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+    def test_rejects_invalid_settings(self, rate, burst):
+        with pytest.raises(ValueError):
+            TokenBucket(rate, burst)
+
+    def test_concurrent_callers_share_the_budget(self):
+        bucket = TokenBucket(rate=0.001, burst=800)  # effectively no refill
+        threads = [
+            threading.Thread(target=lambda: [bucket.acquire() for _ in range(100)])
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert bucket._tokens == pytest.approx(0, abs=0.01)
+
+
+class TestLimiterFromEnv:
+
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("GCAL_QPS", raising=False)
+        monkeypatch.delenv("GCAL_BURST", raising=False)
+        bucket = limiter_from_env()
+        assert (bucket.rate, bucket.burst) == (10.0, 10)
+
+    def test_configured(self, monkeypatch):
+        monkeypatch.setenv("GCAL_QPS", "2.5")
+        monkeypatch.setenv("GCAL_BURST", "20")
+        bucket = limiter_from_env()
+        assert (bucket.rate, bucket.burst) == (2.5, 20)
+
+    def test_zero_disables(self, monkeypatch):
+        monkeypatch.setenv("GCAL_QPS", "0")
+        assert limiter_from_env() is None
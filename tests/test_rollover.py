@@ -110,10 +110,11 @@ class TestBuildSummary:
 
 class TestCheckConfigRollover:
     def _client(self, current_posts: list, search_pages: list[list]) -> MagicMock:
-        """Fake ScraperClient: first get_json call resolves the current slug,
-        subsequent calls are the paginated search pages."""
+        """Fake ScraperClient: get_json resolves the current slug, get_json_page
+        returns the paginated search pages (no WP pagination headers)."""
         client = MagicMock()
-        client.get_json.side_effect = [current_posts] + search_pages
+        client.get_json.side_effect = [current_posts]
+        client.get_json_page.side_effect = [(page, {}) for page in search_pages]
         return client
 
     def _config(self, tmp_path) -> Path:
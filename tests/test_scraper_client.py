@@ -7,12 +7,23 @@ is patched where we test ScraperClient in isolation from parsing logic.
 
 from __future__ import annotations
 
-from unittest.mock import patch
+import gzip
+import io
+import os
+from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
+import tenacity
 
-from libs.scraper_client import ScraperClient
+from helpers.sources import _WP_PAGE_WORKERS
+from libs.host_scheduler import HostScheduler
+from libs.http_cache import CachedResponse, ResponseCache
+from libs.metrics import Metrics
+from libs.scraper_client import (
+    _POOL_MAXSIZE,
+    ScraperClient,
+)
 
 DUMMY_HTML = "<html><body><p>Hello</p></body></html>"
 DUMMY_URL = "https://example.com/team/test/"
@@ -212,3 +223,290 @@ class TestGetJson:
         with pytest.raises(requests.HTTPError):
             scraper.get_json(DUMMY_URL)
         assert requests_mock.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+class TestResponseCache:
+
+    @pytest.fixture
+    def cached_scraper(self, tmp_path) -> ScraperClient:
+        return ScraperClient("Bot", default_timeout=5, cache=ResponseCache(tmp_path))
+
+    def test_sends_validators_and_serves_304_from_disk(self, cached_scraper, requests_mock):
+        requests_mock.get(
+            DUMMY_URL,
+            [
+                {"json": [{"id": 1}], "headers": {"ETag": '"v1"'}},
+                {"status_code": 304},
+            ],
+        )
+        assert cached_scraper.get_json(DUMMY_URL) == [{"id": 1}]
+        assert cached_scraper.get_json(DUMMY_URL) == [{"id": 1}]
+        assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+
+    def test_last_modified_validator(self, cached_scraper, requests_mock):
+        stamp = "Wed, 01 Jan 2026 00:00:00 GMT"
+        requests_mock.get(
+            DUMMY_URL,
+            [{"text": DUMMY_HTML, "headers": {"Last-Modified": stamp}}, {"status_code": 304}],
+        )
+        cached_scraper.get_html(DUMMY_URL)
+        assert cached_scraper.get_html(DUMMY_URL) == DUMMY_HTML
+        assert requests_mock.last_request.headers["If-Modified-Since"] == stamp
+
+    def test_changed_response_replaces_entry(self, cached_scraper, requests_mock):
+        requests_mock.get(
+            DUMMY_URL,
+            [
+                {"json": [1], "headers": {"ETag": '"v1"'}},
+                {"json": [2], "headers": {"ETag": '"v2"'}},
+                {"status_code": 304},
+            ],
+        )
+        cached_scraper.get_json(DUMMY_URL)
+        assert cached_scraper.get_json(DUMMY_URL) == [2]
+        assert cached_scraper.get_json(DUMMY_URL) == [2]
+
+    def test_cache_key_includes_params(self, cached_scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, json=[], headers={"ETag": '"v"'})
+        cached_scraper.get_json(DUMMY_URL, params={"page": 1})
+        cached_scraper.get_json(DUMMY_URL, params={"page": 2})
+        assert "If-None-Match" not in requests_mock.last_request.headers
+
+    def test_ttl_serves_without_request(self, tmp_path, requests_mock):
+        scraper = ScraperClient("Bot", cache=ResponseCache(tmp_path, ttl=3600))
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        scraper.get_html(DUMMY_URL)
+        assert scraper.get_html(DUMMY_URL) == DUMMY_HTML
+        assert requests_mock.call_count == 1
+
+    def test_responses_without_validators_not_cached(self, cached_scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        cached_scraper.get_html(DUMMY_URL)
+        cached_scraper.get_html(DUMMY_URL)
+        assert "If-None-Match" not in requests_mock.last_request.headers
+        assert requests_mock.call_count == 2
+
+    def test_lru_eviction_keeps_directory_bounded(self, tmp_path):
+        cache = ResponseCache(tmp_path, max_bytes=600)
+        for i in range(5):
+            cache.put(str(i), CachedResponse(url=f"u{i}", body="x" * 200, etag="e"))
+            os.utime(tmp_path / f"{i}.json", (i, i))  # deterministic LRU order
+        cache.put("5", CachedResponse(url="u5", body="x" * 200, etag="e"))
+        remaining = sorted(p.stem for p in tmp_path.glob("*.json"))
+        assert "0" not in remaining and "5" in remaining
+        assert sum(p.stat().st_size for p in tmp_path.glob("*.json")) <= 600
+
+    def test_writes_under_the_limit_do_not_scan_the_directory(self, tmp_path, monkeypatch):
+        ResponseCache(tmp_path).put("old", CachedResponse(url="u", body="x" * 200, etag="e"))
+        cache = ResponseCache(tmp_path, max_bytes=10_000)  # size seeded from disk
+        monkeypatch.setattr(cache, "_entries", MagicMock(side_effect=AssertionError("scanned")))
+        for i in range(3):
+            cache.put(str(i), CachedResponse(url=f"u{i}", body="x" * 200, etag="e"))
+        cache.put("0", CachedResponse(url="u0", body="y" * 200, etag="e"))  # replaced, not added
+        assert cache._total == sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+
+    def test_touch_restarts_ttl_without_rewriting(self, tmp_path):
+        cache = ResponseCache(tmp_path, ttl=3600)
+        cache.put("k", CachedResponse(url="u", body="x", etag="e"))
+        path = tmp_path / "k.json"
+        os.utime(path, (0, 0))  # validated long ago
+        before = path.read_bytes()
+
+        entry = cache.get("k")
+        assert not cache.is_fresh(entry)
+        cache.touch("k", entry)
+        assert path.read_bytes() == before
+        assert cache.is_fresh(cache.get("k"))
+
+
+class TestGetJsonPage:
+
+    def test_returns_body_and_case_insensitive_headers(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, json=[1], headers={"X-WP-TotalPages": "3"})
+        body, headers = scraper.get_json_page(DUMMY_URL)
+        assert body == [1]
+        assert headers["x-wp-totalpages"] == "3"
+
+    def test_cached_304_keeps_headers(self, tmp_path, requests_mock):
+        scraper = ScraperClient("Bot", cache=ResponseCache(tmp_path))
+        requests_mock.get(
+            DUMMY_URL,
+            [
+                {"json": [1], "headers": {"ETag": '"v1"', "X-WP-TotalPages": "3"}},
+                {"status_code": 304},
+            ],
+        )
+        scraper.get_json_page(DUMMY_URL)
+        _, headers = scraper.get_json_page(DUMMY_URL)
+        assert headers["X-WP-TotalPages"] == "3"
+
+
+# ---------------------------------------------------------------------------
+# iter_html — streaming
+# ---------------------------------------------------------------------------
+
+class TestIterHtml:
+
+    def test_yields_body_in_chunks(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        chunks = list(scraper.iter_html(DUMMY_URL, chunk_size=8))
+        assert len(chunks) > 1
+        assert "".join(chunks) == DUMMY_HTML
+
+    def test_multibyte_characters_split_across_chunks(self, scraper, requests_mock):
+        body = "<p>Café ✓</p>" * 20
+        requests_mock.get(
+            DUMMY_URL,
+            content=body.encode("utf-8"),
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+        assert "".join(scraper.iter_html(DUMMY_URL, chunk_size=3)) == body
+
+    def test_request_is_lazy(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        scraper.iter_html(DUMMY_URL)
+        assert requests_mock.call_count == 0
+
+    def test_4xx_raises_without_retry(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, status_code=404)
+        with pytest.raises(requests.HTTPError):
+            list(scraper.iter_html(DUMMY_URL))
+        assert requests_mock.call_count == 1
+
+    def test_opening_is_retried(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, [{"status_code": 503}, {"text": DUMMY_HTML}])
+        assert "".join(scraper.iter_html(DUMMY_URL)) == DUMMY_HTML
+        assert requests_mock.call_count == 2
+
+    def test_streamed_body_is_cached_and_revalidated(self, tmp_path, requests_mock):
+        scraper = ScraperClient("Bot", cache=ResponseCache(tmp_path))
+        requests_mock.get(
+            DUMMY_URL,
+            [{"text": DUMMY_HTML, "headers": {"ETag": '"v1"'}}, {"status_code": 304}],
+        )
+        assert "".join(scraper.iter_html(DUMMY_URL, chunk_size=8)) == DUMMY_HTML
+        assert "".join(scraper.iter_html(DUMMY_URL, chunk_size=8)) == DUMMY_HTML
+        assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+        # The streamed entry is shared with the buffered path.
+        assert scraper.get_html(DUMMY_URL) == DUMMY_HTML
+
+    def test_fresh_cache_entry_served_without_request(self, tmp_path, requests_mock):
+        scraper = ScraperClient("Bot", cache=ResponseCache(tmp_path, ttl=3600))
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        scraper.get_html(DUMMY_URL)
+        assert "".join(scraper.iter_html(DUMMY_URL, chunk_size=5)) == DUMMY_HTML
+        assert requests_mock.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Host scheduler integration
+# ---------------------------------------------------------------------------
+
+class TestHostScheduling:
+
+    def test_requests_go_through_scheduler_slot(self, requests_mock):
+        scheduler = HostScheduler(min_interval=0)
+        scraper = ScraperClient("Bot", scheduler=scheduler)
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        with patch.object(scheduler, "slot", wraps=scheduler.slot) as slot:
+            scraper.get_html(DUMMY_URL)
+            list(scraper.iter_html(DUMMY_URL))
+        assert [c.args for c in slot.call_args_list] == [(DUMMY_URL,), (DUMMY_URL,)]
+
+    def test_429_with_retry_after_defers_host_and_retries(self, requests_mock):
+        scheduler = HostScheduler(min_interval=0)
+        scraper = ScraperClient("Bot", scheduler=scheduler)
+        requests_mock.get(
+            DUMMY_URL,
+            [{"status_code": 429, "headers": {"Retry-After": "0"}}, {"text": DUMMY_HTML}],
+        )
+        with patch.object(scheduler, "defer", wraps=scheduler.defer) as defer:
+            assert scraper.get_html(DUMMY_URL) == DUMMY_HTML
+        defer.assert_called_once_with(DUMMY_URL, 0.0)
+        assert requests_mock.call_count == 2
+
+    def test_shared_scheduler_between_clients(self):
+        scheduler = HostScheduler()
+        assert ScraperClient("A", scheduler=scheduler).scheduler is scheduler
+        assert isinstance(ScraperClient("B").scheduler, HostScheduler)
+
+
+# ---------------------------------------------------------------------------
+# Connection pooling and content negotiation
+# ---------------------------------------------------------------------------
+
+class TestSessionTransport:
+
+    def test_mounts_sized_adapter_for_both_schemes(self):
+        scraper = ScraperClient("Bot", pool_connections=3, pool_maxsize=24)
+        for prefix in ("https://", "http://"):
+            adapter = scraper._session.get_adapter(prefix + "example.com/")
+            assert adapter._pool_connections == 3
+            assert adapter._pool_maxsize == 24
+            assert adapter.max_retries.total == 0
+
+    def test_pool_covers_concurrent_page_fetchers(self):
+        assert _POOL_MAXSIZE >= _WP_PAGE_WORKERS
+
+    def test_advertises_compressed_encodings(self, scraper, requests_mock):
+        requests_mock.get(DUMMY_URL, text=DUMMY_HTML)
+        scraper.get_html(DUMMY_URL)
+        encodings = requests_mock.last_request.headers["Accept-Encoding"].split(",")
+        assert {"gzip", "deflate"} <= {e.strip() for e in encodings}
+
+    def test_gzip_body_is_decoded(self, scraper, requests_mock):
+        body = gzip.compress(DUMMY_HTML.encode())
+        requests_mock.get(
+            DUMMY_URL,
+            body=io.BytesIO(body),
+            headers={"Content-Encoding": "gzip", "Content-Type": "text/html; charset=utf-8"},
+        )
+        assert "".join(scraper.iter_html(DUMMY_URL)) == DUMMY_HTML
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class TestMetrics:
+
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch):
+        for method in (ScraperClient._get_with_retry, ScraperClient._get_json_with_retry):
+            monkeypatch.setattr(method.retry, "wait", tenacity.wait_none())
+
+    def test_requests_counted_by_host_and_status(self, requests_mock):
+        metrics = Metrics()
+        scraper = ScraperClient("Bot", metrics=metrics)
+        requests_mock.get(DUMMY_URL, [{"status_code": 503}, {"text": DUMMY_HTML}])
+        scraper.get_html(DUMMY_URL)
+
+        assert metrics.counter("scraper_requests_total", host="example.com", status=503) == 1
+        assert metrics.counter("scraper_requests_total", host="example.com", status=200) == 1
+        assert metrics.counter("scraper_retries_total", host="example.com") == 1
+        assert metrics.timing("scraper_request_seconds", host="example.com").count == 2
+
+    def test_connection_errors_counted_by_exception(self, requests_mock):
+        metrics = Metrics()
+        scraper = ScraperClient("Bot", metrics=metrics)
+        requests_mock.get(DUMMY_URL, exc=requests.ConnectionError)
+        with pytest.raises(requests.ConnectionError):
+            scraper.get_json(DUMMY_URL)
+        assert metrics.counter(
+            "scraper_requests_total", host="example.com", status="ConnectionError"
+        ) == 3
+        assert metrics.total("scraper_retries_total") == 2
+
+    def test_cache_results_counted(self, tmp_path, requests_mock):
+        metrics = Metrics()
+        scraper = ScraperClient("Bot", cache=ResponseCache(tmp_path), metrics=metrics)
+        requests_mock.get(DUMMY_URL, [{"text": DUMMY_HTML, "headers": {"ETag": '"v1"'}},
+                                      {"status_code": 304}])
+        scraper.get_html(DUMMY_URL)
+        "".join(scraper.iter_html(DUMMY_URL))
+        assert metrics.counter("scraper_cache_total", result="miss") == 1
+        assert metrics.counter("scraper_cache_total", result="revalidated") == 1
@@ -5,15 +5,19 @@ HTML source wrapper, and fallback behaviour.
 
 from __future__ import annotations
 
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 from zoneinfo import ZoneInfo
 
 import pytest
+import requests
 
 from helpers.config_loader import CalendarConfig
-from helpers.models import Game, ScrapeError
-from helpers.sources import SOURCES, fetch_games, fetch_games_ssb_api, fetch_games_ssb_html, normalize_round_key, round_label_from_slug
+from helpers.models import Game, ScrapeError, WpMatch
+from helpers.sources import SOURCES, MatchIndex, _get_all_pages, fetch_games, fetch_games_ssb_api, fetch_games_ssb_html, normalize_round_key, round_label_from_slug
 
 SYDNEY = ZoneInfo("Australia/Sydney")
 
@@ -21,6 +25,10 @@ TEAM_URL = "https://sydneysocialbasketball.com.au/team/shake-shaq-12/"
 CONFIG = CalendarConfig(name="Shake Shaq", url=TEAM_URL, color_id=9)
 
 TEAM_POST = {"id": 519104, "title": {"rendered": "Shake Shaq 2025 s4"}}
+# WP post dates (site-local, second precision) inside / outside the match
+# index's lookback window.
+RECENT = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S")
+STALE = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%dT%H:%M:%S")
 
 def _match(match_id, slug, home_id, home_title, away_id, away_title, ts):
     return {
@@ -88,10 +96,11 @@ class TestRoundLabelFromSlug:
 class TestFetchGamesSsbApi:
 
     def _client(self, team_response, match_pages):
-        """Fake ScraperClient whose get_json returns canned responses."""
+        """Fake ScraperClient: get_json resolves the team, get_json_page returns
+        the match search pages (no WP pagination headers)."""
         client = MagicMock()
-        responses = [team_response] + match_pages
-        client.get_json.side_effect = responses
+        client.get_json.side_effect = [team_response]
+        client.get_json_page.side_effect = [(page, {}) for page in match_pages]
         return client
 
     def test_maps_match_to_game(self):
@@ -127,7 +136,14 @@ class TestFetchGamesSsbApi:
         fetch_games_ssb_api(client, CONFIG)
         first_call = client.get_json.call_args_list[0]
         assert first_call.args[0].endswith("/wp-json/wp/v2/team")
-        assert first_call.kwargs["params"] == {"slug": "shake-shaq-12"}
+        assert first_call.kwargs["params"] == {"slug": "shake-shaq-12", "_fields": "id,title,date"}
+
+    def test_match_search_requests_projected_fields(self):
+        client = self._client([TEAM_POST], [[OUR_MATCH]])
+        fetch_games_ssb_api(client, CONFIG)
+        fields = client.get_json_page.call_args.kwargs["params"]["_fields"].split(",")
+        assert {"id", "slug", "link", "acf.time", "acf.home_team.ID"} <= set(fields)
+        assert "content" not in fields
 
     def test_filters_out_other_teams_matches(self):
         client = self._client([TEAM_POST], [[OUR_MATCH, OTHER_MATCH]])
@@ -151,7 +167,8 @@ class TestFetchGamesSsbApi:
         games = fetch_games_ssb_api(client, CONFIG)
         assert len(games) == 1
         # 1 team call + 2 match pages
-        assert client.get_json.call_count == 3
+        assert client.get_json.call_count == 1
+        assert client.get_json_page.call_count == 2
 
     def test_malformed_match_is_skipped_not_fatal(self):
         broken = {"id": 999, "slug": "broken-match", "acf": {"home_team": None}}
@@ -173,7 +190,7 @@ class TestFetchGamesSsbApi:
         team = {"id": 519104, "title": {"rendered": "40s &#038; Shorties 2025 s4"}}
         client = self._client([team], [[OUR_MATCH]])
         fetch_games_ssb_api(client, CONFIG)
-        match_call = client.get_json.call_args_list[1]
+        match_call = client.get_json_page.call_args_list[0]
         assert match_call.kwargs["params"]["search"] == "40s & Shorties 2025 s4"
 
     def test_pagination_cap_raises(self):
@@ -183,6 +200,158 @@ class TestFetchGamesSsbApi:
             fetch_games_ssb_api(client, CONFIG)
 
 
+class TestGetAllPagesConcurrent:
+
+    URL = "https://sydneysocialbasketball.com.au/wp-json/wp/v2/match"
+
+    def _client(self, total_pages, per_page_items=None, fail_page=None):
+        """Fake client serving pages by number, with X-WP-TotalPages headers."""
+        client = MagicMock()
+        in_flight = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def get_json_page(url, params):
+            page = params["page"]
+            with lock:
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            if page == fail_page:
+                response = MagicMock(status_code=400)
+                raise requests.HTTPError(response=response)
+            items = [{"id": page * 1000 + i} for i in range(per_page_items or 100)]
+            return items, {"X-WP-TotalPages": str(total_pages), "X-WP-Total": "0"}
+
+        client.get_json_page.side_effect = get_json_page
+        return client, in_flight
+
+    def test_fetches_all_pages_in_order(self):
+        client, in_flight = self._client(total_pages=5)
+        results = _get_all_pages(client, self.URL, {"search": "x"})
+        assert [r["id"] // 1000 for r in results[::100]] == [1, 2, 3, 4, 5]
+        assert len(results) == 500
+        assert client.get_json_page.call_count == 5
+        assert in_flight["peak"] > 1
+
+    def test_single_page_makes_one_request(self):
+        client, _ = self._client(total_pages=1, per_page_items=3)
+        assert len(_get_all_pages(client, self.URL, {})) == 3
+        assert client.get_json_page.call_count == 1
+
+    def test_total_pages_over_cap_raises_before_fetching(self):
+        client, _ = self._client(total_pages=60)
+        with pytest.raises(ScrapeError, match="pagination"):
+            _get_all_pages(client, self.URL, {})
+        assert client.get_json_page.call_count == 1
+
+    def test_page_past_end_400_is_tolerated(self):
+        client, _ = self._client(total_pages=3, fail_page=3)
+        assert len(_get_all_pages(client, self.URL, {})) == 200
+
+
+class TestWpMatch:
+
+    def test_decodes_and_unescapes(self):
+        post = _match(1, "a-vs-b-r2", 10, "A &amp; Co", 20, "B", TS_R1)
+        match = WpMatch.from_json(post)
+        assert (match.home_id, match.home_title, match.away_id) == (10, "A & Co", 20)
+        assert match.venue == "Arncliffe Youth Centre #1"
+        assert match.time == TS_R1
+
+    def test_decodes_projected_post(self):
+        """A _fields-projected post carries only the nested keys we asked for."""
+        post = {
+            "id": 1, "slug": "s", "link": "https://x/",
+            "acf": {
+                "time": 0,
+                "home_team": {"ID": 10, "post_title": "A"},
+                "away_team": {"ID": 20, "post_title": "B"},
+                "venue": {"post_title": "V"},
+            },
+        }
+        assert WpMatch.from_json(post).time == 0
+
+    def test_malformed_raises(self):
+        with pytest.raises((KeyError, TypeError)):
+            WpMatch.from_json({"id": 1, "slug": "s", "link": "l", "acf": {"home_team": None}})
+
+
+class TestMatchIndex:
+
+    BASE = "https://sydneysocialbasketball.com.au/wp-json/wp/v2"
+
+    def _client(self, crawl_pages, team_posts=None):
+        """Fake client: get_json_page serves the index crawl, get_json the team lookups."""
+        client = MagicMock()
+        client.get_json_page.side_effect = [(page, {}) for page in crawl_pages]
+        client.get_json.side_effect = team_posts or []
+        return client
+
+    def test_indexes_matches_by_home_and_away_team(self):
+        client = self._client([[OUR_MATCH, OTHER_MATCH]])
+        index = MatchIndex(client)
+        ours, other = WpMatch.from_json(OUR_MATCH), WpMatch.from_json(OTHER_MATCH)
+        assert index.matches_for(self.BASE, 519104, RECENT) == [ours]
+        assert index.matches_for(self.BASE, 519200, RECENT) == [ours]
+        assert index.matches_for(self.BASE, 600002, RECENT) == [other]
+        assert client.get_json_page.call_count == 1
+        assert "after" in client.get_json_page.call_args.kwargs["params"]
+
+    def test_crawl_window_is_rounded_to_the_day(self):
+        # A stable ``after`` keeps the crawl cacheable between runs.
+        client = self._client([[OUR_MATCH], [OUR_MATCH]])
+        MatchIndex(client).matches_for(self.BASE, 519104, RECENT)
+        MatchIndex(client).matches_for(self.BASE, 519104, RECENT)
+        first, second = (c.kwargs["params"]["after"] for c in client.get_json_page.call_args_list)
+        assert first == second
+        assert first.endswith("T00:00:00")
+
+    def test_unknown_team_returns_none(self):
+        index = MatchIndex(self._client([[OTHER_MATCH]]))
+        assert index.matches_for(self.BASE, 519104, RECENT) is None
+
+    def test_team_older_than_window_is_not_indexed(self):
+        # Some of its matches may predate the crawl, so a hit is only partial.
+        index = MatchIndex(self._client([[OUR_MATCH]]))
+        assert index.matches_for(self.BASE, 519104, STALE) is None
+        assert index.matches_for(self.BASE, 519104) is None
+
+    def test_failed_crawl_is_not_retried(self):
+        client = MagicMock()
+        client.get_json_page.side_effect = requests.ConnectionError("down")
+        index = MatchIndex(client)
+        assert index.matches_for(self.BASE, 519104, RECENT) is None
+        assert index.matches_for(self.BASE, 600001, RECENT) is None
+        assert client.get_json_page.call_count == 1
+
+    def test_crawls_once_across_threads(self):
+        client = self._client([[OUR_MATCH, OTHER_MATCH]])
+        index = MatchIndex(client)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: index.matches_for(self.BASE, 519104, RECENT), range(8)))
+        assert client.get_json_page.call_count == 1
+
+    def test_fetch_games_uses_index_instead_of_search(self):
+        client = self._client(
+            [[OUR_MATCH, OTHER_MATCH]], team_posts=[[{**TEAM_POST, "date": RECENT}]]
+        )
+        games = fetch_games_ssb_api(client, CONFIG, match_index=MatchIndex(client))
+        assert [g.key for g in games] == ["round1"]
+        params = [c.kwargs["params"] for c in client.get_json_page.call_args_list]
+        assert not any("search" in p for p in params)
+
+    def test_team_missing_from_index_falls_back_to_search(self):
+        client = self._client(
+            [[OTHER_MATCH], [OUR_MATCH]], team_posts=[[{**TEAM_POST, "date": RECENT}]]
+        )
+        games = fetch_games_ssb_api(client, CONFIG, match_index=MatchIndex(client))
+        assert [g.key for g in games] == ["round1"]
+        last = client.get_json_page.call_args.kwargs["params"]
+        assert last["search"] == "Shake Shaq 2025 s4"
+
+
 class TestFetchGamesSsbHtml:
 
     def test_wraps_parser_output_into_games(self, monkeypatch):
@@ -195,7 +364,7 @@ class TestFetchGamesSsbHtml:
             "details_url": "https://sydneysocialbasketball.com.au/match/x/",
         }]
         monkeypatch.setattr(
-            "helpers.sources.HTMLHelper.parse_html_content", lambda **kw: raw
+            "helpers.sources.HTMLHelper.parse_html_content", lambda html, parse_type: raw
         )
         client = MagicMock()
         client.get_html.return_value = "<html></html>"
@@ -205,13 +374,29 @@ class TestFetchGamesSsbHtml:
 
     def test_raises_on_empty_parse(self, monkeypatch):
         monkeypatch.setattr(
-            "helpers.sources.HTMLHelper.parse_html_content", lambda **kw: []
+            "helpers.sources.HTMLHelper.parse_html_content", lambda html, parse_type: []
         )
         client = MagicMock()
         client.get_html.return_value = "<html></html>"
         with pytest.raises(ScrapeError):
             fetch_games_ssb_html(client, CONFIG)
 
+    def test_streams_page_through_parser_when_enabled(self, monkeypatch):
+        monkeypatch.setenv("HTML_STREAM", "1")
+        page = (
+            "<html><body><div class='grid'><div><h5>Round</h5>Round 1</div>"
+            "<div><h5>Opponent</h5><a href='#'>Rivals</a></div>"
+            "<div><h5>Date</h5>15/01/2026</div><div><h5>Time</h5>9:10PM</div>"
+            "<div><h5>Court</h5>Court 1</div>"
+            "<div><h5>Score</h5><a href='https://x/m/1/'>View</a></div></div></body></html>"
+        )
+        client = MagicMock()
+        client.iter_html.return_value = iter(page[i:i + 7] for i in range(0, len(page), 7))
+        games = fetch_games_ssb_html(client, CONFIG)
+        assert [(g.key, g.title) for g in games] == [("round1", "Round 1: Rivals")]
+        assert games[0].start == datetime(2026, 1, 15, 21, 10, tzinfo=SYDNEY)
+        client.get_html.assert_not_called()
+
 
 class TestFetchGamesFallback:
 
@@ -239,3 +424,4 @@ class TestFetchGamesFallback:
         )
         with pytest.raises(ScrapeError):
             fetch_games(MagicMock(), config)
+
@@ -0,0 +1,57 @@
+"""
+Unit tests for libs.state_store.StateStore.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from libs.state_store import StateStore
+
+
+@pytest.fixture
+def store() -> StateStore:
+    return StateStore(":memory:")
+
+
+class TestStateStore:
+
+    def test_missing_key_returns_none(self, store):
+        assert store.get("ns", "nope") is None
+
+    def test_round_trips_json_values(self, store):
+        store.set("ns", "k", {"token": "abc", "events": {"e1": {"id": "e1"}}})
+        assert store.get("ns", "k") == {"token": "abc", "events": {"e1": {"id": "e1"}}}
+
+    def test_set_overwrites(self, store):
+        store.set("ns", "k", 1)
+        store.set("ns", "k", 2)
+        assert store.get("ns", "k") == 2
+
+    def test_namespaces_are_independent(self, store):
+        store.set("a", "k", 1)
+        store.set("b", "k", 2)
+        assert (store.get("a", "k"), store.get("b", "k")) == (1, 2)
+
+    def test_delete(self, store):
+        store.set("ns", "k", 1)
+        store.delete("ns", "k")
+        assert store.get("ns", "k") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "nested" / "state.sqlite3"
+        StateStore(path).set("ns", "k", "v")
+        assert StateStore(path).get("ns", "k") == "v"
+
+    def test_concurrent_writes(self, store):
+        def write(i):
+            store.set("ns", str(i), i)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert [store.get("ns", str(i)) for i in range(20)] == list(range(20))
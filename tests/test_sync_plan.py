@@ -0,0 +1,103 @@
+"""
+Unit tests for helpers.sync_plan — all pure functions, no I/O.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from helpers.models import ExistingEvent, Game
+from helpers.sync_plan import PlannedOperation, SyncPlan, plan_operations
+
+SCHEDULE_URL = "https://ssb.com/team/test/"
+SYD = ZoneInfo("Australia/Sydney")
+
+
+def _game(n: int, hour: int = 20) -> Game:
+    start = datetime(2026, 2, 1, hour, 0, tzinfo=SYD) + timedelta(days=n)
+    return Game(
+        key=f"round{n}",
+        title=f"Round {n}: Rivals",
+        start=start,
+        end=start + timedelta(hours=1),
+        venue="Court 1",
+        details_url=f"https://ssb.com/match/{n}/",
+    )
+
+
+def _event(game: Game, event_id: str, **overrides) -> ExistingEvent:
+    event = ExistingEvent(
+        id=event_id,
+        key=game.key,
+        start=game.start,
+        summary=game.title,
+        color_id="9",
+        description=game.details_url,
+        location=game.venue,
+    )
+    return replace(event, **overrides)
+
+
+class TestPlanOperations:
+
+    def test_up_to_date_event_needs_no_operation(self):
+        game = _game(1)
+        assert plan_operations([game], [_event(game, "ev-1")], SCHEDULE_URL, 9) == []
+
+    def test_drifted_fields_plan_a_patch(self):
+        game = _game(1)
+        [op] = plan_operations([game], [_event(game, "ev-1", location="Old")], SCHEDULE_URL, 9)
+        assert (op.action, op.event_id, op.fields) == ("patch", "ev-1", {"location": "Court 1"})
+
+    def test_moved_game_plans_a_reschedule(self):
+        game = _game(1)
+        moved = _event(game, "ev-1", start=game.start - timedelta(days=1))
+        [op] = plan_operations([game], [moved], SCHEDULE_URL, 9)
+        assert op.action == "reschedule"
+        assert op.fields["start"] == {"dateTime": game.start.isoformat()}
+
+    def test_new_game_plans_a_create(self):
+        game = _game(1)
+        [op] = plan_operations([game], [], SCHEDULE_URL, 9)
+        assert op.action == "create"
+        assert op.event_id is None
+        assert op.fields["private_properties"] == {"schedule": SCHEDULE_URL, "gameKey": "round1"}
+        assert op.fields["start_time"] == game.start.isoformat()
+
+    def test_event_is_matched_only_once(self):
+        game = _game(1)
+        twin = replace(game, key="round1b")
+        ops = plan_operations([game, twin], [_event(game, "ev-1", key=None)], SCHEDULE_URL, 9)
+        assert [op.action for op in ops] == ["patch", "create"]
+
+
+class TestSyncPlan:
+
+    def _plan(self, n_creates: int) -> SyncPlan:
+        return SyncPlan(
+            "Team", SCHEDULE_URL, "cal-1",
+            plan_operations([_game(i + 1) for i in range(n_creates)], [], SCHEDULE_URL, 9),
+        )
+
+    def test_counts_and_batch_requests(self):
+        plan = self._plan(3)
+        plan.operations.append(PlannedOperation("patch", "k", "t", "ev", {"summary": "t"}))
+        assert plan.counts() == {"create": 3, "patch": 1, "reschedule": 0}
+        assert plan.batch_requests == 1
+
+    def test_batch_requests_round_up_per_fifty(self):
+        assert SyncPlan("Team", SCHEDULE_URL, None).batch_requests == 0
+        assert self._plan(51).batch_requests == 2
+
+    def test_json_round_trip(self):
+        plan = self._plan(2)
+        restored = SyncPlan.from_dict(json.loads(json.dumps(plan.to_dict())))
+        assert restored == plan
+
+    def test_describe(self):
+        assert PlannedOperation("patch", "k", "t", "ev", {"summary": 1, "colorId": 2}).describe() \
+            == "patch ['colorId', 'summary']"
+        assert PlannedOperation("create", "k", "t", None, {}).describe() == "create"